@@ -0,0 +1,284 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+# Bar progres eksekutor tidak dicetak; waktu diukur tanpa keluaran terminal
+os.environ.setdefault('TQDM_DISABLE', '1')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.finance.advanced_mc import AsianOptionPricer, QMCEuropeanPricer
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.parallel_runner import ParallelExecutor
+
+# ==============================================================================
+# SUITE BENCHMARK DAN STUDI SCALING
+# ==============================================================================
+# Setiap kasus dijalankan untuk setiap kombinasi parameter dan jumlah proses, dengan
+# warm-up (pool, kompilasi numba, pra-pemrosesan matriks) yang tidak diukur lalu
+# beberapa ulangan. Strong scaling: beban tetap; weak scaling: beban x jumlah proses.
+# Hasil ditulis ke JSON atau CSV (menurut ekstensi file):
+#   throughput   : unit kerja (jalur atau walk) per detik, dari median waktu
+#   speedup      : throughput(p) / throughput(1); untuk weak scaling ini speedup terskala
+#   efficiency   : speedup / p
+#   error_at_1s  : error dibawa ke anggaran waktu 1 detik, error * sqrt(waktu) (laju MC
+#                  1/sqrt(kerja); untuk QMC perkiraan konservatif)
+#
+#   python scripts/benchmark_suite.py run --suite quick --processes 1,2,4 --output base.json
+#   python scripts/benchmark_suite.py compare base.json new.json --threshold 0.1
+
+S, E, r, sigma, T = 100, 100, 0.05, 0.2, 1.0
+SEED = 42
+
+SUITES = {
+    'quick': {
+        'european': {'M': [1_000_000]},
+        'asian': {'M': [100_000], 'num_steps': [64]},
+        'qmc': {'M': [2 ** 18]},
+        'slae': {'size': [200], 'density': [0.05, 1.0], 'gamma': [0.5, 0.9], 'N': [500]},
+        'mi': {'size': [100], 'density': [0.05, 1.0], 'N': [200], 'm': [20]},
+    },
+    'full': {
+        'european': {'M': [1_000_000, 10_000_000]},
+        'asian': {'M': [100_000, 1_000_000], 'num_steps': [64, 252]},
+        'qmc': {'M': [2 ** 18, 2 ** 22]},
+        'slae': {'size': [200, 1000, 5000], 'density': [0.01, 0.1, 1.0], 'gamma': [0.5, 0.9], 'N': [2000]},
+        'mi': {'size': [100, 400], 'density': [0.05, 1.0], 'N': [1000], 'm': [20]},
+    },
+}
+
+
+def create_test_matrix(size, density, contraction=0.5):
+    """
+    A = I - B dengan B acak (tanpa diagonal) berjumlah baris mutlak `contraction` < 1,
+    sehingga A dominan diagonal dan deret Neumann untuk A^-1 konvergen.
+    density >= 1 menghasilkan matriks dense.
+    """
+    rng = np.random.default_rng(size)
+    B = sparse.random(size, size, density=min(density, 1.0), random_state=rng, format='csr')
+    B.setdiag(0)
+    B.eliminate_zeros()
+    row_sums = np.asarray(abs(B).sum(axis=1)).ravel()
+    row_sums[row_sums == 0] = 1
+    A = sparse.identity(size, format='csr') - sparse.diags(contraction / row_sums) @ B
+    return A.toarray() if density >= 1 else A.tocsr()
+
+
+def execution(processes, executor):
+    """Argumen eksekusi: blok NumPy sekuensial untuk p = 1, pool bersama untuk p > 1."""
+    if processes == 1:
+        return {'parallel': False, 'backend': 'numpy'}
+    return {'parallel': True, 'backend': 'process', 'num_processes': executor}
+
+
+# --- Kasus benchmark: setup(params) -> (run(skala, p, eksekutor) -> (kerja, error), unit, teardown) ---
+
+def european_case(params):
+    pricer = MonteCarloBSMPricer(S, E, r, sigma, T)
+
+    def run(scale, processes, executor):
+        estimate = pricer.price_option(params['M'] * scale, return_stats=True, seed=SEED,
+                                       **execution(processes, executor))
+        return estimate.num_samples, estimate.stderr
+    return run, 'paths', None
+
+
+def asian_case(params):
+    pricer = AsianOptionPricer(S, E, r, sigma, T, params['num_steps'])
+
+    def run(scale, processes, executor):
+        estimate = pricer.price(params['M'] * scale, return_stats=True, seed=SEED, **execution(processes, executor))
+        return estimate.num_samples, estimate.stderr
+    return run, 'paths', None
+
+
+def qmc_case(params):
+    # Sobol sudah vektorial dan tidak diparalelkan: hanya dijalankan dengan p = 1.
+    # RQMC dengan 8 scrambling agar standard error tersedia.
+    pricer = QMCEuropeanPricer(S, E, r, sigma, T)
+
+    def run(scale, processes, executor):
+        estimate = pricer.price(params['M'] * scale, seed=SEED, num_scrambles=8, target_stderr=0.0)
+        return estimate.num_samples, estimate.stderr
+    return run, 'paths', None
+
+
+def slae_case(params):
+    size = params['size']
+    A = create_test_matrix(size, params['density'])
+    x_true = np.ones(size)
+    solver = MonteCarloLinearSolver(A, A @ x_true)
+
+    def run(scale, processes, executor):
+        estimate = solver.solve_slae(params['gamma'], 1e-4, params['N'] * scale, return_stats=True, seed=SEED,
+                                     **execution(processes, executor))
+        return estimate.num_samples * size, np.linalg.norm(estimate.value - x_true) / np.linalg.norm(x_true)
+    return run, 'walks', solver.close
+
+
+def mi_case(params):
+    size = params['size']
+    A = create_test_matrix(size, params['density'])
+    exact = np.linalg.inv(A.toarray() if sparse.issparse(A) else A)
+    solver = MonteCarloLinearSolver(A)
+
+    def run(scale, processes, executor):
+        N = params['N'] * scale
+        inverse = solver.invert_matrix(N, params['m'], seed=SEED, **execution(processes, executor))
+        return N * size, np.linalg.norm(inverse - exact) / np.linalg.norm(exact)
+    return run, 'walks', solver.close
+
+
+CASES = {'european': european_case, 'asian': asian_case, 'qmc': qmc_case, 'slae': slae_case, 'mi': mi_case}
+SEQUENTIAL_ONLY = ('qmc',)
+
+
+def parameter_grid(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def measure(run, scale, processes, executor, warmup, repeats):
+    times, errors = [], []
+    for _ in range(warmup):
+        run(scale, processes, executor)
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work, error = run(scale, processes, executor)
+        times.append(time.perf_counter() - start)
+        errors.append(float(error))
+    return work, np.array(times), float(np.median(errors))
+
+
+def run_suite(suite, cases, process_counts, modes, warmup, repeats):
+    executors = {p: ParallelExecutor(p) for p in process_counts if p > 1}
+    rows = []
+    try:
+        for case in cases:
+            for params in parameter_grid(SUITES[suite][case]):
+                label = ','.join(f"{k}={v}" for k, v in params.items())
+                run, unit, teardown = CASES[case](params)
+                try:
+                    for mode in modes:
+                        counts = [1] if case in SEQUENTIAL_ONLY else process_counts
+                        for processes in counts:
+                            scale = processes if mode == 'weak' else 1
+                            work, times, error = measure(run, scale, processes, executors.get(processes), warmup,
+                                                         repeats)
+                            median = float(np.median(times))
+                            rows.append({'case': case, 'params': label, 'mode': mode, 'processes': processes,
+                                         'unit': unit, 'work': int(work), 'repeats': repeats,
+                                         'time_median': median, 'time_min': float(times.min()),
+                                         'time_std': float(times.std()), 'throughput': work / median,
+                                         'error': error, 'error_at_1s': error * np.sqrt(median)})
+                            print(f"  {case:<9} {label:<40} {mode:>6} p={processes}: {median:.4f} s, "
+                                  f"{work / median:,.0f} {unit}/s, error {error:.3e}")
+                finally:
+                    if teardown is not None:
+                        teardown()
+    finally:
+        for executor in executors.values():
+            executor.close()
+
+    # Speedup relatif terhadap jumlah proses terkecil dalam kelompok (case, params, mode)
+    for _, group in itertools.groupby(rows, key=lambda row: (row['case'], row['params'], row['mode'])):
+        group = list(group)
+        base = min(group, key=lambda row: row['processes'])
+        for row in group:
+            row['speedup'] = row['throughput'] / base['throughput'] * base['processes']
+            row['efficiency'] = row['speedup'] / row['processes']
+    return rows
+
+
+def write_results(rows, path, meta):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump({'meta': meta, 'results': rows}, f, indent=2)
+
+
+def read_results(path):
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for name, value in row.items():
+                try:
+                    row[name] = float(value) if name not in ('case', 'params', 'mode', 'unit') else value
+                except ValueError:
+                    pass
+        return rows
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(base_path, new_path, threshold):
+    """Menandai kasus yang throughput-nya turun lebih dari `threshold`; mengembalikan jumlahnya."""
+    key = lambda row: (row['case'], row['params'], row['mode'], int(row['processes']))
+    base = {key(row): row for row in read_results(base_path)}
+    new = {key(row): row for row in read_results(new_path)}
+    regressions = 0
+    print(f"{'case':<9} {'params':<40} {'mode':>6} {'p':>3} {'base':>14} {'baru':>14} {'rasio':>7}")
+    for k in sorted(base.keys() & new.keys()):
+        ratio = new[k]['throughput'] / base[k]['throughput']
+        flag = ratio < 1 - threshold
+        regressions += flag
+        print(f"{k[0]:<9} {k[1]:<40} {k[2]:>6} {k[3]:>3} {base[k]['throughput']:>14,.0f} "
+              f"{new[k]['throughput']:>14,.0f} {ratio:>7.3f}{'  REGRESI' if flag else ''}")
+    missing = len(base.keys() ^ new.keys())
+    if missing:
+        print(f"\n{missing} kasus hanya ada di salah satu file (tidak dibandingkan).")
+    print(f"\n{regressions} regresi throughput (> {threshold:.0%}).")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark pricer dan solver Monte Carlo.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="Menjalankan benchmark dan menyimpan hasil")
+    run_parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    run_parser.add_argument('--cases', default=','.join(CASES), help="Daftar kasus, dipisah koma")
+    run_parser.add_argument('--processes', default='1,2,4', help="Jumlah proses, dipisah koma")
+    run_parser.add_argument('--mode', choices=['strong', 'weak', 'both'], default='both')
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--repeats', type=int, default=3)
+    run_parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), '..', 'results',
+                                                             'benchmarks', 'benchmark.json'),
+                            help="File hasil (.json atau .csv)")
+    compare_parser = commands.add_parser('compare', help="Membandingkan throughput dua file hasil")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="Penurunan relatif yang ditandai")
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        sys.exit(1 if compare(args.base, args.new, args.threshold) else 0)
+
+    cases = args.cases.split(',')
+    for case in cases:
+        if case not in CASES:
+            parser.error(f"Kasus tidak dikenal: {case}. Pilihan: {', '.join(CASES)}")
+    process_counts = sorted({int(p) for p in args.processes.split(',')})
+    modes = ['strong', 'weak'] if args.mode == 'both' else [args.mode]
+    meta = {'suite': args.suite, 'warmup': args.warmup, 'repeats': args.repeats, 'seed': SEED,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+    rows = run_suite(args.suite, cases, process_counts, modes, args.warmup, args.repeats)
+    write_results(rows, args.output, meta)
+    print(f"\nHasil disimpan di: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
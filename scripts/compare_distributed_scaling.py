@@ -0,0 +1,51 @@
+import time
+import sys
+import os
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.utils.distributed import Coordinator, spawn_local_workers
+
+
+def main():
+    # Worker dijalankan di localhost; untuk banyak mesin, jalankan
+    #   python -m src.utils.distributed worker HOST:PORT --processes P --authkey HEX
+    # di setiap mesin (HEX = coordinator.authkey.hex(), atau set MC_AUTHKEY di kedua sisi)
+    # dan ganti spawn_local_workers dengan coordinator.wait_for_workers(...).
+    S, E, r, sigma, T = 100, 100, 0.05, 0.2, 1.0
+    worker_counts = [1, 2, 4]
+    M_strong = 8_000_000      # Strong scaling: M tetap
+    M_per_worker = 2_000_000  # Weak scaling: M sebanding jumlah worker
+
+    pricer = MonteCarloBSMPricer(S, E, r, sigma, T)
+    rows = []
+    with Coordinator(('localhost', 0)) as coordinator:
+        for count in worker_counts:
+            spawn_local_workers(coordinator.address, count - coordinator.num_processes, coordinator.authkey)
+            coordinator.wait_for_workers(count, timeout=30)
+            print(f"\n--- {count} worker ---")
+            for mode, M in (('strong', M_strong), ('weak', M_per_worker * count)):
+                start_time = time.time()
+                pricer.price_option(M, backend='distributed', num_processes=coordinator, seed=42)
+                elapsed = time.time() - start_time
+                rows.append({'Mode': mode, 'Workers': count, 'M': M, 'Waktu': elapsed})
+                print(f"  {mode:>6}: M = {M}, waktu {elapsed:.3f} s")
+
+    df = pd.DataFrame(rows)
+    for mode in ('strong', 'weak'):
+        base = df.loc[(df['Mode'] == mode) & (df['Workers'] == worker_counts[0]), 'Waktu'].iloc[0]
+        selected = df['Mode'] == mode
+        # Strong: speedup T1 / Tp; weak: efisiensi T1 / Tp (ideal 1)
+        df.loc[selected, 'Speedup' if mode == 'strong' else 'Efisiensi'] = base / df.loc[selected, 'Waktu']
+
+    output_path = os.path.join(os.path.dirname(__file__), '..', 'results', 'tables', 'distributed_scaling.csv')
+    df.to_csv(output_path, index=False, float_format='%.5f')
+    print("\n" + "=" * 50)
+    print(df)
+    print(f"\nTabel disimpan di: {output_path}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,11 @@ import numpy as np
 import sys
 import os
 import matplotlib.pyplot as plt
-from scipy.stats import norm
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.finance.bms_pricer import MonteCarloBSMPricer
 from src.finance.advanced_mc import AsianOptionPricer, QMCEuropeanPricer
-
-
-def black_scholes_analytic(S, E, r, sigma, T):
-    d1 = (np.log(S / E) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return S * norm.cdf(d1) - E * np.exp(-r * T) * norm.cdf(d2)
+from src.finance.analytic import black_scholes_analytic
 
 
 def main():
@@ -38,6 +32,10 @@ def main():
     print(f"\nEstimasi Harga Opsi Asia (M={sample_sizes[-1]}):")
     price_asian = asian_pricer.price(M=sample_sizes[-1], parallel=True)
     print(f"  Harga = {price_asian:.5f}")
+    estimate_cv = asian_pricer.price(M=sample_sizes[0], parallel=True, return_stats=True,
+                                     control_variate='geometric')
+    print(f"  Dengan control variate geometrik (M={sample_sizes[0]}): {estimate_cv.value:.5f} "
+          f"(stderr {estimate_cv.stderr:.5f}, reduksi variansi {estimate_cv.variance_reduction:.0f}x)")
 
     plt.figure(figsize=(12, 7))
     plt.loglog(sample_sizes, errors_mc, 'o-', label='Standard Monte Carlo Error')
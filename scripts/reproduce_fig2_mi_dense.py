@@ -35,7 +35,7 @@ def main():
     L_temp = np.identity(size) - A_temp
     A = A_temp / (np.max(np.sum(np.abs(L_temp), axis=1)) + 1)
 
-    solver = MonteCarloLinearSolver(A)
+    solver = MonteCarloLinearSolver(A, verbose=True)
 
     key = f"mi_dense_size_{size}"
     results[key] = {'processors': [], 'times': []}
@@ -52,6 +52,7 @@ def main():
         results[key]['processors'].append(p_count)
         results[key]['times'].append(exec_time)
         print(f"    Waktu: {exec_time:.4f} detik")
+    solver.close()
 
     # --- Buat Plot ---
     plt.figure(figsize=(10, 8))
@@ -40,7 +40,7 @@ def main():
         A = create_dense_diagonally_dominant(size)
         x_true = np.ones(size)
         b = A @ x_true
-        solver = MonteCarloLinearSolver(A, b)
+        solver = MonteCarloLinearSolver(A, b, verbose=True)
 
         for p_count in processor_counts:
             is_parallel = p_count > 1
@@ -51,6 +51,7 @@ def main():
             results[key]['processors'].append(p_count)
             results[key]['times'].append(exec_time)
             print(f"    Waktu: {exec_time:.4f} detik")
+        solver.close()
 
     # --- Membuat Plot Profesional ---
     # ... (Bagian plotting Anda sudah benar, tidak perlu diubah) ...
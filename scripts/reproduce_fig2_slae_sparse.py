@@ -10,9 +10,9 @@ from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
 
 
 def create_sparse_diagonally_dominant(size):
-    """Membuat matriks sparse yang diagonally dominant."""
+    """Membuat matriks sparse (CSR) yang diagonally dominant."""
     diagonals = [np.ones(size - 1) * -1, np.ones(size) * 4, np.ones(size - 1) * -1]
-    return diags(diagonals, [-1, 0, 1], shape=(size, size)).toarray()
+    return diags(diagonals, [-1, 0, 1], shape=(size, size), format='csr')
 
 
 def main():
@@ -38,7 +38,7 @@ def main():
         A = create_sparse_diagonally_dominant(size)
         x_true = np.ones(size)
         b = A @ x_true
-        solver = MonteCarloLinearSolver(A, b)
+        solver = MonteCarloLinearSolver(A, b, verbose=True)
 
         for p_count in processor_counts:
             is_parallel = p_count > 1
@@ -49,6 +49,7 @@ def main():
             results[key]['processors'].append(p_count)
             results[key]['times'].append(exec_time)
             print(f"    Waktu: {exec_time:.4f} detik")
+        solver.close()
 
     # --- Membuat Plot ---
     plt.style.use('seaborn-v0_8-whitegrid')
@@ -2,6 +2,7 @@ import numpy as np
 import time
 import sys
 import os
+import tempfile
 import pandas as pd
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -48,6 +49,31 @@ def main():
         results_data.append(row_E)
         results_data.append(row_EF)
 
+    # Seluruh smile dari satu set jalur (price_grid): biaya mendekati satu strike
+    print("\n--- Menjalankan grid semua harga exercise sekaligus ---")
+    grid_pricer = MonteCarloBSMPricer(S, exercise_prices[0], r, sigma, T)
+    row_grid = {'Experiment': 'Grid'}
+    for M in iteration_steps_local:
+        start_time = time.time()
+        grid_pricer.price_grid(exercise_prices, M, parallel=True, num_processes=num_procs)
+        row_grid[str(M)] = time.time() - start_time
+    results_data.append(row_grid)
+
+    # Eksekusi tahan gagal (checkpoint + retry/timeout) sebagai ganti over-sampling tetap 5%
+    print("\n--- Menjalankan dengan checkpoint per tugas ---")
+    ck_pricer = MonteCarloBSMPricer(S, 100, r, sigma, T)
+    row_ck = {'Experiment': 'Checkpoint'}
+    for M in iteration_steps_local:
+        with tempfile.TemporaryDirectory() as tmp:
+            start_time = time.time()
+            ck_pricer.price_option(M, parallel=True, num_processes=num_procs,
+                                   checkpoint=os.path.join(tmp, 'run.ckpt'), task_timeout=600)
+            row_ck[str(M)] = time.time() - start_time
+        report = ck_pricer.execution_report
+        print(f"  M = {M}: overhead efektif {report['overhead']:.2%} "
+              f"vs over-sampling tetap {report['fixed_oversampling']:.0%}")
+    results_data.append(row_ck)
+
     # --- Buat dan Simpan Tabel ---
     df = pd.DataFrame(results_data)
 
@@ -28,7 +28,7 @@ def main():
 
     # 2. Buat sebuah INSTANCE dari kelas solver
     # Masukkan matriks A dan vektor b saat inisialisasi
-    solver = MonteCarloLinearSolver(A, b)
+    solver = MonteCarloLinearSolver(A, b, verbose=True)
 
     # 3. Panggil METODE solve_slae dari objek solver
     # Kita set parallel=False untuk pengujian sekuensial sederhana ini
@@ -1,35 +1,328 @@
+import time
 import numpy as np
 from scipy.stats.qmc import Sobol
 from scipy.stats import norm
 from ..utils.parallel_runner import run_parallel
+from ..utils.accumulators import RunningStats, MCEstimate, merge_stats_list, control_variate_estimate
+from ..utils.backends import resolve_backend, njit, prange
+from ..utils.rng import resolve_seed, block_generator, stream_blocks, group_blocks
+from ..utils.adaptive import StoppingRule, run_adaptive
+from ..utils import instrumentation
+from .analytic import black_scholes_analytic, geometric_asian_analytic
+from .qmc import SobolPathGenerator
+from .greeks import run_greeks
+
+# Jumlah jalur Asia per tugas; hasil tiap blok direduksi menjadi satu RunningStats.
+DEFAULT_BATCH_SIZE = 10_000
+# Jumlah jalur per blok stream RNG. Lebih kecil dari blok Eropa karena setiap jalur
+# membutuhkan num_steps bilangan normal.
+PATH_BLOCK_SIZE = 2 ** 12
+# Batas jumlah bilangan normal (jalur x langkah) yang dibentuk sekaligus. Blok stream
+# diproses per potongan baris, sehingga memori puncak tidak bergantung pada M maupun
+# num_steps; stream tetap sama karena normal diambil berurutan dari Generator blok.
+PATH_CHUNK_ELEMENTS = 2 ** 20
+# Kontrol untuk mode control variate: call Asia geometrik dan call Eropa pada S_T,
+# keduanya memiliki harga closed form (lihat analytic.py).
+CONTROL_VARIATES = ('geometric', 'european')
 
 # --- KELAS UNTUK OPSI ASIA (PATH-DEPENDENT) ---
-def _asian_option_walk_worker(args):
-    """Worker untuk satu jalur simulasi Opsi Asia."""
+def _asian_option_walk_worker(args, rng=np.random):
+    """Worker untuk satu jalur simulasi Opsi Asia. `rng` dapat berupa np.random.Generator."""
     S, E, r, sigma, T, num_steps = args
     dt = T / num_steps
     path = np.zeros(num_steps + 1)
     path[0] = S
     for i in range(1, num_steps + 1):
-        Z = np.random.normal()
+        Z = rng.normal()
         path[i] = path[i-1] * np.exp((r - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * Z)
     average_price = np.mean(path[1:])
     payoff = np.maximum(average_price - E, 0)
     return payoff
 
+def _asian_payoffs_numpy(S, E, r, sigma, T, Z, controls=()):
+    """
+    Payoff Opsi Asia untuk satu potongan jalur; Z berbentuk (jumlah jalur, num_steps).
+    Z ditimpa di tempat (increment log, cumsum, exp) sehingga tidak ada array sementara
+    seukuran jalur selain Z sendiri.
+    Dengan `controls` (lihat CONTROL_VARIATES) dikembalikan array (jumlah jalur, 1 + k):
+    kolom pertama payoff aritmetika, sisanya payoff kontrol pada jalur yang sama.
+    """
+    dt = T / Z.shape[1]
+    Z *= sigma * np.sqrt(dt)
+    Z += (r - 0.5 * sigma**2) * dt
+    np.cumsum(Z, axis=1, out=Z)
+    control_payoffs = []
+    for control in controls:
+        # Dihitung dari log-harga sebelum Z ditimpa dengan exp
+        log_price = Z.mean(axis=1) if control == 'geometric' else Z[:, -1]
+        control_payoffs.append(np.maximum(S * np.exp(log_price) - E, 0))
+    np.exp(Z, out=Z)
+    average_price = Z.mean(axis=1)
+    average_price *= S
+    average_price -= E
+    payoffs = np.maximum(average_price, 0, out=average_price)
+    return np.column_stack([payoffs] + control_payoffs) if controls else payoffs
+
+@njit(parallel=True, cache=True)
+def _asian_payoffs_numba(S, E, drift, vol, Z, out):
+    """Kernel Numba: jalur GBM dan rata-rata aritmetika per jalur, paralel dengan prange."""
+    num_paths, num_steps = Z.shape
+    for k in prange(num_paths):
+        log_price = 0.0
+        total = 0.0
+        for j in range(num_steps):
+            log_price += drift + vol * Z[k, j]
+            total += np.exp(log_price)
+        out[k] = max(S * total / num_steps - E, 0.0)
+
+def _asian_block_payoffs(S, E, r, sigma, T, num_steps, num_paths, kernel, rng, controls=()):
+    """Payoff untuk satu blok stream dengan kernel 'python', 'numpy' atau 'numba'."""
+    probe = instrumentation.probe()
+    probe.count('paths', num_paths)
+    if kernel == 'python':
+        walk_args = (S, E, r, sigma, T, num_steps)
+        with probe.phase('payoff'):
+            return np.fromiter((_asian_option_walk_worker(walk_args, rng) for _ in range(num_paths)),
+                               dtype=float, count=num_paths)
+    dt = T / num_steps
+    payoffs = np.empty((num_paths, 1 + len(controls)) if controls else num_paths)
+    chunk = max(1, PATH_CHUNK_ELEMENTS // num_steps)
+    for k in range(0, num_paths, chunk):
+        with probe.phase('rng'):
+            Z = rng.standard_normal((min(chunk, num_paths - k), num_steps))
+        with probe.phase('payoff'):
+            if kernel == 'numba':
+                _asian_payoffs_numba(S, E, (r - 0.5 * sigma**2) * dt, sigma * np.sqrt(dt), Z, payoffs[k:k + len(Z)])
+            else:
+                payoffs[k:k + len(Z)] = _asian_payoffs_numpy(S, E, r, sigma, T, Z, controls)
+    return payoffs
+
+def _asian_option_chunk_worker(args):
+    """Worker untuk satu tugas Opsi Asia; mengembalikan list RunningStats per blok stream."""
+    S, E, r, sigma, T, num_steps, blocks, histogram, kernel, entropy, controls = args
+    def new_stats():
+        if controls:
+            return RunningStats(shape=1 + len(controls), track_covariance=True)
+        return RunningStats(track_extrema=True, histogram=histogram)
+    results = []
+    for block_index, size in blocks:
+        payoffs = _asian_block_payoffs(S, E, r, sigma, T, num_steps, size, kernel,
+                                       block_generator(entropy, block_index), controls)
+        with instrumentation.probe().phase('accumulate'):
+            results.append(new_stats().update(payoffs))
+    return results
+
+# Batas jumlah elemen payoff (jalur x maturitas x strike) yang dibentuk sekaligus pada grid.
+GRID_CHUNK_ELEMENTS = 2 ** 21
+
+def _asian_grid_payoffs(S, strikes, r, sigma, dt, maturity_steps, Z):
+    """
+    Payoff Opsi Asia untuk semua (maturitas, strike) dari satu blok jalur. Maturitas ke-j
+    merata-ratakan harga pada maturity_steps[j] langkah pertama jalur yang sama.
+    Z ditimpa di tempat. Mengembalikan array (jumlah jalur, jumlah maturitas, jumlah strike).
+    """
+    Z *= sigma * np.sqrt(dt)
+    Z += (r - 0.5 * sigma**2) * dt
+    np.cumsum(Z, axis=1, out=Z)
+    np.exp(Z, out=Z)
+    np.cumsum(Z, axis=1, out=Z)
+    average_price = S * Z[:, maturity_steps - 1] / maturity_steps
+    return np.maximum(average_price[:, :, None] - strikes, 0)
+
+def asian_grid_worker(args):
+    """
+    Worker pricing grid Asia: list RunningStats berbentuk (maturitas, strike) per blok stream.
+    args = (S, strikes, r, sigma, dt, maturity_steps, blocks, entropy), dengan blocks = list
+    (indeks blok, ukuran) dari group_blocks; dipakai price_grid dan PricingService.
+    """
+    S, strikes, r, sigma, dt, maturity_steps, blocks, entropy = args
+    grid_shape = (len(maturity_steps), len(strikes))
+    num_steps = maturity_steps.max()
+    chunk = max(1, min(GRID_CHUNK_ELEMENTS // (grid_shape[0] * grid_shape[1]), PATH_CHUNK_ELEMENTS // num_steps))
+    results = []
+    for block_index, size in blocks:
+        rng = block_generator(entropy, block_index)
+        stats = RunningStats(shape=grid_shape)
+        for k in range(0, size, chunk):
+            Z = rng.standard_normal((min(chunk, size - k), num_steps))
+            stats.update(_asian_grid_payoffs(S, strikes, r, sigma, dt, maturity_steps, Z))
+        results.append(stats)
+    return results
+
+def _asian_qmc_scramble_worker(args):
+    """Worker RQMC: rata-rata payoff Asia (belum didiskonto) untuk satu scrambling Sobol."""
+    S, E, r, sigma, T, num_steps, num_points, scramble, entropy, brownian_bridge = args
+    generator = SobolPathGenerator(num_steps, T, brownian_bridge)
+    drift = (r - 0.5 * sigma**2) * T * np.arange(1, num_steps + 1) / num_steps
+    total, count = 0.0, 0
+    for W in generator.brownian_paths(num_points, entropy, scramble):
+        W *= sigma
+        W += drift
+        np.exp(W, out=W)
+        total += np.sum(np.maximum(S * W.mean(axis=1) - E, 0))
+        count += len(W)
+    return total / count
+
 class AsianOptionPricer:
     """Menangani masalah keuangan yang lebih kompleks (path-dependent)."""
     def __init__(self, S, E, r, sigma, T, num_steps):
         self.S, self.E, self.r, self.sigma, self.T = S, E, r, sigma, T
         self.num_steps = num_steps
 
-    def price(self, M, parallel=True, num_processes=4):
-        tasks = [(self.S, self.E, self.r, self.sigma, self.T, self.num_steps)] * M
-        if parallel:
-            payoffs = run_parallel(_asian_option_walk_worker, tasks, num_processes)
+    @instrumentation.per_call
+    def price(self, M, parallel=True, num_processes=4, batch_size=DEFAULT_BATCH_SIZE,
+              return_stats=False, confidence_level=0.95, histogram=None, backend=None, seed=None,
+              target_stderr=None, rel_tol=None, max_seconds=None, control_variate=None):
+        """
+        Harga Opsi Asia aritmetika. Payoff direduksi per blok ke RunningStats,
+        sehingga memori tidak bergantung pada M.
+        Args:
+            backend (str): 'python', 'numpy', 'numba' atau 'process' (lihat utils/backends.py).
+                None = blok NumPy, dibagi ke proses jika parallel=True.
+            seed (int): Seed untuk stream RNG per blok; hasil identik berapa pun num_processes.
+            return_stats (bool): Kembalikan MCEstimate (harga, standard error, CI).
+            histogram (tuple): (bins, (low, high)) untuk histogram payoff.
+            target_stderr, rel_tol, max_seconds: Mode adaptif (lihat MonteCarloBSMPricer.price_option);
+                M menjadi batas atas jumlah jalur dan hasilnya selalu MCEstimate.
+            control_variate (str | list): 'geometric' (call Asia geometrik), 'european'
+                (call Eropa pada S_T) atau keduanya. Payoff kontrol dihitung pada jalur yang
+                sama, beta optimal diestimasi dari kovariansi yang terakumulasi, dan faktor
+                reduksi variansi dilaporkan di MCEstimate.variance_reduction. Hanya untuk
+                blok NumPy (backend None, 'numpy' atau 'process').
+        """
+        if M < 1: raise ValueError("Jumlah jalur M harus positif.")
+        kernel, use_processes = resolve_backend(backend, parallel, default='numpy')
+        controls = self._resolve_controls(control_variate, kernel, histogram)
+        entropy = resolve_seed(seed)
+        if controls:
+            stats = RunningStats(shape=1 + len(controls), track_covariance=True)
+        else:
+            stats = RunningStats(track_extrema=True, histogram=histogram)
+
+        def run_blocks(blocks):
+            tasks = [(self.S, self.E, self.r, self.sigma, self.T, self.num_steps, group, histogram, kernel, entropy,
+                      controls) for group in group_blocks(blocks, batch_size)]
+            if use_processes:
+                run_parallel(_asian_option_chunk_worker, tasks, num_processes, reducer=merge_stats_list, initial=stats)
+            else:
+                for task in tasks:
+                    merge_stats_list(stats, _asian_option_chunk_worker(task))
+
+        discount = np.exp(-self.r * self.T)
+        control_means = [self._control_price(control) / discount for control in controls]
+
+        def estimate():
+            if controls:
+                value, stderr, _, _ = control_variate_estimate(stats, control_means)
+                return discount * value, discount * stderr, stats.count
+            return discount * stats.mean, discount * stats.stderr, stats.count
+
+        def result(**kwargs):
+            if not controls:
+                return MCEstimate.from_stats(stats, discount, confidence_level, **kwargs)
+            value, stderr, _, factor = control_variate_estimate(stats, control_means)
+            return MCEstimate(discount * value, discount * stderr, stats.count, confidence_level, stats,
+                              variance_reduction=factor, **kwargs)
+
+        rule = StoppingRule(target_stderr, rel_tol, max_seconds, confidence_level)
+        if rule.active:
+            converged, elapsed = run_adaptive(stream_blocks(M, PATH_BLOCK_SIZE), run_blocks, estimate, rule)
+            return result(elapsed=elapsed, converged=converged)
+
+        run_blocks(stream_blocks(M, PATH_BLOCK_SIZE))
+        estimate = result()
+        return estimate if return_stats else estimate.value
+
+    @instrumentation.per_call
+    def price_with_greeks(self, M, parallel=True, num_processes=4, batch_size=DEFAULT_BATCH_SIZE,
+                          gamma_method='mixed', confidence_level=0.95, seed=None):
+        """
+        Harga Opsi Asia beserta delta, gamma dan vega dari satu simulasi (lihat greeks.py):
+        delta dan vega pathwise, gamma 'mixed' atau 'lr' dengan skor dari increment pertama.
+        Stream RNG sama dengan price, jadi harga identik untuk seed sama.
+        Returns:
+            dict {'price', 'delta', 'gamma', 'vega'} -> MCEstimate.
+        """
+        return run_greeks(self.S, self.E, self.r, self.sigma, self.T, self.num_steps,
+                          stream_blocks(M, PATH_BLOCK_SIZE), batch_size,
+                          max(1, PATH_CHUNK_ELEMENTS // self.num_steps), gamma_method, parallel, num_processes,
+                          confidence_level, seed)
+
+    @instrumentation.per_call
+    def price_qmc(self, M, num_scrambles=8, parallel=False, num_processes=4, brownian_bridge=True,
+                  return_stats=False, confidence_level=0.95, seed=None):
+        """
+        Harga Opsi Asia dengan QMC teracak (RQMC): `num_scrambles` scrambling Sobol
+        independen berdimensi num_steps, masing-masing M / num_scrambles titik (dibulatkan
+        ke pangkat 2), dengan jalur dibangun lewat Brownian bridge. Standard error diambil
+        dari sebaran estimasi antar-scrambling; tiap scrambling adalah satu tugas paralel.
+        """
+        entropy = resolve_seed(seed)
+        num_points = int(2 ** np.ceil(np.log2(max(M / num_scrambles, 1))))
+        tasks = [(self.S, self.E, self.r, self.sigma, self.T, self.num_steps, num_points, k, entropy, brownian_bridge)
+                 for k in range(num_scrambles)]
+        if parallel and num_scrambles > 1:
+            estimates = np.array(run_parallel(_asian_qmc_scramble_worker, tasks, num_processes))
         else:
-            payoffs = [_asian_option_walk_worker(task) for task in tasks]
-        return np.exp(-self.r * self.T) * np.mean(payoffs)
+            estimates = np.array([_asian_qmc_scramble_worker(task) for task in tasks])
+        discount = np.exp(-self.r * self.T)
+        stderr = estimates.std(ddof=1) / np.sqrt(num_scrambles) if num_scrambles > 1 else np.nan
+        estimate = MCEstimate(float(discount * estimates.mean()), float(discount * stderr),
+                              num_points * num_scrambles, confidence_level)
+        return estimate if return_stats else estimate.value
+
+    @staticmethod
+    def _resolve_controls(control_variate, kernel, histogram):
+        if control_variate is None:
+            return ()
+        controls = (control_variate,) if isinstance(control_variate, str) else tuple(control_variate)
+        for control in controls:
+            if control not in CONTROL_VARIATES:
+                raise ValueError(f"Control variate tidak dikenal: {control}. Pilihan: {CONTROL_VARIATES}")
+        if kernel != 'numpy':
+            raise ValueError("Control variate hanya mendukung backend 'numpy' atau 'process'.")
+        if histogram is not None:
+            raise ValueError("Histogram tidak tersedia dalam mode control variate.")
+        return controls
+
+    def _control_price(self, control):
+        """Harga closed form (terdiskonto) dari kontrol."""
+        if control == 'geometric':
+            return geometric_asian_analytic(self.S, self.E, self.r, self.sigma, self.T, self.num_steps)
+        return black_scholes_analytic(self.S, self.E, self.r, self.sigma, self.T)
+
+    @instrumentation.per_call
+    def price_grid(self, strikes, M, maturities=None, parallel=True, num_processes=4,
+                   batch_size=DEFAULT_BATCH_SIZE, confidence_level=0.95, backend=None, seed=None):
+        """
+        Harga Opsi Asia untuk grid strike x maturitas dari satu set jalur (common random
+        numbers). Frekuensi monitoring tetap T / num_steps; maturitas dibulatkan ke kelipatan
+        langkah tersebut, dan jalur disimulasikan sampai maturitas terpanjang sekali saja.
+        Args:
+            maturities (array): None = [self.T].
+            backend (str): 'numpy' atau 'process' (grid selalu memakai blok NumPy).
+        Returns:
+            MCEstimate dengan value/stderr berbentuk (jumlah maturitas, jumlah strike).
+        """
+        kernel, use_processes = resolve_backend(backend, parallel, default='numpy')
+        if kernel != 'numpy':
+            raise ValueError("price_grid hanya mendukung backend 'numpy' atau 'process'.")
+        strikes = np.asarray(strikes, dtype=float)
+        dt = self.T / self.num_steps
+        maturities = np.atleast_1d(np.asarray(self.T if maturities is None else maturities, dtype=float))
+        maturity_steps = np.maximum(np.rint(maturities / dt).astype(np.int64), 1)
+        entropy = resolve_seed(seed)
+
+        tasks = [(self.S, strikes, self.r, self.sigma, dt, maturity_steps, group, entropy)
+                 for group in group_blocks(stream_blocks(M, PATH_BLOCK_SIZE), batch_size)]
+        stats = RunningStats(shape=(len(maturities), len(strikes)))
+        if use_processes:
+            run_parallel(asian_grid_worker, tasks, num_processes, reducer=merge_stats_list, initial=stats)
+        else:
+            for task in tasks:
+                merge_stats_list(stats, asian_grid_worker(task))
+        discount = np.exp(-self.r * maturity_steps * dt)[:, None]
+        return MCEstimate.from_stats(stats, discount, confidence_level)
 
 # --- KELAS UNTUK QUASI-MONTE CARLO (QMC) ---
 class QMCEuropeanPricer:
@@ -37,12 +330,53 @@ class QMCEuropeanPricer:
     def __init__(self, S, E, r, sigma, T):
         self.S, self.E, self.r, self.sigma, self.T = S, E, r, sigma, T
 
-    def price(self, M):
-        """Harga menggunakan sekuens Sobol. Tidak perlu paralelisasi karena sudah vektorial."""
-        M_power_of_2 = int(2**np.ceil(np.log2(M)))
-        sobol_engine = Sobol(d=1, scramble=True)
-        uniform_samples = sobol_engine.random(n=M_power_of_2).flatten()
+    def discounted_payoffs(self, uniform_samples):
+        """Payoff call terdiskonto untuk sampel uniform (titik Sobol) berdimensi satu."""
         normal_samples = norm.ppf(uniform_samples)
         ST = self.S * np.exp((self.r - 0.5 * self.sigma**2) * self.T + self.sigma * np.sqrt(self.T) * normal_samples)
-        payoffs = np.maximum(ST - self.E, 0)
-        return np.exp(-self.r * self.T) * np.mean(payoffs)
\ No newline at end of file
+        return np.exp(-self.r * self.T) * np.maximum(ST - self.E, 0)
+
+    @instrumentation.per_call
+    def price(self, M, seed=None, num_scrambles=8, target_stderr=None, rel_tol=None, max_seconds=None,
+              confidence_level=0.95):
+        """
+        Harga menggunakan sekuens Sobol. Tidak perlu paralelisasi karena sudah vektorial.
+        `seed` menentukan scrambling Sobol sehingga hasil dapat direproduksi.
+        Mode adaptif (target_stderr/rel_tol/max_seconds): QMC teracak dengan `num_scrambles`
+        scrambling independen; jumlah titik per scrambling digandakan (tetap pangkat 2) sampai
+        toleransi terpenuhi, waktu habis, atau putaran berikutnya melewati M (M menjadi batas
+        atas total titik, minimal num_scrambles). Standard error diambil
+        dari sebaran estimasi antar-scrambling (num_scrambles >= 2), dan hasilnya MCEstimate.
+        """
+        entropy = resolve_seed(seed)
+        rule = StoppingRule(target_stderr, rel_tol, max_seconds, confidence_level)
+        if rule.active and num_scrambles < 2:
+            raise ValueError("Mode adaptif QMC membutuhkan num_scrambles >= 2 untuk standard error.")
+        if not rule.active:
+            M_power_of_2 = int(2**np.ceil(np.log2(M)))
+            sobol_engine = Sobol(d=1, scramble=True, seed=block_generator(entropy, 0))
+            return np.mean(self.discounted_payoffs(sobol_engine.random(n=M_power_of_2).flatten()))
+
+        if M // num_scrambles < 1:
+            raise ValueError(f"M ({M}) harus minimal num_scrambles ({num_scrambles}) pada mode adaptif.")
+        engines = [Sobol(d=1, scramble=True, seed=block_generator(entropy, k)) for k in range(num_scrambles)]
+        sums = np.zeros(num_scrambles)
+        # Putaran pertama juga dibatasi anggaran M (pangkat 2 per scrambling)
+        points, n_new = 0, min(2 ** 8, 2 ** int(np.floor(np.log2(M // num_scrambles))))
+        start = time.perf_counter()
+        while True:
+            for k, engine in enumerate(engines):
+                sums[k] += np.sum(self.discounted_payoffs(engine.random(n=n_new).flatten()))
+            points += n_new
+            estimates = sums / points
+            value, stderr = estimates.mean(), estimates.std(ddof=1) / np.sqrt(num_scrambles)
+            elapsed = time.perf_counter() - start
+            converged = rule.converged(value, stderr)
+            # Menggandakan titik menjaga prefiks Sobol tetap pangkat 2 (sifat net terjaga)
+            n_new = points
+            if converged or 2 * points * num_scrambles > M:
+                break
+            if rule.max_seconds is not None and 2 * elapsed > rule.max_seconds:
+                break
+        return MCEstimate(float(value), float(stderr), points * num_scrambles, confidence_level,
+                          elapsed=elapsed, converged=converged)
\ No newline at end of file
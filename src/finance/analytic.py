@@ -0,0 +1,29 @@
+import numpy as np
+from scipy.stats import norm
+
+
+# ==============================================================================
+# HARGA ANALITIK (CLOSED FORM)
+# ==============================================================================
+# Dipakai sebagai harga acuan pada skrip perbandingan dan sebagai nilai harapan
+# yang diketahui untuk control variate pada pricer Monte Carlo.
+
+def black_scholes_analytic(S, E, r, sigma, T):
+    """Harga call Eropa Black-Scholes."""
+    d1 = (np.log(S / E) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    return S * norm.cdf(d1) - E * np.exp(-r * T) * norm.cdf(d2)
+
+
+def geometric_asian_analytic(S, E, r, sigma, T, num_steps):
+    """
+    Harga call Asia rata-rata geometrik dengan monitoring diskret pada t_i = i T / num_steps
+    (i = 1..num_steps), sama seperti jalur AsianOptionPricer. log G berdistribusi normal
+    dengan mean log S + (r - sigma^2/2) T (n+1)/(2n) dan variansi sigma^2 T (n+1)(2n+1)/(6n^2).
+    """
+    n = num_steps
+    mean_log = np.log(S) + (r - 0.5 * sigma ** 2) * T * (n + 1) / (2 * n)
+    var_log = sigma ** 2 * T * (n + 1) * (2 * n + 1) / (6 * n ** 2)
+    d1 = (mean_log - np.log(E) + var_log) / np.sqrt(var_log)
+    d2 = d1 - np.sqrt(var_log)
+    return np.exp(-r * T) * (np.exp(mean_log + 0.5 * var_log) * norm.cdf(d1) - E * norm.cdf(d2))
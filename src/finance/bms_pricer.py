@@ -1,16 +1,29 @@
 import numpy as np
 from ..utils.parallel_runner import run_parallel
+from ..utils.accumulators import RunningStats, MCEstimate, merge_stats_list
+from ..utils.backends import resolve_backend, njit, prange
+from ..utils.rng import resolve_seed, block_generator, stream_blocks, group_blocks
+from ..utils.adaptive import StoppingRule, run_adaptive
+from ..utils.checkpoint import ChunkCheckpoint, FaultTolerantRunner, fingerprint
+from ..utils import instrumentation
+from .greeks import run_greeks
 
+# Jumlah sampel per tugas. Di dalam tugas, jalur disimulasikan per blok stream
+# (rng.STREAM_BLOCK_SIZE) sehingga memori puncak per worker tetap beberapa MB
+# terlepas dari total jumlah simulasi M.
+DEFAULT_BATCH_SIZE = 100_000
 
-def _bms_walk_worker_extended(args):
+
+def _bms_walk_worker_extended(args, rng=np.random):
     """
     Fungsi worker yang diperluas untuk mendukung variabel antitetik.
+    `rng` dapat berupa np.random.Generator; default memakai state global lama.
     """
     S, E, r, sigma, T, use_antithetic = args
 
     if use_antithetic:
         # Menghasilkan satu bilangan acak dan pasangannya (-Z)
-        Z = np.random.normal()
+        Z = rng.normal()
         ST1 = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
         ST2 = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * (-Z))
         payoff1 = np.maximum(ST1 - E, 0)
@@ -19,12 +32,130 @@ def _bms_walk_worker_extended(args):
         return (payoff1 + payoff2) / 2.0
     else:
         # Perilaku standar seperti sebelumnya
-        Z = np.random.normal()
+        Z = rng.normal()
         ST = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
         payoff = np.maximum(ST - E, 0)
         return payoff
 
 
+@njit(parallel=True, cache=True)
+def _bms_payoffs_numba(S, E, drift, vol, Z, use_antithetic, out):
+    """Kernel Numba: ST terminal dan payoff per jalur, paralel dengan prange."""
+    for k in prange(Z.shape[0]):
+        payoff = max(S * np.exp(drift + vol * Z[k]) - E, 0.0)
+        if use_antithetic:
+            payoff = 0.5 * (payoff + max(S * np.exp(drift - vol * Z[k]) - E, 0.0))
+        out[k] = payoff
+
+
+def _bms_block_payoffs(S, E, r, sigma, T, use_antithetic, num_samples, kernel, rng):
+    """Payoff untuk satu blok stream dengan kernel 'python', 'numpy' atau 'numba'."""
+    probe = instrumentation.probe()
+    probe.count('paths', num_samples)
+    if kernel == 'python':
+        walk_args = (S, E, r, sigma, T, use_antithetic)
+        with probe.phase('payoff'):
+            return np.fromiter((_bms_walk_worker_extended(walk_args, rng) for _ in range(num_samples)),
+                               dtype=float, count=num_samples)
+
+    drift = (r - 0.5 * sigma ** 2) * T
+    vol = sigma * np.sqrt(T)
+    with probe.phase('rng'):
+        Z = rng.standard_normal(num_samples)
+    with probe.phase('payoff'):
+        if kernel == 'numba':
+            payoff = np.empty(num_samples)
+            _bms_payoffs_numba(S, E, drift, vol, Z, use_antithetic, payoff)
+            return payoff
+        payoff = np.maximum(S * np.exp(drift + vol * Z) - E, 0)
+        if use_antithetic:
+            # Setiap sampel adalah rata-rata pasangan (Z, -Z), sama seperti worker skalar
+            payoff += np.maximum(S * np.exp(drift - vol * Z) - E, 0)
+            payoff *= 0.5
+    return payoff
+
+
+def _bms_batch_worker(args):
+    """
+    Worker tugas: mensimulasikan blok-blok stream secara berurutan, masing-masing dengan
+    Generator miliknya sendiri. Mengembalikan list RunningStats per blok, sehingga yang
+    dikirim balik hanya state akumulator, bukan payoff per jalur.
+    """
+    S, E, r, sigma, T, use_antithetic, blocks, histogram, kernel, entropy = args
+    results = []
+    for block_index, size in blocks:
+        payoffs = _bms_block_payoffs(S, E, r, sigma, T, use_antithetic, size, kernel,
+                                     block_generator(entropy, block_index))
+        with instrumentation.probe().phase('accumulate'):
+            results.append(RunningStats(track_extrema=True, histogram=histogram).update(payoffs))
+    return results
+
+
+# Batas jumlah elemen payoff (sampel x maturitas x strike) yang dibentuk sekaligus
+# pada pricing grid, agar memori per worker tetap terbatas untuk grid besar.
+GRID_CHUNK_ELEMENTS = 2 ** 21
+
+
+def _bms_grid_payoffs(S, strikes, r, sigma, maturities, Z, use_antithetic):
+    """
+    Payoff eksplisit untuk semua (maturitas, strike) dari satu set jalur; Z berbentuk
+    (jumlah sampel, jumlah maturitas) dan menjadi increment Brown antar maturitas
+    (terurut naik), sehingga setiap maturitas memakai jalur yang sama.
+    Mengembalikan array (jumlah sampel, jumlah maturitas, jumlah strike).
+    """
+    W = np.cumsum(np.sqrt(np.diff(maturities, prepend=0.0)) * Z, axis=1)
+    drift = (r - 0.5 * sigma ** 2) * maturities
+    payoff = np.maximum(S * np.exp(drift + sigma * W)[:, :, None] - strikes, 0)
+    if use_antithetic:
+        payoff += np.maximum(S * np.exp(drift - sigma * W)[:, :, None] - strikes, 0)
+        payoff *= 0.5
+    return payoff
+
+
+def _call_moments_sorted(ST, strikes):
+    """
+    Mean dan M2 payoff call untuk semua strike dari satu sampel ST, tanpa membentuk
+    matriks payoff: setelah ST diurutkan, sum (ST - K)+ dan sum ((ST - K)+)^2 diperoleh
+    dari jumlah ekor ST dan ST^2, sehingga biaya per strike hanya O(log n).
+    """
+    ST = np.sort(ST)
+    n = len(ST)
+    tail1 = np.append(np.cumsum(ST[::-1])[::-1], 0.0)
+    tail2 = np.append(np.cumsum((ST * ST)[::-1])[::-1], 0.0)
+    idx = np.searchsorted(ST, strikes, side='right')
+    in_money = n - idx
+    sum1 = tail1[idx] - strikes * in_money
+    sum2 = tail2[idx] - 2 * strikes * tail1[idx] + strikes ** 2 * in_money
+    mean = sum1 / n
+    return mean, np.maximum(sum2 - sum1 * mean, 0.0)
+
+
+def bms_grid_worker(args):
+    """
+    Worker pricing grid: list RunningStats berbentuk (maturitas, strike) per blok stream.
+    args = (S, strikes, r, sigma, maturities, use_antithetic, blocks, entropy), dengan
+    blocks = list (indeks blok, ukuran) dari group_blocks; dipakai price_grid dan PricingService.
+    """
+    S, strikes, r, sigma, maturities, use_antithetic, blocks, entropy = args
+    grid_shape = (len(maturities), len(strikes))
+    chunk = max(1, GRID_CHUNK_ELEMENTS // (grid_shape[0] * grid_shape[1]))
+    results = []
+    for block_index, size in blocks:
+        Z = block_generator(entropy, block_index).standard_normal((size, grid_shape[0]))
+        if not use_antithetic:
+            W = np.cumsum(np.sqrt(np.diff(maturities, prepend=0.0)) * Z, axis=1)
+            ST = S * np.exp((r - 0.5 * sigma ** 2) * maturities + sigma * W)
+            moments = [_call_moments_sorted(ST[:, j], strikes) for j in range(grid_shape[0])]
+            results.append(RunningStats.from_moments(size, [m[0] for m in moments], [m[1] for m in moments]))
+            continue
+        # Sampel antitetik adalah rata-rata pasangan, jadi payoff dibentuk eksplisit per potongan
+        stats = RunningStats(shape=grid_shape)
+        for k in range(0, size, chunk):
+            stats.update(_bms_grid_payoffs(S, strikes, r, sigma, maturities, Z[k:k + chunk], use_antithetic))
+        results.append(stats)
+    return results
+
+
 class MonteCarloBSMPricer:
     """
     Kelas ini sekarang mendukung baik simulasi standar maupun dengan variabel antitetik.
@@ -33,25 +164,136 @@ class MonteCarloBSMPricer:
     def __init__(self, S, E, r, sigma, T):
         self.S, self.E, self.r, self.sigma, self.T = S, E, r, sigma, T
 
-    def price_option(self, M, parallel=False, num_processes=4, use_antithetic=False, fault_compensation_factor=0.0):
+    @instrumentation.per_call
+    def price_option(self, M, parallel=False, num_processes=4, use_antithetic=False, fault_compensation_factor=0.0,
+                     batch_size=DEFAULT_BATCH_SIZE, return_stats=False, confidence_level=0.95, histogram=None,
+                     backend=None, seed=None, target_stderr=None, rel_tol=None, max_seconds=None,
+                     checkpoint=None, max_retries=2, task_timeout=None):
         """
         Menghitung harga opsi.
+        Jalur disimulasikan per blok stream dengan Generator masing-masing; tugas berisi
+        sekitar `batch_size` sampel dan dengan parallel=True dibagi ke beberapa proses.
         Args:
+            backend (str): 'python', 'numpy', 'numba' atau 'process' (lihat utils/backends.py).
+                None = blok NumPy, dibagi ke proses jika parallel=True.
+            seed (int): Seed untuk stream RNG per blok. Dengan seed yang sama hasil identik
+                bit demi bit berapa pun num_processes atau batch_size (untuk backend yang sama).
             use_antithetic (bool): Aktifkan untuk menggunakan pengurangan variansi.
+            batch_size (int): Jumlah sampel per tugas (dibulatkan ke kelipatan blok stream).
+            return_stats (bool): Kembalikan MCEstimate (harga, standard error, CI)
+                alih-alih hanya harga.
+            histogram (tuple): (bins, (low, high)) untuk histogram payoff.
+            target_stderr, rel_tol, max_seconds: Mode adaptif. M menjadi batas atas jumlah
+                simulasi; blok dijalankan dalam putaran yang membesar dan berhenti begitu
+                standard error <= target_stderr, setengah lebar CI <= rel_tol * harga, atau
+                waktu habis. Selalu mengembalikan MCEstimate (dengan elapsed dan converged).
+            checkpoint (str): File checkpoint. Akumulator setiap tugas yang selesai disimpan;
+                pemanggilan ulang dengan argumen yang sama melanjutkan run yang terputus
+                (dengan seed=None, seed diambil dari checkpoint). Hasil identik dengan run
+                tanpa checkpoint.
+            max_retries, task_timeout: Tugas yang gagal diulang sampai max_retries kali;
+                tugas yang melewati task_timeout detik (worker hang/mati) dijadwalkan ulang.
+                Dengan checkpoint atau task_timeout, ringkasan eksekusi (termasuk overhead
+                efektif dibanding over-sampling tetap 5%) tersedia di self.execution_report.
         """
         num_simulations = int(M * (1 + fault_compensation_factor))
 
-        # Jika antitetik, setiap walk menghasilkan 2 jalur, jadi kita hanya butuh M/2 walk.
+        # Jika antitetik, setiap sampel menghasilkan 2 jalur, jadi kita hanya butuh M/2 sampel.
         if use_antithetic:
-            # Pastikan jumlah simulasi genap jika dibagi 2
-            num_simulations = (num_simulations // 2) * 2
-            tasks = [(self.S, self.E, self.r, self.sigma, self.T, True)] * (num_simulations // 2)
+            num_samples = num_simulations // 2
         else:
-            tasks = [(self.S, self.E, self.r, self.sigma, self.T, False)] * num_simulations
+            num_samples = num_simulations
+        if num_samples < 1:
+            raise ValueError("Jumlah simulasi M harus positif (minimal 2 dengan use_antithetic).")
+
+        kernel, use_processes = resolve_backend(backend, parallel, default='numpy')
+        runner = None
+        if checkpoint is not None or task_timeout is not None:
+            store = None if checkpoint is None else ChunkCheckpoint(
+                checkpoint, fingerprint('price_option', self.S, self.E, self.r, self.sigma, self.T, use_antithetic,
+                                        num_samples, batch_size, histogram, kernel), seed)
+            runner = FaultTolerantRunner(use_processes, num_processes, store, max_retries, task_timeout)
+            self.execution_report = runner.report
+            seed = seed if store is None else store.entropy
+        entropy = resolve_seed(seed)
+        stats = RunningStats(track_extrema=True, histogram=histogram)
+
+        def run_blocks(blocks):
+            groups = group_blocks(blocks, batch_size)
+            tasks = [(self.S, self.E, self.r, self.sigma, self.T, use_antithetic, group, histogram, kernel, entropy)
+                     for group in groups]
+            if runner is not None:
+                # Id chunk = rentang blok stream, sehingga tetap valid lintas putaran adaptif
+                runner.run(_bms_batch_worker, tasks, [(group[0][0], group[-1][0]) for group in groups],
+                           merge_stats_list, stats)
+            elif use_processes and len(tasks) > 1:
+                run_parallel(_bms_batch_worker, tasks, num_processes, reducer=merge_stats_list, initial=stats)
+            else:
+                for task in tasks:
+                    merge_stats_list(stats, _bms_batch_worker(task))
+
+        discount = np.exp(-self.r * self.T)
+        rule = StoppingRule(target_stderr, rel_tol, max_seconds, confidence_level)
+        if rule.active:
+            converged, elapsed = run_adaptive(stream_blocks(num_samples), run_blocks,
+                                              lambda: (discount * stats.mean, discount * stats.stderr, stats.count),
+                                              rule)
+            return MCEstimate.from_stats(stats, discount, confidence_level, elapsed=elapsed, converged=converged)
+
+        run_blocks(stream_blocks(num_samples))
+        estimate = MCEstimate.from_stats(stats, discount, confidence_level)
+        return estimate if return_stats else estimate.value
+
+    @instrumentation.per_call
+    def price_with_greeks(self, M, parallel=False, num_processes=4, batch_size=DEFAULT_BATCH_SIZE,
+                          gamma_method='mixed', confidence_level=0.95, seed=None):
+        """
+        Harga beserta delta, gamma dan vega dari SATU simulasi: delta dan vega pathwise,
+        gamma likelihood ratio ('lr') atau campuran LR-pathwise ('mixed', default, variansi
+        lebih kecil). Stream RNG sama dengan price_option, jadi harga identik untuk seed sama.
+        Returns:
+            dict {'price', 'delta', 'gamma', 'vega'} -> MCEstimate (nilai dan standard error).
+        """
+        return run_greeks(self.S, self.E, self.r, self.sigma, self.T, 1, stream_blocks(M), batch_size,
+                          GRID_CHUNK_ELEMENTS, gamma_method, parallel, num_processes, confidence_level, seed)
+
+    @instrumentation.per_call
+    def price_grid(self, strikes, M, maturities=None, parallel=False, num_processes=4, use_antithetic=False,
+                   batch_size=DEFAULT_BATCH_SIZE, confidence_level=0.95, backend=None, seed=None):
+        """
+        Harga untuk seluruh grid strike x maturitas dari SATU set jalur (common random
+        numbers): distribusi terminal tidak bergantung pada strike, sehingga payoff semua
+        strike dievaluasi dalam satu lintasan vektorial dan biayanya mendekati satu strike.
+        Jalur Brown dibangun pada titik-titik maturitas, jadi maturitas yang berbeda juga
+        berbagi jalur yang sama.
+        Args:
+            strikes (array): Harga exercise.
+            maturities (array): Maturitas; None = [self.T].
+            backend (str): 'numpy' atau 'process' (grid selalu memakai blok NumPy).
+            seed (int): Dengan maturitas tunggal self.T, stream identik dengan price_option.
+        Returns:
+            MCEstimate dengan value/stderr berbentuk (jumlah maturitas, jumlah strike).
+        """
+        kernel, use_processes = resolve_backend(backend, parallel, default='numpy')
+        if kernel != 'numpy':
+            raise ValueError("price_grid hanya mendukung backend 'numpy' atau 'process'.")
+        strikes = np.asarray(strikes, dtype=float)
+        maturities = np.atleast_1d(np.asarray(self.T if maturities is None else maturities, dtype=float))
+        order = np.argsort(maturities)
+        num_samples = M // 2 if use_antithetic else M
+        entropy = resolve_seed(seed)
 
-        if parallel and len(tasks) > 1000:
-            payoffs = run_parallel(_bms_walk_worker_extended, tasks, num_processes)
+        tasks = [(self.S, strikes, self.r, self.sigma, maturities[order], use_antithetic, group, entropy)
+                 for group in group_blocks(stream_blocks(num_samples), batch_size)]
+        stats = RunningStats(shape=(len(maturities), len(strikes)))
+        if use_processes and len(tasks) > 1:
+            run_parallel(bms_grid_worker, tasks, num_processes, reducer=merge_stats_list, initial=stats)
         else:
-            payoffs = [_bms_walk_worker_extended(task) for task in tasks]
+            for task in tasks:
+                merge_stats_list(stats, bms_grid_worker(task))
 
-        return np.exp(-self.r * self.T) * np.mean(payoffs)
\ No newline at end of file
+        # Kembalikan baris ke urutan maturitas asli
+        inverse = np.argsort(order)
+        stats.mean, stats.M2 = stats.mean[inverse], stats.M2[inverse]
+        discount = np.exp(-self.r * maturities)[:, None]
+        return MCEstimate.from_stats(stats, discount, confidence_level)
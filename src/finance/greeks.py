@@ -0,0 +1,83 @@
+import numpy as np
+from ..utils.parallel_runner import run_parallel
+from ..utils.accumulators import RunningStats, MCEstimate, merge_stats_list
+from ..utils.rng import resolve_seed, block_generator, group_blocks
+
+# ==============================================================================
+# GREEKS DALAM SATU LINTASAN SIMULASI
+# ==============================================================================
+# Harga, delta, gamma dan vega diakumulasi bersama dari jalur yang sama (satu sampel =
+# vektor 4 komponen), sehingga tidak perlu bump-and-reprice. Call Eropa adalah kasus
+# khusus call Asia dengan satu titik monitoring (A = S_T), jadi kedua pricer memakai
+# estimator yang sama:
+#   delta, vega : pathwise, 1{A > E} dA/dS dan 1{A > E} dA/dsigma
+#   gamma       : payoff pathwise tidak dapat diturunkan dua kali (indikator), sehingga
+#                 'mixed' = likelihood ratio atas delta pathwise, 'lr' = likelihood ratio
+#                 murni atas payoff. Skor LR berasal dari increment pertama Z_1.
+
+GREEKS = ('price', 'delta', 'gamma', 'vega')
+GAMMA_METHODS = ('mixed', 'lr')
+
+
+def _greek_samples(S, E, r, sigma, T, Z, gamma_method):
+    """Sampel (jalur, 4) terdiskonto [harga, delta, gamma, vega]; Z berbentuk (jalur, num_steps)."""
+    num_steps = Z.shape[1]
+    dt = T / num_steps
+    times = dt * np.arange(1, num_steps + 1)
+    z1 = Z[:, 0].copy()
+    log_paths = np.cumsum((r - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * Z, axis=1)
+    prices = np.exp(log_paths)
+    average = S * prices.mean(axis=1)
+    # dS_i/dsigma = S_i (W_i - sigma t_i) = S_i (log(S_i/S) - (r + sigma^2/2) t_i) / sigma
+    log_paths -= (r + 0.5 * sigma**2) * times
+    log_paths *= prices
+    dA_dsigma = S * log_paths.mean(axis=1) / sigma
+
+    discount = np.exp(-r * T)
+    in_money = average > E
+    samples = np.empty((len(Z), 4))
+    samples[:, 0] = discount * np.maximum(average - E, 0)
+    samples[:, 1] = discount * in_money * average / S
+    score = z1 / (sigma * np.sqrt(dt))
+    if gamma_method == 'mixed':
+        samples[:, 2] = samples[:, 1] * (score - 1) / S
+    else:
+        samples[:, 2] = samples[:, 0] * (score**2 - score - 1 / (sigma**2 * dt)) / S**2
+    samples[:, 3] = discount * in_money * dA_dsigma
+    return samples
+
+
+def _greeks_worker(args):
+    """Worker Greeks: list RunningStats (4 komponen) per blok stream, memakai stream pricer."""
+    S, E, r, sigma, T, num_steps, blocks, gamma_method, chunk, entropy = args
+    results = []
+    for block_index, size in blocks:
+        rng = block_generator(entropy, block_index)
+        stats = RunningStats(shape=len(GREEKS))
+        for k in range(0, size, chunk):
+            stats.update(_greek_samples(S, E, r, sigma, T, rng.standard_normal((min(chunk, size - k), num_steps)),
+                                        gamma_method))
+        results.append(stats)
+    return results
+
+
+def run_greeks(S, E, r, sigma, T, num_steps, blocks, batch_size, chunk, gamma_method='mixed', parallel=False,
+               num_processes=4, confidence_level=0.95, seed=None):
+    """
+    Driver bersama untuk price_with_greeks. `blocks` adalah blok stream pricer, sehingga
+    dengan seed yang sama harga identik dengan price_option/price.
+    Mengembalikan dict {'price', 'delta', 'gamma', 'vega'} -> MCEstimate.
+    """
+    if gamma_method not in GAMMA_METHODS:
+        raise ValueError(f"Metode gamma tidak dikenal: {gamma_method}. Pilihan: {GAMMA_METHODS}")
+    entropy = resolve_seed(seed)
+    tasks = [(S, E, r, sigma, T, num_steps, group, gamma_method, chunk, entropy)
+             for group in group_blocks(blocks, batch_size)]
+    stats = RunningStats(shape=len(GREEKS))
+    if parallel and len(tasks) > 1:
+        run_parallel(_greeks_worker, tasks, num_processes, reducer=merge_stats_list, initial=stats)
+    else:
+        for task in tasks:
+            merge_stats_list(stats, _greeks_worker(task))
+    return {name: MCEstimate(float(stats.mean[k]), float(stats.stderr[k]), stats.count, confidence_level, stats)
+            for k, name in enumerate(GREEKS)}
@@ -0,0 +1,188 @@
+import time
+import numpy as np
+from ..utils import instrumentation
+from ..utils.parallel_runner import ParallelExecutor, split_into_blocks
+from ..utils.accumulators import RunningStats, MCEstimate, merge_stats_list
+from ..utils.rng import resolve_seed, block_generator
+from .advanced_mc import PATH_BLOCK_SIZE, PATH_CHUNK_ELEMENTS
+
+# ==============================================================================
+# MULTILEVEL MONTE CARLO (MLMC) UNTUK OPSI ASIA
+# ==============================================================================
+# Level l memonitor rata-rata pada coarsest_steps * 2^l titik; level terakhir sama
+# dengan grid num_steps milik AsianOptionPricer. E[P_L] = E[P_0] + sum_l E[P_l - P_{l-1}],
+# dengan P_l dan P_{l-1} dihitung dari jalur (increment Brown) yang SAMA, sehingga
+# Var(P_l - P_{l-1}) kecil dan sebagian besar sampel jatuh di level kasar yang murah.
+
+
+def _mlmc_level_payoffs(S, E, r, sigma, T, fine_steps, level, Z):
+    """
+    Sampel level berbentuk (jalur, 2): kolom pertama Y_l (P_0 untuk level 0, selain itu
+    P_fine - P_coarse), kolom kedua P_fine. Jalur kasar memakai titik genap jalur halus
+    (t = 2dt, 4dt, ...), yaitu jumlah dua increment halus. Z (jalur, fine_steps) ditimpa.
+    """
+    dt = T / fine_steps
+    Z *= sigma * np.sqrt(dt)
+    Z += (r - 0.5 * sigma**2) * dt
+    np.cumsum(Z, axis=1, out=Z)
+    np.exp(Z, out=Z)
+    fine = np.maximum(S * Z.mean(axis=1) - E, 0)
+    if level == 0:
+        return np.column_stack((fine, fine))
+    return np.column_stack((fine - np.maximum(S * Z[:, 1::2].mean(axis=1) - E, 0), fine))
+
+
+def _mlmc_level_worker(args):
+    """
+    Worker MLMC: (list RunningStats per blok stream, waktu komputasi). Kunci RNG =
+    (level, indeks blok). Waktu diukur di worker, sehingga biaya per sampel tidak memuat
+    startup pool, antrean atau reduksi.
+    """
+    S, E, r, sigma, T, fine_steps, level, blocks, entropy = args
+    start = time.perf_counter()
+    chunk = max(1, PATH_CHUNK_ELEMENTS // fine_steps)
+    results = []
+    for block_index, size in blocks:
+        rng = block_generator(entropy, level, block_index)
+        stats = RunningStats(shape=2)
+        for k in range(0, size, chunk):
+            stats.update(_mlmc_level_payoffs(S, E, r, sigma, T, fine_steps, level,
+                                             rng.standard_normal((min(chunk, size - k), fine_steps))))
+        results.append(stats)
+    return results, time.perf_counter() - start
+
+
+def _merge_level(acc, result):
+    # acc = (RunningStats level, total waktu komputasi worker)
+    stats, seconds = acc
+    results, elapsed = result
+    return merge_stats_list(stats, results), seconds + elapsed
+
+
+class MultilevelAsianPricer:
+    """
+    Driver MLMC di atas AsianOptionPricer. Variansi dan biaya per sampel setiap level
+    diestimasi dari pilot run, lalu jumlah sampel per level dialokasikan secara optimal
+    (N_l ~ sqrt(V_l / C_l)) untuk mencapai target RMSE dengan biaya O(eps^-2).
+    """
+
+    def __init__(self, pricer, coarsest_steps=1):
+        """
+        Args:
+            pricer (AsianOptionPricer): Produk yang di-price; num_steps-nya menjadi level terhalus
+                dan harus sama dengan coarsest_steps * 2^L.
+            coarsest_steps (int): Jumlah titik monitoring pada level 0.
+        """
+        ratio = pricer.num_steps // coarsest_steps
+        if ratio < 1 or coarsest_steps * ratio != pricer.num_steps or ratio & (ratio - 1):
+            raise ValueError("num_steps harus sama dengan coarsest_steps * 2^L.")
+        self.pricer = pricer
+        self.num_levels = int(np.log2(ratio)) + 1
+        self.level_steps = [coarsest_steps * 2 ** l for l in range(self.num_levels)]
+        self.levels, self.standard_mc_cost, self.weak_error = [], None, None
+
+    def _run_level(self, level, num_samples, stats, next_block, executor, entropy):
+        """
+        Menambah num_samples sampel ke stats[level] (di `executor`, atau sekuensial jika
+        None); mengembalikan total waktu komputasi di worker.
+        """
+        p = self.pricer
+        fine_steps = self.level_steps[level]
+        block_size = max(1, min(PATH_BLOCK_SIZE, PATH_CHUNK_ELEMENTS // fine_steps))
+        blocks = [(next_block[level] + k, size) for k, size in enumerate(split_into_blocks(num_samples, block_size))]
+        next_block[level] += len(blocks)
+        tasks = [(p.S, p.E, p.r, p.sigma, p.T, fine_steps, level, [block], entropy) for block in blocks]
+        acc = (stats[level], 0.0)
+        if executor is not None and len(tasks) > 1:
+            acc = executor.map_reduce(_mlmc_level_worker, tasks, reducer=_merge_level, initial=acc)
+        else:
+            for task in tasks:
+                acc = _merge_level(acc, _mlmc_level_worker(task))
+        return acc[1]
+
+    @instrumentation.per_call
+    def price(self, target_rmse, pilot_samples=10_000, parallel=False, num_processes=4, max_iterations=5,
+              confidence_level=0.95, seed=None):
+        """
+        Harga dengan target RMSE. Jumlah level L tetap: level terhalus sama dengan produk
+        diskret milik pricer (num_steps titik monitoring), sehingga tidak ada bias
+        diskretisasi terhadap produk tersebut, tidak ada level yang ditambahkan, dan seluruh
+        anggaran eps^2 dipakai untuk variansi: sum_l V_l / N_l <= eps^2 (harga terdiskonto).
+        Sebagai informasi, self.weak_error = |E[Y_L]| / (2^alpha - 1) dengan alpha = 1, yaitu
+        perkiraan standar MLMC untuk selisih produk diskret terhadap monitoring kontinu.
+        Alokasi dihitung ulang dengan variansi terbaru sampai tidak ada sampel tambahan
+        (paling banyak max_iterations putaran). Semua level berjalan di satu pool (atau
+        eksekutor yang diberikan lewat num_processes). Biaya per sampel C_l adalah waktu
+        komputasi di worker, bukan waktu dinding, sehingga startup pool dan antrean tidak
+        menggeser alokasi; karena tetap terukur, `seed` menentukan stream RNG per (level, blok)
+        tetapi N_l dapat sedikit berbeda antar run.
+        Returns:
+            MCEstimate; tabel per level (N, variansi, biaya) tersedia di self.levels
+            dan self.format_table().
+        """
+        if target_rmse <= 0: raise ValueError("target_rmse harus positif.")
+        if pilot_samples < 2: raise ValueError("pilot_samples minimal 2 agar variansi level terdefinisi.")
+        if max_iterations < 0: raise ValueError("max_iterations tidak boleh negatif.")
+        entropy = resolve_seed(seed)
+        discount = np.exp(-self.pricer.r * self.pricer.T)
+        L = self.num_levels
+        stats = [RunningStats(shape=2) for _ in range(L)]
+        next_block = [0] * L
+        seconds = np.zeros(L)
+        start = time.perf_counter()
+
+        executor, own_executor = None, False
+        if parallel:
+            own_executor = not hasattr(num_processes, 'map_reduce')
+            executor = ParallelExecutor(num_processes) if own_executor else num_processes
+        try:
+            for level in range(L):
+                seconds[level] += self._run_level(level, pilot_samples, stats, next_block, executor, entropy)
+
+            for _ in range(max_iterations):
+                counts = np.array([s.count for s in stats])
+                variances = np.array([discount**2 * s.variance[0] for s in stats])
+                costs = seconds / counts
+                total = np.sum(np.sqrt(variances * costs))
+                optimal = np.ceil(np.sqrt(variances / costs) * total / target_rmse**2)
+                if not np.all(np.isfinite(optimal)):
+                    raise ValueError(f"Alokasi MLMC tidak terdefinisi (variansi {variances}, biaya {costs}).")
+                optimal = optimal.astype(np.int64)
+                extra = np.maximum(optimal - counts, 0)
+                if not np.any(extra):
+                    break
+                for level in np.nonzero(extra)[0]:
+                    seconds[level] += self._run_level(level, int(extra[level]), stats, next_block, executor, entropy)
+        finally:
+            if own_executor:
+                executor.close()
+
+        counts = np.array([s.count for s in stats])
+        variances = np.array([discount**2 * s.variance[0] for s in stats])
+        costs = seconds / counts
+        self.levels = [{'level': l, 'steps': self.level_steps[l], 'samples': int(counts[l]),
+                        'mean': float(discount * stats[l].mean[0]), 'variance': float(variances[l]),
+                        'payoff_variance': float(discount**2 * stats[l].variance[1]),
+                        'cost_per_sample': float(costs[l]), 'total_cost': float(seconds[l])}
+                       for l in range(L)]
+        value = discount * sum(float(s.mean[0]) for s in stats)
+        stderr = np.sqrt(np.sum(variances / counts))
+        self.weak_error = abs(self.levels[-1]['mean']) if L > 1 else None
+        # Biaya MC standar setara: Var(P_L) / eps^2 sampel di level terhalus
+        self.standard_mc_cost = self.levels[-1]['payoff_variance'] / target_rmse**2 * float(costs[-1])
+        return MCEstimate(value, float(stderr), int(counts.sum()), confidence_level, stats,
+                          elapsed=time.perf_counter() - start)
+
+    def format_table(self):
+        """Tabel per level dalam bentuk teks."""
+        lines = [f"{'Level':>5} {'Langkah':>8} {'N':>10} {'Mean Y_l':>12} {'Var Y_l':>12} {'Var P_l':>12} "
+                 f"{'Biaya/sampel':>13} {'Biaya total':>12}"]
+        for row in self.levels:
+            lines.append(f"{row['level']:>5} {row['steps']:>8} {row['samples']:>10} {row['mean']:>12.6f} "
+                         f"{row['variance']:>12.4e} {row['payoff_variance']:>12.4e} "
+                         f"{row['cost_per_sample']:>13.3e} {row['total_cost']:>12.4f}")
+        lines.append(f"Total biaya MLMC {sum(row['total_cost'] for row in self.levels):.4f} s, "
+                     f"MC standar setara {self.standard_mc_cost:.4f} s")
+        if self.weak_error is not None:
+            lines.append(f"Perkiraan error lemah |E[Y_L]| {self.weak_error:.3e} (L tetap = num_steps produk)")
+        return "\n".join(lines)
@@ -0,0 +1,300 @@
+import asyncio
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.stats.qmc import Sobol
+from ..utils import instrumentation
+from ..utils.parallel_runner import ParallelExecutor
+from ..utils.accumulators import RunningStats, MCEstimate
+from ..utils.rng import resolve_seed, block_generator, stream_blocks, group_blocks, STREAM_BLOCK_SIZE
+from .bms_pricer import DEFAULT_BATCH_SIZE as BSM_BATCH_SIZE, bms_grid_worker
+from .advanced_mc import DEFAULT_BATCH_SIZE as ASIAN_BATCH_SIZE, PATH_BLOCK_SIZE, QMCEuropeanPricer, asian_grid_worker
+
+# ==============================================================================
+# LAYANAN PRICING ASYNCIO: COALESCING REQUEST DAN CACHE HASIL
+# ==============================================================================
+# Request yang tiba dalam jendela pendek dan berbagi (produk, S, r, sigma, T, num_steps,
+# seed) digabung menjadi SATU simulasi jalur bersama: distribusi jalur tidak bergantung
+# pada strike, sehingga semua strike dievaluasi dari jalur yang sama (seperti price_grid),
+# dan karena stream RNG per blok, request dengan jumlah jalur lebih kecil cukup memakai
+# prefiks blok dari simulasi terbesar. Simulasi dijalankan di eksekutor proses yang
+# hidup selama layanan berjalan, bukan pool baru per request.
+#
+# Jumlah jalur dibulatkan ke atas ke kelipatan blok stream (QMC: pangkat 2), sehingga
+# dengan seed yang sama hasil tidak bergantung pada request lain dalam batch yang sama
+# dan sama (sampai pembulatan) dengan price_grid / price pada jumlah jalur tersebut
+# (QMC: dengan mode adaptif price, yang juga memakai beberapa scrambling).
+
+PRODUCTS = ('european', 'asian', 'qmc')
+# Jumlah scrambling Sobol independen per request 'qmc'; standard error diambil dari sebaran
+# estimasi antar-scrambling (sama dengan default num_scrambles QMCEuropeanPricer.price)
+QMC_SCRAMBLES = 8
+
+
+class ResultCache:
+    """Cache LRU dengan masa berlaku (TTL) per entri; maxsize=0 menonaktifkan cache."""
+
+    def __init__(self, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxsize, self.ttl, self.clock = maxsize, ttl, clock
+        self._entries = collections.OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        """Nilai untuk `key`, atau None jika tidak ada atau sudah kedaluwarsa."""
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and self.clock() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _extend(acc, part):
+    acc.extend(part)
+    return acc
+
+
+class PricingService:
+    """
+    Front end asyncio untuk MonteCarloBSMPricer ('european'), AsianOptionPricer ('asian')
+    dan QMCEuropeanPricer ('qmc'). Pemakaian:
+
+        async with PricingService(num_processes=4) as service:
+            estimate = await service.price('european', S, E, r, sigma, T, M, seed=42)
+
+    Setiap request mengembalikan MCEstimate baru dengan `elapsed` = latensi request itu;
+    ringkasan latensi dan hit rate cache tersedia lewat stats().
+    """
+
+    def __init__(self, parallel=True, num_processes=4, executor=None, window=0.005, max_batch_requests=256,
+                 cache_size=1024, cache_ttl=300.0, confidence_level=0.95, latency_window=10_000):
+        """
+        Args:
+            parallel, num_processes: Simulasi MC dibagi ke pool proses berumur panjang
+                (ParallelExecutor) yang dibuat sekali untuk layanan ini.
+            executor: Eksekutor milik pemanggil (ParallelExecutor atau distributed.Coordinator);
+                tidak ditutup oleh layanan.
+            window (float): Lama (detik) request dikumpulkan sebelum simulasi dikirim.
+            max_batch_requests (int): Batch dikirim lebih awal jika sudah sebanyak ini.
+            cache_size, cache_ttl: Kapasitas LRU dan masa berlaku (detik) hasil. Hanya
+                request dengan seed yang di-cache; seed=None selalu disimulasikan ulang.
+            latency_window (int): Jumlah latensi terakhir untuk ringkasan stats().
+        """
+        self.parallel = parallel
+        self._owns_executor = executor is None and parallel
+        self.executor = executor if executor is not None else (ParallelExecutor(num_processes) if parallel else None)
+        self.window, self.max_batch_requests = window, max_batch_requests
+        self.confidence_level = confidence_level
+        self.cache = ResultCache(cache_size, cache_ttl)
+        # Satu thread pengirim: simulasi dijalankan bergiliran di eksekutor proses,
+        # event loop tetap bebas menerima request.
+        self._dispatcher = ThreadPoolExecutor(max_workers=1)
+        self._pending = {}   # kunci grup -> list request yang sedang dikumpulkan
+        self._inflight = {}  # kunci cache -> future hasil yang sedang disimulasikan
+        self._tasks = set()
+        self._latencies = collections.deque(maxlen=latency_window)
+        self._counters = collections.Counter()
+
+    @staticmethod
+    def _effective_paths(kind, M):
+        if M < 1: raise ValueError("M harus positif.")
+        if kind == 'qmc':
+            return max(int(2 ** np.ceil(np.log2(M))), 2 * QMC_SCRAMBLES)
+        block = STREAM_BLOCK_SIZE if kind == 'european' else PATH_BLOCK_SIZE
+        return -(-int(M) // block) * block
+
+    async def price(self, kind, S, E, r, sigma, T, M, num_steps=None, seed=None):
+        """
+        Harga call untuk satu request.
+        Args:
+            kind (str): 'european', 'asian' atau 'qmc'.
+            M (int): Jumlah jalur minimum; dibulatkan ke atas ke kelipatan blok stream
+                (QMC: pangkat 2, dibagi rata ke QMC_SCRAMBLES scrambling).
+                MCEstimate.num_samples berisi jumlah yang dipakai.
+            num_steps (int): Jumlah titik monitoring (wajib untuk 'asian').
+            seed (int): Seed stream RNG; bagian dari kunci cache.
+        """
+        start = time.perf_counter()
+        if kind not in PRODUCTS:
+            raise ValueError(f"Produk tidak dikenal: {kind}. Pilihan: {PRODUCTS}")
+        if kind == 'asian' and num_steps is None:
+            raise ValueError("num_steps wajib untuk opsi Asia.")
+        num_paths = self._effective_paths(kind, M)
+        group_key = (kind, float(S), float(r), float(sigma), float(T), num_steps if kind == 'asian' else None, seed)
+        cache_key = group_key + (float(E), num_paths)
+        self._counters['requests'] += 1
+
+        source, estimate = 'cache', None
+        if seed is not None:
+            estimate = self.cache.get(cache_key)
+        if estimate is None:
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                source = 'inflight'
+            else:
+                source = 'simulation'
+                future = self._enqueue(group_key, cache_key, float(E), num_paths)
+            # shield: request yang dibatalkan tidak membatalkan hasil milik request lain
+            estimate = await asyncio.shield(future)
+
+        latency = time.perf_counter() - start
+        self._latencies.append(latency)
+        self._counters[source] += 1
+        result = MCEstimate(estimate.value, estimate.stderr, estimate.num_samples, estimate.confidence_level,
+                            estimate.stats, elapsed=latency)
+        # Instrumentasi milik simulasi bersama (termasuk request lain dalam batch yang sama)
+        result.instrumentation = estimate.instrumentation
+        return result
+
+    def _enqueue(self, group_key, cache_key, strike, num_paths):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(group_key)
+        if batch is None:
+            batch = self._pending[group_key] = []
+            loop.call_later(self.window, self._flush, group_key, batch)
+        batch.append((cache_key, strike, num_paths, future))
+        if group_key[-1] is not None:
+            self._inflight[cache_key] = future
+        if len(batch) >= self.max_batch_requests:
+            self._flush(group_key, batch)
+        return future
+
+    def _flush(self, group_key, batch):
+        if self._pending.get(group_key) is not batch:
+            return  # sudah dikirim karena max_batch_requests
+        del self._pending[group_key]
+        task = asyncio.ensure_future(self._run_batch(group_key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, group_key, batch):
+        requests = [(strike, num_paths) for _, strike, num_paths, _ in batch]
+        try:
+            estimates = await asyncio.get_running_loop().run_in_executor(self._dispatcher, self._simulate,
+                                                                         group_key, requests)
+        except Exception as error:
+            for cache_key, _, _, future in batch:
+                self._inflight.pop(cache_key, None)
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self._counters['simulations'] += 1
+        self._counters['coalesced'] += len(batch) - 1
+        self._counters['paths'] += max(num_paths for _, num_paths in requests)
+        for (cache_key, _, _, future), estimate in zip(batch, estimates):
+            if group_key[-1] is not None:
+                self.cache.put(cache_key, estimate)
+                self._inflight.pop(cache_key, None)
+            if not future.done():
+                future.set_result(estimate)
+
+    # --------------------------------------------------------------------------
+    # Simulasi bersama (dijalankan di thread pengirim)
+    # --------------------------------------------------------------------------
+
+    @instrumentation.per_call
+    def _simulate(self, group_key, requests):
+        """Satu simulasi untuk semua (strike, jumlah jalur) dalam batch; list MCEstimate."""
+        kind, S, r, sigma, T, num_steps, seed = group_key
+        entropy = resolve_seed(seed)
+        num_paths = max(n for _, n in requests)
+        if kind == 'qmc':
+            # QMC teracak seperti mode adaptif QMCEuropeanPricer.price: n titik dibagi ke
+            # QMC_SCRAMBLES scrambling; titik untuk n yang lebih kecil adalah prefiks dari
+            # setiap scrambling untuk n terbesar
+            uniform = [Sobol(d=1, scramble=True, seed=block_generator(entropy, k))
+                       .random(n=num_paths // QMC_SCRAMBLES).flatten() for k in range(QMC_SCRAMBLES)]
+            estimates = []
+            for strike, n in requests:
+                pricer = QMCEuropeanPricer(S, strike, r, sigma, T)
+                means = np.array([np.mean(pricer.discounted_payoffs(u[:n // QMC_SCRAMBLES])) for u in uniform])
+                estimates.append(MCEstimate(float(means.mean()), float(means.std(ddof=1) / np.sqrt(QMC_SCRAMBLES)),
+                                            n, self.confidence_level))
+            return estimates
+
+        strikes = np.unique([strike for strike, _ in requests])
+        if kind == 'european':
+            block_size, batch_size, worker = STREAM_BLOCK_SIZE, BSM_BATCH_SIZE, bms_grid_worker
+            discount = np.exp(-r * T)
+            make_task = lambda group: (S, strikes, r, sigma, np.array([T]), False, group, entropy)
+        else:
+            block_size, batch_size, worker = PATH_BLOCK_SIZE, ASIAN_BATCH_SIZE, asian_grid_worker
+            dt = T / num_steps
+            discount = np.exp(-r * num_steps * dt)
+            make_task = lambda group: (S, strikes, r, sigma, dt, np.array([num_steps]), group, entropy)
+        tasks = [make_task(group) for group in group_blocks(stream_blocks(num_paths, block_size), batch_size)]
+        if self.parallel and len(tasks) > 1:
+            block_stats = self.executor.map_reduce(worker, tasks, reducer=_extend, initial=[])
+        else:
+            block_stats = [stats for task in tasks for stats in worker(task)]
+
+        # Akumulator prefiks: blok digabung berurutan, momen disalin pada setiap jumlah
+        # blok yang diminta
+        needed = {n // block_size for _, n in requests}
+        prefixes, stats = {}, RunningStats(shape=(1, len(strikes)))
+        for count, block in enumerate(block_stats, start=1):
+            stats.merge(block)
+            if count in needed:
+                prefixes[count] = (stats.count, stats.mean.copy(), stats.M2.copy())
+        estimates = []
+        for strike, n in requests:
+            count, mean, M2 = prefixes[n // block_size]
+            j = np.searchsorted(strikes, strike)
+            estimates.append(MCEstimate.from_stats(RunningStats.from_moments(count, mean[0, j], M2[0, j]),
+                                                   discount, self.confidence_level))
+        return estimates
+
+    # --------------------------------------------------------------------------
+    # Statistik dan siklus hidup
+    # --------------------------------------------------------------------------
+
+    def stats(self):
+        """Ringkasan layanan: jumlah request, hit rate cache, coalescing dan latensi (detik)."""
+        latencies = np.array(self._latencies)
+        lookups = self.cache.hits + self.cache.misses
+        summary = {'requests': self._counters['requests'], 'cache_hits': self.cache.hits,
+                   'cache_misses': self.cache.misses, 'hit_rate': self.cache.hits / lookups if lookups else 0.0,
+                   'inflight_shared': self._counters['inflight'], 'simulations': self._counters['simulations'],
+                   'coalesced': self._counters['coalesced'], 'paths_simulated': self._counters['paths'],
+                   'cache_entries': len(self.cache), 'evictions': self.cache.evictions,
+                   'expirations': self.cache.expirations}
+        if len(latencies):
+            summary.update(latency_mean=float(latencies.mean()), latency_p50=float(np.percentile(latencies, 50)),
+                           latency_p95=float(np.percentile(latencies, 95)), latency_max=float(latencies.max()))
+        return summary
+
+    async def close(self):
+        """Menunggu batch yang belum selesai lalu menutup thread pengirim dan pool milik layanan."""
+        for group_key, batch in list(self._pending.items()):
+            self._flush(group_key, batch)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._dispatcher.shutdown()
+        if self._owns_executor:
+            self.executor.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,85 @@
+import numpy as np
+from scipy.stats import norm
+from scipy.stats.qmc import Sobol
+from ..utils.rng import block_generator
+
+# ==============================================================================
+# GENERATOR JALUR QUASI-MONTE CARLO (SOBOL + BROWNIAN BRIDGE)
+# ==============================================================================
+# Titik Sobol berdimensi num_steps diubah menjadi normal lalu menjadi jalur Brown.
+# Dengan Brownian bridge, dimensi pertama (yang paling seragam pada Sobol) menentukan
+# W(T), dimensi berikutnya titik tengah interval, dan seterusnya, sehingga sebagian
+# besar variansi payoff dibawa oleh dimensi awal. Setiap scrambling adalah estimator
+# tak bias yang independen: unit kerja paralel sekaligus dasar estimasi error (RQMC).
+
+# Titik Sobol dibangkitkan per blok pangkat 2 agar sifat net tetap terjaga.
+QMC_BLOCK_ELEMENTS = 2 ** 20
+
+
+class BrownianBridge:
+    """
+    Konstruksi Brownian bridge untuk W pada t_i = i T / num_steps (i = 1..num_steps).
+    Urutan konstruksi: W(T) lebih dulu, kemudian titik tengah setiap interval secara breadth-first.
+    """
+
+    def __init__(self, num_steps, T):
+        self.num_steps = num_steps
+        times = T * np.arange(1, num_steps + 1) / num_steps
+        self.first_std = np.sqrt(times[-1])
+        # Per langkah: (indeks titik, indeks kiri (-1 = t0), indeks kanan, bobot kiri, bobot kanan, std)
+        self.steps = []
+        queue = [(-1, num_steps - 1)]
+        while queue:
+            left, right = queue.pop(0)
+            if right - left < 2:
+                continue
+            mid = (left + right) // 2
+            t_left = times[left] if left >= 0 else 0.0
+            t_mid, t_right = times[mid], times[right]
+            self.steps.append((mid, left, right, (t_right - t_mid) / (t_right - t_left),
+                               (t_mid - t_left) / (t_right - t_left),
+                               np.sqrt((t_mid - t_left) * (t_right - t_mid) / (t_right - t_left))))
+            queue += [(left, mid), (mid, right)]
+
+    def build(self, Z):
+        """Jalur W berbentuk (jumlah jalur, num_steps) dari normal Z dengan bentuk yang sama."""
+        W = np.empty_like(Z)
+        W[:, -1] = self.first_std * Z[:, 0]
+        for k, (mid, left, right, w_left, w_right, std) in enumerate(self.steps, start=1):
+            W[:, mid] = w_right * W[:, right] + std * Z[:, k]
+            if left >= 0:
+                W[:, mid] += w_left * W[:, left]
+        return W
+
+
+class SobolPathGenerator:
+    """
+    Generator jalur Brown dari Sobol teracak berdimensi num_steps. Dipakai oleh pricer
+    jalur (mis. AsianOptionPricer.price_qmc); jalur dikembalikan per blok pangkat 2
+    sehingga memori terbatas berapa pun jumlah titiknya.
+    """
+
+    def __init__(self, num_steps, T, brownian_bridge=True):
+        self.num_steps, self.T = num_steps, T
+        self.bridge = BrownianBridge(num_steps, T) if brownian_bridge else None
+
+    def block_size(self, num_points):
+        """Ukuran blok pangkat 2 terbesar dengan paling banyak QMC_BLOCK_ELEMENTS elemen."""
+        limit = max(1, QMC_BLOCK_ELEMENTS // self.num_steps)
+        return min(num_points, 2 ** int(np.log2(limit)))
+
+    def brownian_paths(self, num_points, entropy, scramble=0):
+        """
+        Iterator blok W (blok, num_steps) untuk `num_points` titik (dibulatkan ke pangkat 2)
+        dari scrambling ke-`scramble`; scrambling ditentukan oleh (entropy, scramble).
+        """
+        num_points = int(2 ** np.ceil(np.log2(max(num_points, 1))))
+        engine = Sobol(d=self.num_steps, scramble=True, seed=block_generator(entropy, scramble))
+        block = self.block_size(num_points)
+        for _ in range(num_points // block):
+            # Titik tepat 0 tidak mungkin pada Sobol teracak, tetapi dijaga agar ppf terbatas
+            Z = norm.ppf(np.clip(engine.random(block), 1e-16, 1 - 1e-16))
+            if self.bridge is not None:
+                yield self.bridge.build(Z)
+            else:
+                yield np.cumsum(np.sqrt(self.T / self.num_steps) * Z, axis=1)
@@ -1,107 +1,775 @@
+import functools
+import time
 import numpy as np
-from ..utils.parallel_runner import run_parallel
+from scipy.sparse import issparse, diags, identity
+from ..utils.parallel_runner import ParallelExecutor, SharedArrays, attach_shared, split_into_blocks
+from ..utils.accumulators import RunningStats, MCEstimate
+from ..utils.backends import resolve_backend, njit, prange, stream_key, counter_uniform
+from ..utils.rng import resolve_seed, block_generator, block_key64
+from ..utils.adaptive import StoppingRule, run_adaptive
+from ..utils.checkpoint import ChunkCheckpoint, FaultTolerantRunner, fingerprint
+from ..utils import instrumentation
+from .sampling import (SAMPLING_METHODS, build_transition_table, sample_position, sample_positions,
+                       sample_position_numba)
+
+# Jumlah walk per tugas; hasil tiap tugas direduksi menjadi satu RunningStats.
+WALK_BLOCK_SIZE = 1000
+# Jumlah walker yang dimajukan bersamaan per tugas pada kernel 'numpy'/'numba'.
+LOCKSTEP_POPULATION = 2 ** 16
+# Jumlah gamma yang pra-pemrosesannya (H, tabel transisi, shared memory) disimpan.
+SLAE_CACHE_SIZE = 4
+
 
 
 # ==============================================================================
-# FUNGSI INITIALIZER DAN WORKER UNTUK PARALELISASI
+# FUNGSI WORKER UNTUK PARALELISASI
 # ==============================================================================
+# Matriks tidak lagi dikirim lewat initializer pool. Setiap tugas membawa `handle`
+# kecil dari SharedArrays; worker memetakan tabel transisi dari shared memory tanpa salinan.
+# Tabel dibangun sekali saat pra-pemrosesan (lihat sampling.py), sehingga satu langkah
+# walk berbiaya O(1) dan tidak lagi memindai satu baris penuh P.
 
-def _init_worker_globals(H_global, g_global, P_slae_global, L_global, P_mi_global):
-    global H, g, P_slae, L, P_mi
-    H, g, P_slae, L, P_mi = H_global, g_global, P_slae_global, L_global, P_mi_global
-
-def _slae_walk_worker(args):
-    i_start, epsilon, max_len = args
-    n = H.shape[0]
+def _slae_walk(table, g, i_start, epsilon, max_len, uniforms, sampling, diagonal=False):
+    # g berbentuk (n, k): satu trajektori menilai k ruas kanan sekaligus.
+    # diagonal=True: skor 1{state = i_start} (estimasi (A^-1)_ii), g diabaikan.
+    indices, weights, absorbing = table['indices'], table['weights'], table['absorbing']
     i_current = i_start
     W = 1.0
-    theta = g[i_current]
-    for _ in range(max_len):
-        if np.all(P_slae[i_current, :] == 0): break
-        i_next = np.random.choice(n, p=P_slae[i_current, :])
-        if P_slae[i_current, i_next] == 0: break
-        W *= H[i_current, i_next] / P_slae[i_current, i_next]
-        theta += W * g[i_next]
+    theta = np.ones(1) if diagonal else np.array(g[i_current], dtype=float)
+    for step in range(max_len):
+        if absorbing[i_current]: break
+        pos = sample_position(table, i_current, uniforms[step], sampling)
+        i_next = indices[pos]
+        W *= weights[pos]
+        if diagonal:
+            theta[0] += W * (i_next == i_start)
+        else:
+            theta += W * g[i_next]
         if abs(W) < epsilon: break
         i_current = i_next
     return theta
 
-def _mi_walk_worker(args):
-    i_start, m = args
-    n = L.shape[0]
+def _mi_walk(table, i_start, m, uniforms, sampling, out_row):
+    # Kontribusi W ditambahkan langsung ke baris keluaran, tanpa vektor xi dense per walk
+    indices, weights, absorbing = table['indices'], table['weights'], table['absorbing']
     current_point = i_start
     W = 1.0
-    xi = np.zeros(n)
-    xi[current_point] += W
-    for _ in range(m):
-        if np.all(P_mi[current_point, :] == 0): break
-        next_point = np.random.choice(n, p=P_mi[current_point, :])
-        if P_mi[current_point, next_point] == 0: break
-        W *= L[current_point, next_point] / P_mi[current_point, next_point]
-        xi[next_point] += W
+    out_row[current_point] += W
+    for step in range(m):
+        if absorbing[current_point]: break
+        pos = sample_position(table, current_point, uniforms[step], sampling)
+        next_point = indices[pos]
+        W *= weights[pos]
+        out_row[next_point] += W
         current_point = next_point
-    return xi
+
+def _slae_lockstep(table, g, starts, epsilon, max_len, sampling, rng, diagonal=False):
+    """
+    Mesin lockstep: seluruh populasi walker (state, W, theta, indeks awal) disimpan
+    dalam array NumPy dan dimajukan satu langkah per iterasi. Walker yang berhenti
+    (absorbing atau |W| < epsilon) dibuang lewat kompaksi. g berbentuk (n, k); theta
+    berbentuk (walker, k). diagonal=True menilai 1{state = awal} (theta berbentuk (walker, 1)).
+    Dengan instrumentasi aktif, pencacah steps/absorbed/terminated/truncated diisi per langkah.
+    """
+    indices, weights, absorbing = table['indices'], table['weights'], table['absorbing']
+    probe = instrumentation.probe()
+    starts = np.asarray(starts)
+    theta = np.ones((len(starts), 1)) if diagonal else np.array(g[starts], dtype=float)
+    walker = np.arange(len(starts))
+    state = starts
+    W = np.ones(len(starts))
+    for _ in range(max_len):
+        alive = ~absorbing[state]
+        if probe.enabled:
+            probe.count('absorbed', walker.size - np.count_nonzero(alive))
+        walker, state, W = walker[alive], state[alive], W[alive]
+        if walker.size == 0: break
+        with probe.phase('rng'):
+            uniforms = rng.random((walker.size, 2))
+        pos = sample_positions(table, state, uniforms, sampling)
+        state = indices[pos]
+        W = W * weights[pos]
+        if diagonal:
+            theta[walker, 0] += W * (state == starts[walker])
+        else:
+            theta[walker] += W[:, None] * g[state]
+        alive = np.abs(W) >= epsilon
+        if probe.enabled:
+            probe.count('steps', walker.size)
+            probe.count('terminated', walker.size - np.count_nonzero(alive))
+        walker, state, W = walker[alive], state[alive], W[alive]
+    # Walker yang masih hidup setelah max_len langkah terpotong (bias truncation)
+    probe.count('truncated', walker.size)
+    return theta
+
+def _mi_lockstep(table, n, starts, local_row, m, sampling, rng):
+    """
+    Versi lockstep untuk inversi matriks. Kontribusi W setiap langkah dicatat sebagai
+    pasangan (indeks datar local_row * n + state, W) tanpa vektor xi per walk, lalu
+    dijumlahkan dengan satu bincount begitu buffer sebesar keluaran (num_rows x n). Biaya
+    per langkah sebanding walker aktif, bukan ukuran baris keluaran.
+    """
+    indices, weights, absorbing = table['indices'], table['weights'], table['absorbing']
+    probe = instrumentation.probe()
+    num_rows = local_row[-1] + 1
+    sums = np.zeros(num_rows * n)
+    state = np.asarray(starts)
+    W = np.ones(len(starts))
+    keys, values, buffered = [local_row * n + state], [W], len(state)
+
+    def flush():
+        nonlocal buffered
+        sums[:] += np.bincount(np.concatenate(keys), weights=np.concatenate(values), minlength=num_rows * n)
+        keys.clear()
+        values.clear()
+        buffered = 0
+
+    for _ in range(m):
+        alive = ~absorbing[state]
+        if probe.enabled:
+            probe.count('absorbed', state.size - np.count_nonzero(alive))
+        local_row, state, W = local_row[alive], state[alive], W[alive]
+        if state.size == 0: break
+        with probe.phase('rng'):
+            uniforms = rng.random((state.size, 2))
+        pos = sample_positions(table, state, uniforms, sampling)
+        state = indices[pos]
+        W = W * weights[pos]
+        probe.count('steps', state.size)
+        keys.append(local_row * n + state)
+        values.append(W)
+        buffered += state.size
+        if buffered >= sums.size:
+            flush()
+    probe.count('truncated', state.size)
+    if keys:
+        flush()
+    return sums.reshape(num_rows, n)
+
+@njit(parallel=True, cache=True)
+def _slae_walks_numba(indptr, indices, weights, alias_prob, alias_idx, cdf, absorbing, g,
+                      starts, epsilon, max_len, use_alias, key, diagonal, out):
+    """
+    Kernel Numba: satu walk SLAE per walker, paralel dengan prange atas walker.
+    g berbentuk (n, k) dan out (walker, k); diagonal=True menilai 1{state = awal} ke out[:, 0].
+    """
+    for k in prange(starts.shape[0]):
+        walker_key = stream_key(key, k)
+        i_current = starts[k]
+        W = 1.0
+        if diagonal:
+            out[k, 0] = 1.0
+        else:
+            for c in range(g.shape[1]):
+                out[k, c] = g[i_current, c]
+        for step in range(max_len):
+            if absorbing[i_current]: break
+            pos = sample_position_numba(indptr, alias_prob, alias_idx, cdf, i_current,
+                                        counter_uniform(walker_key, 2 * step),
+                                        counter_uniform(walker_key, 2 * step + 1), use_alias)
+            i_next = indices[pos]
+            W *= weights[pos]
+            if diagonal:
+                if i_next == starts[k]:
+                    out[k, 0] += W
+            else:
+                for c in range(g.shape[1]):
+                    out[k, c] += W * g[i_next, c]
+            if abs(W) < epsilon: break
+            i_current = i_next
+
+@njit(parallel=True, cache=True)
+def _mi_walks_numba(indptr, indices, weights, alias_prob, alias_idx, cdf, absorbing,
+                    rows, num_walks, m, use_alias, key, sums):
+    """
+    Kernel Numba untuk inversi matriks. Paralel atas baris (bukan walker) sehingga
+    setiap thread menulis ke baris `sums` miliknya sendiri tanpa race.
+    """
+    for row in prange(sums.shape[0]):
+        for w in range(num_walks):
+            walker_key = stream_key(key, row * num_walks + w)
+            current_point = rows[row]
+            W = 1.0
+            sums[row, current_point] += W
+            for step in range(m):
+                if absorbing[current_point]: break
+                pos = sample_position_numba(indptr, alias_prob, alias_idx, cdf, current_point,
+                                            counter_uniform(walker_key, 2 * step),
+                                            counter_uniform(walker_key, 2 * step + 1), use_alias)
+                current_point = indices[pos]
+                W *= weights[pos]
+                sums[row, current_point] += W
+
+def _numba_table_args(table):
+    return (table['indptr'], table['indices'], table['weights'], table['alias_prob'],
+            table['alias_idx'], table['cdf'], table['absorbing'])
+
+def _walk_scores(table, g, starts, epsilon, max_len, sampling, kernel, rng, key, diagonal=False):
+    """
+    Skor theta (walker, k) untuk walker yang berawal di `starts`, dengan kernel pilihan.
+    Pencacah langkah hanya tersedia pada kernel 'numpy'; kernel 'python' dan 'numba'
+    hanya mencatat jumlah walk agar loop per walk tetap bebas instrumentasi.
+    """
+    probe = instrumentation.probe()
+    probe.count('walks', len(starts))
+    with probe.phase('walk'):
+        if kernel == 'numpy':
+            return _slae_lockstep(table, g, starts, epsilon, max_len, sampling, rng, diagonal)
+        num_scores = 1 if diagonal else g.shape[1]
+        thetas = np.empty((len(starts), num_scores))
+        if kernel == 'numba':
+            g = np.zeros((1, 1)) if g is None else g
+            _slae_walks_numba(*_numba_table_args(table), g, np.asarray(starts), epsilon, max_len,
+                              sampling == 'alias', key, diagonal, thetas)
+            return thetas
+        for k, i_start in enumerate(starts):
+            # Uniform diambil per walk (dua per langkah), urutan stream sama seperti per blok
+            thetas[k] = _slae_walk(table, g, i_start, epsilon, max_len, rng.random((max_len, 2)), sampling,
+                                   diagonal)
+    return thetas
+
+def _slae_chunk_worker(args):
+    handle, walk_block, pos_start, rows, epsilon, max_len, num_walks, sampling, kernel, entropy, diagonal = args
+    with instrumentation.probe().phase('attach'):
+        table = attach_shared(handle)
+    # Stream RNG ditentukan oleh (blok walk, baris pertama), bukan oleh proses yang mengeksekusi
+    starts = np.repeat(rows, num_walks)
+    rng = block_generator(entropy, walk_block, rows[0]) if kernel != 'numba' else None
+    key = block_key64(entropy, walk_block, rows[0]) if kernel == 'numba' else None
+    thetas = _walk_scores(table, table.get('g'), starts, epsilon, max_len, sampling, kernel, rng, key, diagonal)
+    # Satu sampel = matriks theta (baris x skor) untuk semua baris dalam tugas ini
+    thetas = thetas.reshape(len(rows), num_walks, -1).transpose(1, 0, 2)
+    with instrumentation.probe().phase('accumulate'):
+        return pos_start, RunningStats(shape=thetas.shape[1:]).update(thetas)
+
+def _mi_chunk_worker(args):
+    handle, walk_block, pos_start, rows, m, num_walks, sampling, kernel, entropy = args
+    probe = instrumentation.probe()
+    with probe.phase('attach'):
+        table = attach_shared(handle)
+    n = len(table['absorbing'])
+    probe.count('walks', len(rows) * num_walks)
+    with probe.phase('walk'):
+        if kernel == 'numpy':
+            starts = np.repeat(rows, num_walks)
+            local_row = np.repeat(np.arange(len(rows)), num_walks)
+            rng = block_generator(entropy, walk_block, rows[0])
+            return pos_start, _mi_lockstep(table, n, starts, local_row, m, sampling, rng), num_walks
+        sums = np.zeros((len(rows), n))
+        if kernel == 'numba':
+            _mi_walks_numba(*_numba_table_args(table), np.asarray(rows), num_walks, m,
+                            sampling == 'alias', block_key64(entropy, walk_block, rows[0]), sums)
+            return pos_start, sums, num_walks
+        rng = block_generator(entropy, walk_block, rows[0])
+        for row, i_start in enumerate(rows):
+            for _ in range(num_walks):
+                _mi_walk(table, i_start, m, rng.random((m, 2)), sampling, sums[row])
+    return pos_start, sums, num_walks
+
+def _bilinear_worker(args):
+    """
+    Worker untuk u^T A^-1 v: baris awal diambil dengan peluang |u_i| / ||u||_1 dan skor
+    walk (A^-1 v)_i diberi bobot sign(u_i) ||u||_1, sehingga tidak perlu walk dari setiap baris.
+    """
+    handle, walk_block, num_walks, m, sampling, kernel, entropy = args
+    table = attach_shared(handle)
+    u = table['u']
+    rng = block_generator(entropy, walk_block)
+    u_norm = np.abs(u).sum()
+    starts = np.minimum(np.searchsorted(np.cumsum(np.abs(u)) / u_norm, rng.random(num_walks), side='right'),
+                        len(u) - 1)
+    key = block_key64(entropy, walk_block) if kernel == 'numba' else None
+    thetas = _walk_scores(table, table['g'], starts, 0.0, m, sampling, kernel, rng, key)
+    return RunningStats(shape=thetas.shape[1:]).update(u_norm * np.sign(u[starts])[:, None] * thetas)
+
+def _merge_row_stats(row_stats, result):
+    pos_start, stats = result
+    with instrumentation.probe().phase('reduce'):
+        row_stats[pos_start].merge(stats)
+    return row_stats
+
+def _merge_row_sums(row_sums, result):
+    pos_start, sums, _ = result
+    with instrumentation.probe().phase('reduce'):
+        row_sums[pos_start:pos_start + len(sums)] += sums
+    return row_sums
+
+def _row_blocks(n, N, kernel, walk_blocks=None):
+    """
+    Membagi pekerjaan menjadi tugas (walk_block, row_start, row_end, num_walks) atas n posisi
+    baris. Walk dibagi ke blok berukuran WALK_BLOCK_SIZE. Kernel python memakai satu baris per
+    tugas; kernel numpy/numba menggabungkan beberapa baris sehingga satu tugas berisi sekitar
+    LOCKSTEP_POPULATION walker. Pembagian baris sama untuk semua blok walk, sehingga
+    akumulator per row_start dapat digabung lintas blok.
+    `walk_blocks` membatasi tugas ke indeks blok walk tertentu (mode adaptif).
+    """
+    blocks = []
+    sizes = split_into_blocks(N, WALK_BLOCK_SIZE)
+    rows_per_task = 1 if kernel == 'python' else max(1, LOCKSTEP_POPULATION // max(1, min(N, WALK_BLOCK_SIZE)))
+    for walk_block in (range(len(sizes)) if walk_blocks is None else walk_blocks):
+        for row_start in range(0, n, rows_per_task):
+            blocks.append((walk_block, row_start, min(row_start + rows_per_task, n), sizes[walk_block]))
+    return blocks
+
+def _public_call(method):
+    """
+    Metode publik solver: instrumentasi per panggilan, dan dengan verbose=True satu pesan
+    status di akhir panggilan terluar (bukan per putaran adaptif atau refinement).
+    """
+    @instrumentation.per_call
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._call_depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self._call_depth -= 1
+            processes = None
+            if self._call_depth == 0:
+                processes, self._processes_used = self._processes_used, None
+        if self.verbose and processes is not None:
+            print(f"  Selesai untuk {processes} prosesor.")
+        return result
+    return wrapper
 
 # ==============================================================================
 # KELAS UTAMA UNTUK SOLVER ALJABAR LINEAR
 # ==============================================================================
 
 class MonteCarloLinearSolver:
-    def __init__(self, A, b=None):
+    def __init__(self, A, b=None, executor=None, verbose=False):
+        """
+        Args:
+            A: Matriks persegi, dense (ndarray) atau scipy.sparse. Matriks sparse disimpan
+                dan diproses dalam format CSR, sehingga H/P dan biaya per langkah walk
+                berskala dengan nnz, bukan n^2. Pra-pemrosesan di-cache per gamma dan
+                dibuang saat `solver.A` diganti (perubahan in-place pada array tidak terdeteksi).
+            executor (ParallelExecutor): Pool berumur panjang milik pemanggil. Jika None,
+                solver membuat pool sendiri saat pertama kali dibutuhkan dan memakainya
+                ulang sampai `close()`.
+            verbose (bool): Cetak jumlah prosesor yang dipakai, sekali per panggilan publik.
+        """
+        self.H, self.g, self.P_slae, self.L, self.P_mi = [None] * 5
+        self.executor, self.verbose = executor, verbose
+        self._call_depth, self._processes_used = 0, None
+        self._own_executor = None
+        self._slae_cache = {}
+        self._slae_table, self._mi_table, self._mi_table_T = None, None, None
+        self._shared_slae, self._shared_mi, self._shared_mi_T, self._shared_rhs = None, None, None, None
+        self.refinement_history, self.execution_report = [], {}
+        self.A, self.b = A, b
+
+    @property
+    def A(self):
+        return self._A
+
+    @A.setter
+    def A(self, A):
         if A.shape[0] != A.shape[1]: raise ValueError("Matriks A harus persegi.")
-        self.A, self.b, self.n = A, b, A.shape[0]
+        if issparse(A): A = A.tocsr()
+        self._A, self.n = A, A.shape[0]
+        self._invalidate()
+
+    def _invalidate(self):
+        # Buang semua pra-pemrosesan yang bergantung pada A
+        for entry in self._slae_cache.values():
+            entry['shared'].close()
+        self._slae_cache.clear()
+        for attr in ('_shared_mi', '_shared_mi_T', '_shared_rhs'):
+            if getattr(self, attr) is not None:
+                getattr(self, attr).close()
+                setattr(self, attr, None)
         self.H, self.g, self.P_slae, self.L, self.P_mi = [None] * 5
+        self._slae_table, self._mi_table, self._mi_table_T, self._shared_slae = None, None, None, None
+
+    @property
+    def is_sparse(self):
+        return issparse(self.A)
 
     def _preprocess_slae(self, gamma):
-        if self.b is None: raise ValueError("Vektor b diperlukan.")
-        diag_A = np.diag(self.A)
+        """
+        Menyiapkan H, P dan tabel transisi untuk `gamma`, memakai cache jika sudah ada.
+        Mengembalikan diagonal A (untuk menskalakan ruas kanan).
+        """
+        entry = self._slae_cache.get(gamma)
+        if entry is None:
+            entry = self._build_slae(gamma)
+            if len(self._slae_cache) >= SLAE_CACHE_SIZE:
+                oldest = next(iter(self._slae_cache))
+                self._slae_cache.pop(oldest)['shared'].close()
+            self._slae_cache[gamma] = entry
+        self.H, self.P_slae = entry['H'], entry['P']
+        self._slae_table, self._shared_slae = entry['table'], entry['shared']
+        self.g = None if self.b is None else gamma * (np.asarray(self.b, dtype=float) / entry['diag'])
+        return entry['diag']
+
+    def _build_slae(self, gamma):
+        diag_A = self.A.diagonal() if self.is_sparse else np.diag(self.A)
         if np.any(diag_A == 0): raise ValueError("Nol di diagonal.")
-        D_inv = np.diag(1.0 / diag_A)
-        self.H = np.identity(self.n) - gamma * (D_inv @ self.A)
-        self.g = gamma * (D_inv @ self.b)
-        H_abs = np.abs(self.H)
-        row_sums = np.sum(H_abs, axis=1)
-        row_sums[row_sums == 0] = 1
-        self.P_slae = H_abs / row_sums[:, np.newaxis]
+        if self.is_sparse:
+            # Versi CSR: semua operasi O(nnz), tidak ada matriks dense n x n
+            H = (identity(self.n, format='csr') - gamma * (diags(1.0 / diag_A) @ self.A)).tocsr()
+            H_abs = abs(H)
+            row_sums = np.asarray(H_abs.sum(axis=1)).ravel()
+            row_sums[row_sums == 0] = 1
+            P = (diags(1.0 / row_sums) @ H_abs).tocsr()
+        else:
+            # D^-1 A sebagai penskalaan baris, O(n^2) alih-alih perkalian matriks O(n^3)
+            H = -gamma * (self.A / diag_A[:, np.newaxis])
+            H[np.diag_indices(self.n)] += 1.0
+            H_abs = np.abs(H)
+            row_sums = np.sum(H_abs, axis=1)
+            row_sums[row_sums == 0] = 1
+            P = H_abs / row_sums[:, np.newaxis]
+        table = build_transition_table(H)
+        return {'H': H, 'P': P, 'table': table, 'diag': diag_A, 'shared': SharedArrays(**table)}
 
     def _preprocess_mi(self):
+        if self._mi_table is not None:
+            return
+        if self.is_sparse:
+            self.L = (identity(self.n, format='csr') - self.A).tocsr()
+            L_abs = abs(self.L)
+            row_sums = np.asarray(L_abs.sum(axis=1)).ravel()
+            row_sums[row_sums == 0] = 1
+            self.P_mi = (diags(1.0 / row_sums) @ L_abs).tocsr()
+            self._mi_table = build_transition_table(self.L)
+            self._publish('_shared_mi', **self._mi_table)
+            return
         self.L = np.identity(self.n) - self.A
         L_abs = np.abs(self.L)
         row_sums = np.sum(L_abs, axis=1)
         row_sums[row_sums == 0] = 1
         self.P_mi = L_abs / row_sums[:, np.newaxis]
+        self._mi_table = build_transition_table(self.L)
+        self._publish('_shared_mi', **self._mi_table)
 
-    def solve_slae(self, gamma, epsilon, N, max_len=100, parallel=False, num_processes=4):
-        # Panggil pra-pemrosesan dengan argumen yang benar
-        self._preprocess_slae(gamma)
+    def _preprocess_mi_transposed(self):
+        # Walk pada I - A^T menghasilkan baris (A^T)^-1, yaitu kolom A^-1
+        if self._mi_table_T is not None:
+            return
+        L_T = identity(self.n, format='csr') - self.A.T if self.is_sparse else np.identity(self.n) - self.A.T
+        self._mi_table_T = build_transition_table(L_T)
+        self._publish('_shared_mi_T', **self._mi_table_T)
 
-        x = np.zeros(self.n)
-        for i in range(self.n):
-            tasks = [(i, epsilon, max_len)] * N
-            if parallel:
-                init_args = (self.H, self.g, self.P_slae, None, None)
-                results = run_parallel(_slae_walk_worker, tasks, num_processes, initializer=_init_worker_globals, initargs=init_args)
-            else:
-                _init_worker_globals(self.H, self.g, self.P_slae, None, None)
-                results = [_slae_walk_worker(task) for task in tasks]
-            x[i] = np.mean(results)
-            # Menggunakan \r untuk menimpa baris yang sama, membuat output lebih rapi
-            print(f"  Menghitung... Komponen x[{i+1}/{self.n}] selesai.", end='\r')
-        print(f"\n  Selesai untuk {num_processes if parallel else 1} prosesor.")
-        return x
-
-    def invert_matrix(self, N, m, parallel=False, num_processes=4):
-        self._preprocess_mi()
-        C = np.zeros((self.n, self.n))
-        for i in range(self.n):
-            tasks = [(i, m)] * N
-            if parallel:
-                init_args = (None, None, None, self.L, self.P_mi)
-                results = run_parallel(_mi_walk_worker, tasks, num_processes, initializer=_init_worker_globals, initargs=init_args)
-            else:
-                _init_worker_globals(None, None, None, self.L, self.P_mi)
-                results = [_mi_walk_worker(task) for task in tasks]
-            C[i, :] = np.mean(np.array(results), axis=0)
-            print(f"  Menghitung... Baris C[{i+1}/{self.n}] selesai.", end='\r')
-        print(f"\n  Selesai untuk {num_processes if parallel else 1} prosesor.")
-        return C
\ No newline at end of file
+    def _mi_handle(self, shared, transpose=False, **extra):
+        """
+        Handle tabel MI (untuk A atau A^T) ditambah array per pemanggilan (mis. g, u);
+        shared=True memakai segmen shared memory, selain itu array biasa.
+        """
+        if transpose:
+            self._preprocess_mi_transposed()
+            table, segments = self._mi_table_T, self._shared_mi_T
+        else:
+            self._preprocess_mi()
+            table, segments = self._mi_table, self._shared_mi
+        if not shared:
+            return dict(table, **extra)
+        if not extra:
+            return segments.handle
+        self._publish('_shared_rhs', **extra)
+        return dict(segments.handle, **self._shared_rhs.handle)
+
+    def _publish(self, attr, **arrays):
+        # Ganti segmen lama; matriks dipublikasikan sekali per pra-pemrosesan
+        old = getattr(self, attr)
+        if old is not None:
+            old.close()
+        setattr(self, attr, SharedArrays(**arrays))
+
+    def _get_executor(self, num_processes):
+        if self.executor is not None:
+            return self.executor
+        if hasattr(num_processes, 'map_reduce'):
+            # Eksekutor (mis. distributed.Coordinator) diberikan lewat num_processes
+            return num_processes
+        if self._own_executor is None or self._own_executor.num_processes != num_processes:
+            if self._own_executor is not None:
+                self._own_executor.close()
+            self._own_executor = ParallelExecutor(num_processes)
+        return self._own_executor
+
+    def _shares_memory(self, parallel, num_processes):
+        # Handle SharedArrays hanya untuk pool lokal; eksekutor jarak jauh menerima array
+        if not parallel:
+            return False
+        executor = self.executor if self.executor is not None else num_processes
+        return getattr(executor, 'shares_memory', True)
+
+    def _run_rows(self, worker, tasks, reducer, initial, parallel, num_processes, runner=None):
+        # Semua walk untuk semua baris dijadwalkan sebagai satu aliran tugas
+        processes = 1
+        if runner is not None:
+            # Id chunk = (blok walk, posisi baris awal), sama untuk tugas SLAE dan MI
+            runner.run(worker, tasks, [task[1:3] for task in tasks], reducer, initial)
+            processes = getattr(runner.num_processes, 'num_processes', runner.num_processes) if parallel else 1
+        elif parallel:
+            executor = self._get_executor(num_processes)
+            executor.map_reduce(worker, tasks, reducer=reducer, initial=initial)
+            processes = executor.num_processes
+        else:
+            for task in tasks:
+                reducer(initial, worker(task))
+        self._processes_used = processes
+        return initial
+
+    @staticmethod
+    def _resolve_options(sampling, backend, parallel):
+        if sampling not in SAMPLING_METHODS: raise ValueError(f"Metode sampling tidak dikenal: {sampling}")
+        return resolve_backend(backend, parallel, default='python')
+
+    @_public_call
+    def solve_slae(self, gamma, epsilon, N, max_len=100, parallel=False, num_processes=4,
+                   return_stats=False, confidence_level=0.95, sampling='alias', backend=None, seed=None,
+                   target_stderr=None, rel_tol=None, max_seconds=None, refine_tol=None, max_refinements=50,
+                   checkpoint=None, max_retries=2, task_timeout=None):
+        """
+        Menyelesaikan Ax = b. Dengan return_stats=True dikembalikan MCEstimate berisi
+        x beserta standard error dan interval kepercayaan per komponen.
+        Args:
+            sampling (str): 'alias' (O(1) per langkah) atau 'cdf' (searchsorted, O(log n)).
+            backend (str): 'python' (satu walk per iterasi), 'numpy' (mesin lockstep yang
+                memajukan populasi walker untuk banyak komponen x sekaligus), 'numba' (kernel
+                JIT paralel berbasis thread) atau 'process' (lockstep di pool proses).
+                None = 'python', dibagi ke proses jika parallel=True.
+            seed (int): Seed stream RNG per blok walk; hasil identik berapa pun num_processes.
+            target_stderr, rel_tol, max_seconds: Mode adaptif. N menjadi batas atas jumlah
+                walk per komponen; blok walk dijalankan dalam putaran yang membesar sampai
+                standard error terbesar <= target_stderr, setengah lebar CI <= rel_tol * |x_i|
+                untuk semua komponen, atau waktu habis. Selalu mengembalikan MCEstimate.
+            refine_tol, max_refinements: Mode iterative refinement (Monte Carlo sekuensial).
+                Setiap tahap menyelesaikan A delta = b - A x_k dengan N walk, lalu residual
+                dihitung ulang secara eksak. Error turun dengan faktor konstan per tahap,
+                sehingga N dan max_len cukup kecil. Berhenti saat ||b - A x|| / ||b|| <=
+                refine_tol atau setelah max_refinements tahap. Riwayat per tahap (residual,
+                jumlah walk, waktu) tersedia di self.refinement_history.
+            checkpoint, max_retries, task_timeout: Eksekusi tahan gagal (lihat
+                MonteCarloBSMPricer.price_option). Akumulator setiap tugas (blok walk, baris)
+                disimpan ke file `checkpoint`; pada mode refinement setiap tahap memakai file
+                `checkpoint`.<tahap>, dan `checkpoint` sendiri menyimpan seed run sehingga run
+                tanpa seed juga dapat dilanjutkan. Ringkasan ada di self.execution_report.
+        """
+        if self.b is None: raise ValueError("Vektor b diperlukan.")
+        if refine_tol is not None:
+            return self._solve_refined(gamma, epsilon, N, max_len, parallel, num_processes, return_stats,
+                                       confidence_level, sampling, backend, seed, refine_tol, max_refinements,
+                                       target_stderr, rel_tol, max_seconds, checkpoint, max_retries, task_timeout)
+        result = self.solve_many(np.asarray(self.b, dtype=float)[:, np.newaxis], gamma, epsilon, N, max_len,
+                                 parallel, num_processes, return_stats, confidence_level, sampling, backend, seed,
+                                 target_stderr, rel_tol, max_seconds, checkpoint, max_retries, task_timeout)
+        if isinstance(result, MCEstimate):
+            result.value, result.stderr = result.value[:, 0], result.stderr[:, 0]
+            return result
+        return result[:, 0]
+
+    def _solve_refined(self, gamma, epsilon, N, max_len, parallel, num_processes, return_stats, confidence_level,
+                       sampling, backend, seed, refine_tol, max_refinements, target_stderr, rel_tol, max_seconds,
+                       checkpoint=None, max_retries=2, task_timeout=None):
+        # Tabel H/P untuk gamma dipakai ulang oleh setiap tahap (hanya ruas kanan yang berubah)
+        b = np.asarray(self.b, dtype=float)
+        b_norm = np.linalg.norm(b)
+        x, residual = np.zeros(self.n), b.copy()
+        if checkpoint is None:
+            entropy = resolve_seed(seed)
+        else:
+            # Header run di file `checkpoint` menyimpan entropi sekali, sehingga run tanpa seed
+            # yang dilanjutkan menurunkan seed tahap yang sama dan file per tahap tetap valid
+            self._preprocess_slae(gamma)
+            table = self._slae_table
+            entropy = ChunkCheckpoint(checkpoint, fingerprint('solve_refined', gamma, epsilon, N, max_len, sampling,
+                                                              backend, table['indices'], table['weights'], b),
+                                      seed).entropy
+        self.refinement_history = []
+        total_walks, start = 0, time.perf_counter()
+        correction = None
+        for stage in range(max_refinements):
+            correction = self.solve_many(residual[:, np.newaxis], gamma, epsilon, N, max_len, parallel,
+                                         num_processes, True, confidence_level, sampling, backend,
+                                         int(block_key64(entropy, stage)), target_stderr, rel_tol, max_seconds,
+                                         None if checkpoint is None else f"{checkpoint}.{stage}", max_retries,
+                                         task_timeout)
+            x += correction.value[:, 0]
+            residual = b - self.A @ x
+            total_walks += correction.num_samples * self.n
+            relative = np.linalg.norm(residual) / b_norm if b_norm > 0 else 0.0
+            self.refinement_history.append({'stage': stage, 'residual': float(np.linalg.norm(residual)),
+                                            'relative_residual': float(relative),
+                                            'walks': int(correction.num_samples * self.n),
+                                            'elapsed': time.perf_counter() - start})
+            if relative <= refine_tol:
+                break
+        if not (return_stats or StoppingRule(target_stderr, rel_tol, max_seconds, confidence_level).active):
+            return x
+        # Error stokastik yang tersisa didominasi oleh koreksi tahap terakhir
+        return MCEstimate(x, correction.stderr[:, 0], total_walks, confidence_level,
+                          elapsed=time.perf_counter() - start,
+                          converged=self.refinement_history[-1]['relative_residual'] <= refine_tol)
+
+    @_public_call
+    def solve_many(self, B, gamma, epsilon, N, max_len=100, parallel=False, num_processes=4,
+                   return_stats=False, confidence_level=0.95, sampling='alias', backend=None, seed=None,
+                   target_stderr=None, rel_tol=None, max_seconds=None, checkpoint=None, max_retries=2,
+                   task_timeout=None):
+        """
+        Menyelesaikan AX = B untuk matriks ruas kanan B (n, k). Walk hanya bergantung pada
+        H dan P, jadi setiap trajektori menilai semua kolom B sekaligus: biaya walk sama
+        dengan satu ruas kanan, ditambah O(k) per langkah. Argumen lain sama dengan solve_slae.
+        Returns:
+            X (n, k), atau MCEstimate dengan value/stderr (n, k).
+        """
+        kernel, parallel = self._resolve_options(sampling, backend, parallel)
+        B = np.asarray(B, dtype=float)
+        if B.ndim == 1: B = B[:, np.newaxis]
+        if B.shape[0] != self.n: raise ValueError("Jumlah baris B harus sama dengan n.")
+        diag_A = self._preprocess_slae(gamma)
+        G = gamma * (B / diag_A[:, np.newaxis])
+
+        # Eksekusi sekuensial membaca array langsung; paralel lewat shared memory. Tabel
+        # dipublikasikan sekali per gamma, ruas kanan per pemanggilan.
+        if self._shares_memory(parallel, num_processes):
+            self._publish('_shared_rhs', g=G)
+            handle = dict(self._shared_slae.handle, **self._shared_rhs.handle)
+        else:
+            handle = dict(g=G, **self._slae_table)
+        runner = None
+        if checkpoint is not None or task_timeout is not None:
+            table = self._slae_table
+            store = None if checkpoint is None else ChunkCheckpoint(
+                checkpoint, fingerprint('solve_many', gamma, epsilon, N, max_len, sampling, kernel, table['indices'],
+                                        table['weights'], G), seed)
+            runner = FaultTolerantRunner(parallel, num_processes if self.executor is None else self.executor, store,
+                                         max_retries, task_timeout)
+            self.execution_report = runner.report
+            seed = seed if store is None else store.entropy
+        rule = StoppingRule(target_stderr, rel_tol, max_seconds, confidence_level)
+        estimate = self._score_rows(handle, np.arange(self.n), G.shape[1], epsilon, max_len, N, sampling, kernel,
+                                    parallel, num_processes, confidence_level, seed, rule, runner=runner)
+        return estimate if return_stats or rule.active else estimate.value
+
+    def _score_rows(self, handle, rows, num_scores, epsilon, max_len, N, sampling, kernel, parallel, num_processes,
+                    confidence_level, seed, rule, diagonal=False, runner=None):
+        """
+        Menjalankan N walk dari setiap baris `rows` dan merata-ratakan skor walk (lihat
+        _walk_scores) per baris, opsional secara adaptif menurut `rule`. Mengembalikan
+        MCEstimate dengan value/stderr berbentuk (len(rows), num_scores).
+        """
+        entropy = resolve_seed(seed)
+        row_stats = {}
+        for _, pos_start, pos_end, _ in _row_blocks(len(rows), N, kernel, walk_blocks=[0]):
+            row_stats[pos_start] = RunningStats(shape=(pos_end - pos_start, num_scores))
+
+        def run_blocks(walk_blocks):
+            tasks = [(handle, walk_block, pos_start, rows[pos_start:pos_end], epsilon, max_len, num_walks,
+                      sampling, kernel, entropy, diagonal)
+                     for walk_block, pos_start, pos_end, num_walks in _row_blocks(len(rows), N, kernel, walk_blocks)]
+            self._run_rows(_slae_chunk_worker, tasks, _merge_row_stats, row_stats, parallel, num_processes, runner)
+
+        def estimate():
+            ordered = [row_stats[pos_start] for pos_start in sorted(row_stats)]
+            return (np.concatenate([stats.mean for stats in ordered]),
+                    np.concatenate([stats.stderr for stats in ordered]), ordered[0].count)
+
+        all_blocks = list(range(len(split_into_blocks(N, WALK_BLOCK_SIZE))))
+        converged, elapsed = None, None
+        if rule.active:
+            converged, elapsed = run_adaptive(all_blocks, run_blocks, estimate, rule)
+        else:
+            run_blocks(all_blocks)
+        value, stderr, walks = estimate()
+        return MCEstimate(value, stderr, walks, confidence_level, elapsed=elapsed, converged=converged)
+
+    def _mi_rows(self, rows, N, m, parallel, num_processes, sampling, backend, seed, transpose=False):
+        # Baris C = sum_k L^k untuk `rows` saja; kontribusi walk dijumlahkan langsung per baris
+        kernel, parallel = self._resolve_options(sampling, backend, parallel)
+        rows = np.asarray(rows, dtype=np.int64)
+        handle = self._mi_handle(self._shares_memory(parallel, num_processes), transpose)
+        entropy = resolve_seed(seed)
+        tasks = [(handle, walk_block, pos_start, rows[pos_start:pos_end], m, num_walks, sampling, kernel, entropy)
+                 for walk_block, pos_start, pos_end, num_walks in _row_blocks(len(rows), N, kernel)]
+        C = self._run_rows(_mi_chunk_worker, tasks, _merge_row_sums, np.zeros((len(rows), self.n)),
+                           parallel, num_processes)
+        return C / N
+
+    @_public_call
+    def invert_matrix(self, N, m, parallel=False, num_processes=4, sampling='alias', backend=None, seed=None):
+        return self._mi_rows(np.arange(self.n), N, m, parallel, num_processes, sampling, backend, seed)
+
+    # ------------------------------------------------------------------------------
+    # Kueri parsial A^-1 (deret Neumann sum_{k<=m} (I - A)^k, syarat sama dengan invert_matrix)
+    # ------------------------------------------------------------------------------
+
+    @_public_call
+    def inverse_rows(self, rows, N, m, parallel=False, num_processes=4, sampling='alias', backend=None, seed=None):
+        """Baris `rows` dari A^-1 (len(rows), n); walk hanya dari baris yang diminta."""
+        return self._mi_rows(rows, N, m, parallel, num_processes, sampling, backend, seed)
+
+    @_public_call
+    def inverse_columns(self, columns, N, m, parallel=False, num_processes=4, sampling='alias', backend=None,
+                        seed=None):
+        """Kolom `columns` dari A^-1 (n, len(columns)), lewat walk pada tabel transpos I - A^T."""
+        return self._mi_rows(columns, N, m, parallel, num_processes, sampling, backend, seed, transpose=True).T
+
+    @_public_call
+    def inverse_diagonal(self, N, m, indices=None, parallel=False, num_processes=4, return_stats=False,
+                         confidence_level=0.95, sampling='alias', backend=None, seed=None):
+        """
+        Diagonal A^-1 (atau entri `indices`): walk dari i hanya mencatat W saat kembali ke i,
+        sehingga setiap walk menghasilkan satu skalar dan tidak ada baris dense yang dibentuk.
+        """
+        kernel, parallel = self._resolve_options(sampling, backend, parallel)
+        rows = np.arange(self.n) if indices is None else np.asarray(indices, dtype=np.int64)
+        handle = self._mi_handle(self._shares_memory(parallel, num_processes))
+        estimate = self._score_rows(handle, rows, 1, 0.0, m, N, sampling, kernel, parallel,
+                                    num_processes, confidence_level, seed, StoppingRule(), diagonal=True)
+        estimate.value, estimate.stderr = estimate.value[:, 0], estimate.stderr[:, 0]
+        return estimate if return_stats else estimate.value
+
+    @_public_call
+    def inverse_matvec(self, v, N, m, parallel=False, num_processes=4, return_stats=False, confidence_level=0.95,
+                       sampling='alias', backend=None, seed=None):
+        """
+        A^-1 v tanpa membentuk A^-1: setiap walk dari i menilai sum_k W_k v[state_k] secara
+        langsung. v boleh berupa matriks (n, k); semua kolom dinilai oleh walk yang sama.
+        """
+        kernel, parallel = self._resolve_options(sampling, backend, parallel)
+        v = np.asarray(v, dtype=float)
+        V = v[:, np.newaxis] if v.ndim == 1 else v
+        handle = self._mi_handle(self._shares_memory(parallel, num_processes), g=V)
+        estimate = self._score_rows(handle, np.arange(self.n), V.shape[1], 0.0, m, N,
+                                    sampling, kernel, parallel, num_processes, confidence_level, seed, StoppingRule())
+        if v.ndim == 1:
+            estimate.value, estimate.stderr = estimate.value[:, 0], estimate.stderr[:, 0]
+        return estimate if return_stats else estimate.value
+
+    @_public_call
+    def bilinear(self, u, v, N, m, parallel=False, num_processes=4, return_stats=False, confidence_level=0.95,
+                 sampling='alias', backend=None, seed=None):
+        """
+        u^T A^-1 v dengan N walk total: baris awal diambil sebanding |u_i| sehingga biaya
+        tidak bergantung pada n. Mengembalikan skalar (atau MCEstimate).
+        """
+        kernel, parallel = self._resolve_options(sampling, backend, parallel)
+        u = np.asarray(u, dtype=float)
+        handle = self._mi_handle(self._shares_memory(parallel, num_processes),
+                                 g=np.asarray(v, dtype=float)[:, np.newaxis], u=u)
+        entropy = resolve_seed(seed)
+        block_size = WALK_BLOCK_SIZE if kernel == 'python' else LOCKSTEP_POPULATION
+        tasks = [(handle, walk_block, num_walks, m, sampling, kernel, entropy)
+                 for walk_block, num_walks in enumerate(split_into_blocks(N, block_size))]
+        stats = self._run_rows(_bilinear_worker, tasks, lambda acc, result: acc.merge(result), RunningStats(shape=1),
+                               parallel, num_processes)
+        estimate = MCEstimate(float(stats.mean[0]), float(stats.stderr[0]), stats.count, confidence_level, stats)
+        return estimate if return_stats else estimate.value
+
+    def close(self):
+        """Menutup pool milik solver dan melepas shared memory."""
+        if self._own_executor is not None:
+            self._own_executor.close()
+            self._own_executor = None
+        self._invalidate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
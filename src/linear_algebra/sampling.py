@@ -0,0 +1,164 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from ..utils.backends import njit, NUMBA_AVAILABLE
+
+
+# ==============================================================================
+# TABEL TRANSISI UNTUK RANDOM WALK
+# ==============================================================================
+# Untuk matriks iterasi M (H pada SLAE, L pada MI) probabilitas transisinya adalah
+# P[i, j] = |M[i, j]| / sum_j |M[i, j]|. Tabel disimpan per baris dalam format mirip CSR
+# (hanya entri non-nol), sehingga satu langkah walk berbiaya O(1) (alias) atau
+# O(log nnz_baris) (CDF), bukan O(n) seperti np.random.choice.
+
+SAMPLING_METHODS = ('alias', 'cdf')
+
+
+def _build_alias(probs, indptr):
+    """Tabel alias Walker/Vose per baris; indeks alias relatif terhadap awal baris."""
+    alias_prob = np.ones(len(probs))
+    alias_idx = np.zeros(len(probs), dtype=np.int64)
+    if NUMBA_AVAILABLE and len(probs):
+        # Loop Python per entri mendominasi pra-pemrosesan untuk matriks dense besar
+        stack_size = int(np.max(np.diff(indptr)))
+        _build_alias_numba(probs, indptr, alias_prob, alias_idx, stack_size)
+        return alias_prob, alias_idx
+    for i in range(len(indptr) - 1):
+        start, end = indptr[i], indptr[i + 1]
+        k = end - start
+        alias_idx[start:end] = np.arange(k)
+        if k <= 1:
+            continue
+        scaled = (probs[start:end] * k).tolist()
+        small = [j for j, p in enumerate(scaled) if p < 1.0]
+        large = [j for j, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large[-1]
+            alias_prob[start + s] = scaled[s]
+            alias_idx[start + s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+        # Sisa (akibat pembulatan) mendapat probabilitas 1 dan alias ke dirinya sendiri
+    return alias_prob, alias_idx
+
+
+@njit(cache=True)
+def _build_alias_numba(probs, indptr, alias_prob, alias_idx, stack_size):
+    """Versi Numba dari _build_alias dengan urutan operasi yang sama (hasil identik)."""
+    small = np.empty(stack_size, dtype=np.int64)
+    large = np.empty(stack_size, dtype=np.int64)
+    for i in range(len(indptr) - 1):
+        start, end = indptr[i], indptr[i + 1]
+        k = end - start
+        for j in range(k):
+            alias_idx[start + j] = j
+        if k <= 1:
+            continue
+        scaled = probs[start:end] * k
+        num_small, num_large = 0, 0
+        for j in range(k):
+            if scaled[j] < 1.0:
+                small[num_small] = j
+                num_small += 1
+            else:
+                large[num_large] = j
+                num_large += 1
+        while num_small > 0 and num_large > 0:
+            num_small -= 1
+            s, l = small[num_small], large[num_large - 1]
+            alias_prob[start + s] = scaled[s]
+            alias_idx[start + s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                num_large -= 1
+                small[num_small] = l
+                num_small += 1
+
+
+def build_transition_table(M):
+    """
+    Membangun struktur sampling sekali untuk matriks iterasi M (dense atau scipy.sparse).
+    Mengembalikan dict array:
+        indptr, indices: kolom non-nol per baris (CSR)
+        weights: M[i, j] / P[i, j], faktor pengali bobot W untuk transisi tersebut
+        cdf: jumlah kumulatif P per baris (untuk searchsorted)
+        global_cdf: cdf + indeks baris; monoton di seluruh tabel sehingga banyak baris
+            dapat di-sample dengan satu panggilan searchsorted (lihat sample_positions)
+        alias_prob, alias_idx: tabel alias per baris
+        absorbing: True untuk baris tanpa transisi (semua nol)
+    """
+    M = csr_matrix(M, dtype=float, copy=True)
+    M.eliminate_zeros()
+    M.sort_indices()
+    n = M.shape[0]
+    indptr = M.indptr.astype(np.int64)
+    indices = M.indices.astype(np.int64)
+    row_lengths = np.diff(indptr)
+    row_of = np.repeat(np.arange(n), row_lengths)
+
+    abs_values = np.abs(M.data)
+    row_sums = np.bincount(row_of, weights=abs_values, minlength=n)
+    probs = abs_values / row_sums[row_of]
+    weights = np.sign(M.data) * row_sums[row_of]
+
+    cumulative = np.cumsum(probs)
+    row_offset = np.concatenate(([0.0], cumulative))[indptr[:-1]]
+    cdf = cumulative - np.repeat(row_offset, row_lengths)
+    cdf[indptr[1:][row_lengths > 0] - 1] = 1.0
+
+    alias_prob, alias_idx = _build_alias(probs, indptr)
+    return {'indptr': indptr, 'indices': indices, 'weights': weights, 'cdf': cdf, 'global_cdf': cdf + row_of,
+            'alias_prob': alias_prob, 'alias_idx': alias_idx, 'absorbing': row_lengths == 0}
+
+
+def sample_position(table, i, u, method='alias'):
+    """
+    Memilih posisi (indeks ke `indices`/`weights`) transisi berikutnya dari baris i
+    menggunakan dua bilangan uniform `u`. Baris tidak boleh absorbing.
+    """
+    start, end = table['indptr'][i], table['indptr'][i + 1]
+    if method == 'alias':
+        k = end - start
+        pos = start + min(int(u[0] * k), k - 1)
+        if u[1] >= table['alias_prob'][pos]:
+            pos = start + table['alias_idx'][pos]
+        return pos
+    pos = start + np.searchsorted(table['cdf'][start:end], u[0], side='right')
+    return min(pos, end - 1)
+
+
+def sample_positions(table, rows, u, method='alias'):
+    """
+    Versi vektorial dari sample_position untuk banyak walker sekaligus.
+    `rows` berisi baris saat ini (tidak boleh absorbing), `u` berbentuk (len(rows), 2).
+    """
+    start = table['indptr'][rows]
+    if method == 'alias':
+        k = table['indptr'][rows + 1] - start
+        pos = start + np.minimum((u[:, 0] * k).astype(np.int64), k - 1)
+        rejected = u[:, 1] >= table['alias_prob'][pos]
+        pos[rejected] = start[rejected] + table['alias_idx'][pos[rejected]]
+        return pos
+    pos = np.searchsorted(table['global_cdf'], rows + u[:, 0], side='right')
+    return np.minimum(pos, table['indptr'][rows + 1] - 1)
+
+
+@njit(cache=True)
+def sample_position_numba(indptr, alias_prob, alias_idx, cdf, i, u0, u1, use_alias):
+    """Versi kernel Numba dari sample_position (pencarian biner manual untuk CDF)."""
+    start, end = indptr[i], indptr[i + 1]
+    if use_alias:
+        k = end - start
+        pos = start + min(np.int64(u0 * k), k - 1)
+        if u1 >= alias_prob[pos]:
+            pos = start + alias_idx[pos]
+        return pos
+    lo, hi = start, end - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cdf[mid] > u0:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
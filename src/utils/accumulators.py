@@ -0,0 +1,193 @@
+import numpy as np
+from scipy.stats import norm
+from . import instrumentation
+
+
+class RunningStats:
+    """
+    Akumulator statistik streaming yang dapat digabung (mergeable).
+    Menyimpan count, mean, dan M2 (jumlah kuadrat deviasi) dengan pembaruan
+    Welford/Chan, sehingga memori O(1) berapa pun jumlah sampelnya.
+    Opsional: min/max dan histogram dengan bin tetap (hanya untuk sampel skalar),
+    serta matriks ko-momen untuk sampel vektor (kovariansi antar komponen).
+    """
+
+    def __init__(self, shape=(), track_extrema=False, histogram=None, track_covariance=False):
+        """
+        Args:
+            shape (tuple): Bentuk satu sampel; () untuk skalar, (k,) untuk vektor.
+            track_extrema (bool): Simpan nilai minimum dan maksimum.
+            histogram (tuple): (bins, (low, high)) untuk histogram bin tetap.
+            track_covariance (bool): Simpan ko-momen C (k x k) untuk sampel vektor (k,).
+        """
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.count = 0
+        self.mean = np.zeros(self.shape)
+        self.M2 = np.zeros(self.shape)
+        if track_covariance and len(self.shape) != 1:
+            raise ValueError("Kovariansi hanya untuk sampel vektor berbentuk (k,).")
+        self.C = np.zeros(self.shape * 2) if track_covariance else None
+        self.min = np.full(self.shape, np.inf) if track_extrema else None
+        self.max = np.full(self.shape, -np.inf) if track_extrema else None
+        if histogram is not None:
+            if self.shape != (): raise ValueError("Histogram hanya untuk sampel skalar.")
+            bins, (low, high) = histogram
+            self.bin_edges = np.linspace(low, high, bins + 1)
+            self.hist = np.zeros(bins, dtype=np.int64)
+            self.underflow, self.overflow = 0, 0
+        else:
+            self.bin_edges, self.hist = None, None
+
+    def _combine(self, count_b, mean_b, M2_b, C_b=None):
+        # Rumus Chan et al. untuk menggabungkan dua kelompok (count, mean, M2)
+        count_a = self.count
+        total = count_a + count_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (count_b / total)
+        self.M2 = self.M2 + M2_b + delta ** 2 * (count_a * count_b / total)
+        if self.C is not None and C_b is not None:
+            self.C = self.C + C_b + np.outer(delta, delta) * (count_a * count_b / total)
+        self.count = total
+
+    @classmethod
+    def from_moments(cls, count, mean, M2):
+        """Akumulator dari momen yang sudah dihitung (count, mean, M2) untuk satu batch."""
+        mean = np.asarray(mean, dtype=float)
+        stats = cls(shape=mean.shape)
+        if count > 0:
+            stats._combine(count, mean, np.asarray(M2, dtype=float))
+        return stats
+
+    def update(self, samples):
+        """Menambahkan satu batch sampel (sumbu pertama = indeks sampel)."""
+        samples = np.asarray(samples, dtype=float).reshape((-1,) + self.shape)
+        if samples.shape[0] == 0:
+            return self
+        batch_mean = samples.mean(axis=0)
+        centered = samples - batch_mean
+        batch_M2 = np.sum(centered ** 2, axis=0)
+        batch_C = centered.T @ centered if self.C is not None else None
+        self._combine(samples.shape[0], batch_mean, batch_M2, batch_C)
+        if self.min is not None:
+            self.min = np.minimum(self.min, samples.min(axis=0))
+            self.max = np.maximum(self.max, samples.max(axis=0))
+        if self.hist is not None:
+            self.hist += np.histogram(samples, bins=self.bin_edges)[0]
+            self.underflow += int(np.count_nonzero(samples < self.bin_edges[0]))
+            self.overflow += int(np.count_nonzero(samples > self.bin_edges[-1]))
+        return self
+
+    def merge(self, other):
+        """Menggabungkan akumulator lain ke akumulator ini (in-place)."""
+        if other.count == 0:
+            return self
+        self._combine(other.count, other.mean, other.M2, other.C)
+        if self.min is not None and other.min is not None:
+            self.min = np.minimum(self.min, other.min)
+            self.max = np.maximum(self.max, other.max)
+        if self.hist is not None and other.hist is not None:
+            self.hist += other.hist
+            self.underflow += other.underflow
+            self.overflow += other.overflow
+        return self
+
+    @property
+    def variance(self):
+        """Variansi sampel (ddof=1)."""
+        if self.count < 2:
+            return np.full(self.shape, np.nan)
+        return self.M2 / (self.count - 1)
+
+    @property
+    def covariance(self):
+        """Matriks kovariansi sampel (ddof=1); membutuhkan track_covariance=True."""
+        if self.count < 2:
+            return np.full(self.shape * 2, np.nan)
+        return self.C / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        """Standard error dari mean."""
+        return self.std / np.sqrt(max(self.count, 1))
+
+
+def control_variate_estimate(stats, control_means):
+    """
+    Estimator control variate dari RunningStats(track_covariance=True) atas sampel
+    (X, Y_1, ..., Y_k) dengan E[Y] = control_means diketahui. Koefisien optimal
+    beta = Cov(Y)^-1 Cov(Y, X) diestimasi dari sampel yang sama.
+    Mengembalikan (nilai, stderr, beta, faktor_reduksi_variansi), dengan faktor
+    = Var(X) / Var(X - beta (Y - E[Y])).
+    """
+    cov = stats.covariance
+    if stats.count < 2:
+        return float(stats.mean[0]), np.nan, np.full(len(cov) - 1, np.nan), np.nan
+    beta = np.linalg.pinv(cov[1:, 1:]) @ cov[1:, 0]
+    value = stats.mean[0] - beta @ (stats.mean[1:] - np.asarray(control_means, dtype=float))
+    residual_var = max(cov[0, 0] - cov[1:, 0] @ beta, 0.0)
+    stderr = np.sqrt(residual_var / stats.count)
+    factor = cov[0, 0] / residual_var if residual_var > 0 else np.inf
+    return float(value), float(stderr), beta, float(factor)
+
+
+def merge_stats_list(acc, stats_list):
+    """
+    Reducer untuk worker yang mengembalikan list akumulator per blok: digabung satu
+    per satu sesuai urutan blok, sehingga hasil tidak bergantung pada pengelompokan tugas.
+    """
+    with instrumentation.probe().phase('reduce'):
+        for stats in stats_list:
+            acc.merge(stats)
+    return acc
+
+
+class MCEstimate:
+    """
+    Hasil estimasi Monte Carlo: nilai, standard error, dan interval kepercayaan.
+    `value` dan `stderr` bisa skalar (harga opsi) atau vektor (solusi SLAE).
+    """
+
+    def __init__(self, value, stderr, num_samples, confidence_level=0.95, stats=None,
+                 elapsed=None, converged=None, variance_reduction=None):
+        """
+        Args:
+            num_samples: Jumlah sampel (jalur/walk per komponen) yang benar-benar dipakai.
+            elapsed: Waktu dinding (detik), diisi oleh mode adaptif.
+            converged: Apakah toleransi mode adaptif tercapai (None jika tidak adaptif).
+            variance_reduction: Faktor reduksi variansi (mis. dari control variate).
+        Di dalam blok instrumentation.instrument(), `instrumentation` berisi PhaseStats
+        (fase, pencacah, profil) dari panggilan publik yang membuat estimasi ini saja, bukan
+        kumulatif sesi (lihat session.stats); di luar blok None.
+        """
+        self.value, self.stderr = value, stderr
+        self.num_samples = num_samples
+        self.confidence_level = confidence_level
+        self.stats = stats
+        self.elapsed, self.converged = elapsed, converged
+        self.variance_reduction = variance_reduction
+        self.instrumentation = instrumentation.snapshot()
+
+    @classmethod
+    def from_stats(cls, stats, scale=1.0, confidence_level=0.95, **kwargs):
+        """Membangun estimasi dari RunningStats; `scale` misalnya faktor diskonto."""
+        value, stderr = scale * stats.mean, abs(scale) * stats.stderr
+        if np.ndim(value) == 0:
+            value, stderr = float(value), float(stderr)
+        return cls(value, stderr, stats.count, confidence_level, stats, **kwargs)
+
+    @property
+    def confidence_interval(self):
+        """Interval kepercayaan normal (low, high) pada `confidence_level`."""
+        z = norm.ppf(0.5 + self.confidence_level / 2)
+        return self.value - z * self.stderr, self.value + z * self.stderr
+
+    def __float__(self):
+        return float(self.value)
+
+    def __repr__(self):
+        return (f"MCEstimate(value={self.value}, stderr={self.stderr}, "
+                f"num_samples={self.num_samples})")
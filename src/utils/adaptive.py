@@ -0,0 +1,78 @@
+import math
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+
+class StoppingRule:
+    """
+    Kriteria berhenti untuk simulasi adaptif. Cukup salah satu kriteria terpenuhi:
+        target_stderr: standard error <= target (semua komponen, bila vektor)
+        rel_tol: setengah lebar interval kepercayaan <= rel_tol * |nilai|
+        max_seconds: anggaran waktu dinding habis (berhenti tanpa konvergensi)
+    """
+
+    def __init__(self, target_stderr=None, rel_tol=None, max_seconds=None, confidence_level=0.95):
+        self.target_stderr, self.rel_tol, self.max_seconds = target_stderr, rel_tol, max_seconds
+        self.z = norm.ppf(0.5 + confidence_level / 2)
+
+    @property
+    def active(self):
+        return any(v is not None for v in (self.target_stderr, self.rel_tol, self.max_seconds))
+
+    def converged(self, value, stderr):
+        """True jika toleransi (target_stderr atau rel_tol) sudah terpenuhi."""
+        stderr = np.asarray(stderr, dtype=float)
+        if np.any(np.isnan(stderr)):
+            return False
+        if self.target_stderr is not None and np.all(stderr <= self.target_stderr):
+            return True
+        if self.rel_tol is not None and np.all(self.z * stderr <= self.rel_tol * np.abs(value)):
+            return True
+        return False
+
+    def samples_needed(self, value, stderr, count):
+        """Perkiraan total sampel untuk memenuhi toleransi (skala 1/sqrt(n) dari standard error)."""
+        stderr = np.max(np.asarray(stderr, dtype=float))
+        targets = []
+        if self.target_stderr is not None:
+            targets.append(self.target_stderr)
+        if self.rel_tol is not None:
+            targets.append(self.rel_tol * np.min(np.abs(value)) / self.z)
+        target = max(targets) if targets else 0.0
+        if not np.isfinite(stderr) or target <= 0:
+            return math.inf
+        return count * (stderr / target) ** 2
+
+
+def run_adaptive(blocks, run_blocks, estimate, rule, initial_blocks=1, growth=2.0):
+    """
+    Menjalankan `blocks` (daftar unit kerja, urutan tetap) dalam putaran yang membesar
+    sampai `rule` terpenuhi atau blok habis (anggaran maksimum).
+        run_blocks(subset): menjalankan dan menggabungkan subset blok ke akumulator
+        estimate(): mengembalikan (nilai, stderr, jumlah_sampel) saat ini
+    Ukuran putaran berikutnya diperkirakan dari standard error berjalan, dibatasi
+    `growth` kali pekerjaan yang sudah selesai dan sisa anggaran waktu.
+    Mengembalikan (converged, elapsed).
+    """
+    start = time.perf_counter()
+    done, next_count = 0, max(1, initial_blocks)
+    while done < len(blocks):
+        subset = blocks[done:done + next_count]
+        run_blocks(subset)
+        done += len(subset)
+        elapsed = time.perf_counter() - start
+        value, stderr, count = estimate()
+        if rule.converged(value, stderr):
+            return True, elapsed
+        if rule.max_seconds is not None and elapsed >= rule.max_seconds:
+            break
+        next_count = max(1, int(done * (growth - 1)))
+        needed = rule.samples_needed(value, stderr, count) - count
+        if math.isfinite(needed):
+            next_count = max(1, min(next_count, math.ceil(1.1 * needed * done / count)))
+        if rule.max_seconds is not None:
+            seconds_per_block = elapsed / done
+            next_count = max(1, min(next_count, int((rule.max_seconds - elapsed) / seconds_per_block)))
+    return rule.converged(*estimate()[:2]), time.perf_counter() - start
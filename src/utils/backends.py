@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba bersifat opsional; backend 'numba' menjadi tidak tersedia
+    numba = None
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE and 'NUMBA_THREADING_LAYER' not in os.environ:
+    # Lapisan TBB tidak aman terhadap fork: proses yang memakai kernel prange lalu
+    # membuat pool multiprocessing bisa macet saat keluar. Utamakan OpenMP/workqueue.
+    numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+
+
+# 'python' : satu jalur/walk per iterasi interpreter (implementasi referensi)
+# 'numpy'  : blok vektorial NumPy dalam proses pemanggil
+# 'numba'  : kernel JIT dengan prange (paralel berbasis thread, tanpa pickling)
+# 'process': blok vektorial NumPy yang dibagi ke pool proses
+# 'distributed': seperti 'process', tetapi tugas dikirim ke worker TCP lewat
+#             distributed.Coordinator yang diberikan sebagai `num_processes`
+BACKENDS = ('python', 'numpy', 'numba', 'process', 'distributed')
+
+
+def resolve_backend(backend, parallel, default):
+    """
+    Menerjemahkan pilihan backend menjadi (kernel, pakai_proses).
+    backend=None mempertahankan perilaku lama: kernel `default`, dan flag `parallel`
+    menentukan apakah pool proses dipakai.
+    """
+    if backend is None:
+        return default, parallel
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend tidak dikenal: {backend}. Pilihan: {BACKENDS}")
+    if backend == 'numba':
+        if not NUMBA_AVAILABLE:
+            raise ImportError("Backend 'numba' membutuhkan paket numba (lihat requirements.txt).")
+        return 'numba', False
+    if backend in ('process', 'distributed'):
+        return 'numpy', True
+    return backend, parallel
+
+
+def njit(*args, **kwargs):
+    """
+    numba.njit bila numba terpasang. Tanpa numba fungsi dikembalikan apa adanya
+    agar modul tetap dapat diimpor; kernel hanya dipanggil lewat backend 'numba'.
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]):
+        return args[0]
+    return lambda func: func
+
+
+prange = numba.prange if NUMBA_AVAILABLE else range
+
+
+# ==============================================================================
+# RNG COUNTER-BASED UNTUK KERNEL NUMBA
+# ==============================================================================
+# Kernel paralel tidak dapat berbagi satu state RNG. Nilai ke-`counter` dari stream
+# `key` dihitung langsung (SplitMix64), sehingga hasil tidak bergantung pada jumlah
+# thread atau urutan eksekusi.
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+@njit(cache=True)
+def mix64(z):
+    """Fungsi finalisasi SplitMix64."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+@njit(cache=True)
+def stream_key(key, index):
+    """Kunci stream turunan untuk elemen ke-`index` (mis. satu walker)."""
+    return mix64(key + np.uint64(index) * _GOLDEN_GAMMA)
+
+
+@njit(cache=True)
+def counter_uniform(key, counter):
+    """Uniform [0, 1) ke-`counter` dari stream `key`."""
+    z = mix64(key + (np.uint64(counter) + np.uint64(1)) * _GOLDEN_GAMMA)
+    return np.float64(z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
@@ -0,0 +1,258 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import time
+
+import numpy as np
+from .rng import resolve_seed
+
+# ==============================================================================
+# EKSEKUSI CHUNK YANG TAHAN GAGAL DENGAN CHECKPOINT
+# ==============================================================================
+# Setiap chunk adalah tugas berseed yang idempoten: stream RNG-nya hanya bergantung pada
+# (seed, indeks blok), sehingga chunk yang gagal boleh diulang atau dipindah ke worker
+# lain tanpa mengubah hasil. Akumulator chunk yang selesai ditambahkan ke file checkpoint
+# (log append-only); run yang terputus dilanjutkan dengan hanya menjalankan chunk yang
+# belum tercatat. Reduksi tetap mengikuti urutan tugas, jadi hasil identik dengan run
+# tanpa checkpoint.
+
+# Over-sampling tetap pada Tabel 1 (fault_compensation_factor), sebagai pembanding overhead.
+FIXED_OVERSAMPLING = 0.05
+
+
+def fingerprint(*items):
+    """Sidik jari parameter run (skalar dan array) untuk memvalidasi checkpoint."""
+    digest = hashlib.sha256()
+    for item in items:
+        if isinstance(item, np.ndarray):
+            digest.update(str((item.shape, item.dtype.str)).encode())
+            digest.update(np.ascontiguousarray(item).tobytes())
+        else:
+            digest.update(repr(item).encode())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+class ChunkCheckpoint:
+    """
+    File checkpoint append-only: header {fingerprint, entropy} lalu satu record
+    (id_chunk, hasil) per chunk yang selesai. Record terakhir yang terpotong (crash saat
+    menulis) dibuang saat file dibuka.
+    """
+
+    def __init__(self, path, run_fingerprint, seed=None, fsync=False):
+        """
+        Args:
+            path (str): Lokasi file; dibuat jika belum ada, dilanjutkan jika ada.
+            run_fingerprint (str): Lihat fingerprint(); harus sama dengan saat file dibuat.
+            seed: Seed run. Dengan seed=None, entropi disimpan di header sehingga run
+                lanjutan memakai stream yang sama.
+            fsync (bool): Paksa setiap record ke disk. Tanpa fsync record tetap selamat dari
+                crash proses (buffer OS), tetapi tidak dari crash mesin; fsync per chunk
+                bisa mendominasi overhead untuk chunk yang pendek.
+        """
+        self.path, self.fsync = path, fsync
+        self.completed = {}
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._load(run_fingerprint, seed)
+        else:
+            self.entropy = resolve_seed(seed)
+            with open(path, 'wb') as f:
+                pickle.dump({'fingerprint': run_fingerprint, 'entropy': self.entropy}, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _load(self, run_fingerprint, seed):
+        with open(self.path, 'rb') as f:
+            header = pickle.load(f)
+            if header['fingerprint'] != run_fingerprint:
+                raise ValueError(f"Checkpoint {self.path} berasal dari run dengan parameter berbeda.")
+            if seed is not None and resolve_seed(seed) != header['entropy']:
+                raise ValueError(f"Checkpoint {self.path} memakai seed berbeda.")
+            self.entropy = header['entropy']
+            valid_end = f.tell()
+            while True:
+                try:
+                    chunk_id, result = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError, ValueError):
+                    break
+                self.completed[chunk_id] = result
+                valid_end = f.tell()
+        # Buang sisa record yang terpotong agar append berikutnya tetap terbaca
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_end)
+
+    def record(self, chunk_id, result):
+        """Menambahkan hasil satu chunk ke file."""
+        self.completed[chunk_id] = result
+        with open(self.path, 'ab') as f:
+            pickle.dump((chunk_id, result), f)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+
+def _timed_call(args):
+    """Worker pembungkus: (hasil, waktu komputasi) untuk satu chunk."""
+    func, task = args
+    start = time.perf_counter()
+    result = func(task)
+    return result, time.perf_counter() - start
+
+
+class FaultTolerantRunner:
+    """
+    Menjalankan chunk dengan retry, timeout dan checkpoint. Chunk yang melempar exception
+    diulang sampai max_retries kali. Chunk yang melewati task_timeout (worker hang atau
+    mati, sehingga hasilnya tidak pernah tiba) membuat pool dihentikan dan dibuat ulang;
+    semua chunk yang sedang berjalan dijadwalkan ulang. Ringkasan run ada di self.report.
+    """
+
+    def __init__(self, parallel=False, num_processes=4, checkpoint=None, max_retries=2, task_timeout=None):
+        """
+        Args:
+            num_processes: Jumlah proses untuk pool milik runner, atau eksekutor
+                (ParallelExecutor, distributed.Coordinator). Dengan eksekutor, chunk dijalankan
+                lewat map_reduce miliknya dan dicatat ke checkpoint begitu direduksi; setelah
+                error, chunk yang belum tercatat diulang (paling banyak max_retries kali per run).
+            checkpoint (ChunkCheckpoint): Penyimpanan hasil chunk (opsional).
+            task_timeout (float): Batas waktu dinding per chunk (detik); hanya untuk eksekusi
+                paralel di pool milik runner, dan diperlukan untuk mendeteksi worker yang mati.
+                Tidak tersedia dengan eksekutor (Coordinator memiliki task_timeout sendiri).
+        """
+        if hasattr(num_processes, 'map_reduce') and task_timeout is not None:
+            raise ValueError("task_timeout tidak didukung dengan eksekutor; gunakan Coordinator(task_timeout=...).")
+        self.parallel, self.num_processes = parallel, num_processes
+        self.checkpoint = checkpoint
+        self.max_retries, self.task_timeout = max_retries, task_timeout
+        # Akumulatif lintas pemanggilan run() (mis. putaran mode adaptif)
+        self.report = {'chunks': 0, 'resumed': 0, 'executed': 0, 'failures': 0, 'timeouts': 0,
+                       'compute_time': 0.0, 'lost_time': 0.0, 'checkpoint_time': 0.0, 'wall_time': 0.0,
+                       'overhead': 0.0, 'fixed_oversampling': FIXED_OVERSAMPLING}
+
+    def run(self, func, tasks, chunk_ids, reducer, initial):
+        """
+        Menjalankan func(task) untuk setiap chunk yang belum ada di checkpoint, lalu
+        mereduksi semua hasil dalam urutan tugas (acc = reducer(acc, hasil)).
+        """
+        tasks, chunk_ids = list(tasks), list(chunk_ids)
+        results = {} if self.checkpoint is None else {i: self.checkpoint.completed[c]
+                                                      for i, c in enumerate(chunk_ids)
+                                                      if c in self.checkpoint.completed}
+        self.report['chunks'] += len(tasks)
+        self.report['resumed'] += len(results)
+        start = time.perf_counter()
+        pending = [i for i in range(len(tasks)) if i not in results]
+        if self.parallel and len(pending) > 1 and hasattr(self.num_processes, 'map_reduce'):
+            self._run_executor(func, tasks, chunk_ids, pending, results)
+        elif self.parallel and len(pending) > 1:
+            self._run_pool(func, tasks, chunk_ids, pending, results)
+        else:
+            for i in pending:
+                results[i] = self._run_inline(func, tasks[i], chunk_ids[i])
+
+        report = self.report
+        report['wall_time'] += time.perf_counter() - start
+        # Overhead efektif: waktu chunk yang hilang (gagal/timeout) + tulis checkpoint,
+        # relatif terhadap komputasi yang berguna; bandingkan dengan fixed_oversampling
+        report['overhead'] = ((report['lost_time'] + report['checkpoint_time']) / report['compute_time']
+                              if report['compute_time'] > 0 else 0.0)
+        acc = initial
+        for i in range(len(tasks)):
+            acc = reducer(acc, results[i])
+        return acc
+
+    def _succeeded(self, chunk_id, result, elapsed):
+        self.report['executed'] += 1
+        self.report['compute_time'] += elapsed
+        if self.checkpoint is not None:
+            start = time.perf_counter()
+            self.checkpoint.record(chunk_id, result)
+            self.report['checkpoint_time'] += time.perf_counter() - start
+        return result
+
+    def _failed(self, chunk_id, attempts, error):
+        self.report['failures'] += 1
+        if attempts > self.max_retries:
+            raise RuntimeError(f"Chunk {chunk_id} gagal setelah {attempts} percobaan.") from error
+
+    def _run_inline(self, func, task, chunk_id):
+        attempts = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                result = func(task)
+            except Exception as error:
+                attempts += 1
+                self.report['lost_time'] += time.perf_counter() - start
+                self._failed(chunk_id, attempts, error)
+                continue
+            return self._succeeded(chunk_id, result, time.perf_counter() - start)
+
+    def _run_executor(self, func, tasks, chunk_ids, pending, results):
+        # Eksekutor mereduksi dalam urutan tugas, jadi hasil ke-k milik pending[k]
+        attempts = 0
+        while pending:
+            recorded = []
+
+            def record(acc, item):
+                i = pending[len(recorded)]
+                result, elapsed = item
+                results[i] = self._succeeded(chunk_ids[i], result, elapsed)
+                recorded.append(i)
+                return acc
+
+            try:
+                self.num_processes.map_reduce(_timed_call, [(func, tasks[i]) for i in pending], reducer=record)
+            except Exception as error:
+                pending = pending[len(recorded):]
+                attempts += 1
+                self._failed(chunk_ids[pending[0]], attempts, error)
+                continue
+            return
+
+    def _run_pool(self, func, tasks, chunk_ids, pending, results):
+        # Paling banyak satu chunk per proses sedang berjalan, sehingga waktu sejak submit
+        # sama dengan waktu eksekusi dan timeout dapat dinilai per chunk.
+        attempts = {i: 0 for i in pending}
+        queue = list(reversed(pending))
+        in_flight = {}
+        pool = multiprocessing.Pool(self.num_processes)
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.num_processes:
+                    i = queue.pop()
+                    in_flight[i] = (pool.apply_async(_timed_call, ((func, tasks[i]),)), time.perf_counter())
+                oldest = min(in_flight, key=lambda i: in_flight[i][1])
+                in_flight[oldest][0].wait(0.05)
+                now = time.perf_counter()
+                timed_out = False
+                for i, (async_result, submitted) in list(in_flight.items()):
+                    if async_result.ready():
+                        del in_flight[i]
+                        try:
+                            result, elapsed = async_result.get()
+                        except Exception as error:
+                            attempts[i] += 1
+                            self.report['lost_time'] += now - submitted
+                            self._failed(chunk_ids[i], attempts[i], error)
+                            queue.append(i)
+                            continue
+                        results[i] = self._succeeded(chunk_ids[i], result, elapsed)
+                    elif self.task_timeout is not None and now - submitted > self.task_timeout:
+                        timed_out = True
+                        attempts[i] += 1
+                        self.report['timeouts'] += 1
+                        self._failed(chunk_ids[i], attempts[i], TimeoutError(f"Chunk melewati {self.task_timeout} s"))
+                if timed_out:
+                    # Worker yang hang/mati tidak dapat dibebaskan satu per satu: pool dibuat
+                    # ulang dan semua chunk yang sedang berjalan dijadwalkan ulang.
+                    pool.terminate()
+                    pool = multiprocessing.Pool(self.num_processes)
+                    for i, (_, submitted) in in_flight.items():
+                        self.report['lost_time'] += now - submitted
+                        queue.append(i)
+                    in_flight.clear()
+        finally:
+            pool.terminate()
@@ -0,0 +1,362 @@
+import argparse
+import collections
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from multiprocessing.connection import Listener, Client
+
+import numpy as np
+from tqdm import tqdm
+from . import instrumentation
+
+# ==============================================================================
+# EKSEKUSI MULTI-NODE LEWAT ANTREAN TUGAS TCP
+# ==============================================================================
+# Coordinator membagikan tugas berseed (blok jalur pricer atau blok walk solver) ke
+# worker yang terhubung lewat TCP (multiprocessing.connection, autentikasi HMAC).
+# Worker boleh bergabung atau keluar kapan saja: tugas milik worker yang terputus
+# dikembalikan ke antrean dan dikerjakan worker lain. Karena stream RNG hanya
+# bergantung pada (seed, indeks blok) dan reduksi mengikuti urutan tugas, hasil identik
+# dengan eksekusi lokal. Coordinator memiliki antarmuka yang sama dengan
+# ParallelExecutor (map_reduce, num_processes), sehingga dapat diberikan sebagai
+# `num_processes` (atau `executor`) pada pricer dan solver.
+#
+# Worker harus dapat mengimpor modul yang sama (jalankan dari root repositori):
+#   python -m src.utils.distributed worker HOST:PORT --authkey HEX
+#
+# Coordinator dan worker saling mengirim objek pickle, jadi siapa pun yang mengetahui
+# kunci HMAC dapat menjalankan kode di kedua sisi. Tidak ada kunci bawaan: tanpa authkey
+# eksplisit atau variabel lingkungan MC_AUTHKEY, setiap Coordinator membuat kunci acak
+# (os.urandom) yang tersedia di coordinator.authkey (heksadesimal: authkey.hex()).
+
+AUTHKEY_ENV = 'MC_AUTHKEY'
+AUTHKEY_BYTES = 32
+
+# Array dalam handle tugas yang lebih besar dari ini dikirim sekali per worker per job,
+# bukan di setiap tugas (pengganti shared memory antar mesin).
+BROADCAST_MIN_BYTES = 64 * 1024
+
+
+def _pack_task(task, job_id, sent):
+    """
+    Mengganti array besar di dalam dict pada tugas (handle tabel, ruas kanan) dengan token.
+    Mengembalikan (tugas, {token: array} yang belum pernah dikirim ke worker ini).
+    """
+    if not isinstance(task, tuple):
+        return task, {}
+    fresh = {}
+    packed = []
+    for item in task:
+        if isinstance(item, dict):
+            item = dict(item)
+            for name, value in item.items():
+                if isinstance(value, np.ndarray) and value.nbytes >= BROADCAST_MIN_BYTES:
+                    token = (job_id, id(value))
+                    if token not in sent:
+                        fresh[token] = value
+                        sent.add(token)
+                    item[name] = ('__broadcast__', token)
+        packed.append(item)
+    return tuple(packed), fresh
+
+
+def _unpack_task(task, cache):
+    if not isinstance(task, tuple):
+        return task
+    unpacked = []
+    for item in task:
+        if isinstance(item, dict):
+            item = {name: cache[value[1]] if isinstance(value, tuple) and value[:1] == ('__broadcast__',) else value
+                    for name, value in item.items()}
+        unpacked.append(item)
+    return tuple(unpacked)
+
+
+def _append(acc, result):
+    acc.append(result)
+    return acc
+
+
+def _environment_authkey():
+    key = os.environ.get(AUTHKEY_ENV)
+    return key.encode() if key else None
+
+
+class _Job:
+    def __init__(self, job_id, func, tasks):
+        self.id, self.func, self.tasks = job_id, func, tasks
+        self.results, self.error = {}, None
+        self.assigned = collections.Counter()
+        self.reassigned = 0
+
+
+class Coordinator:
+    """
+    Koordinator antrean tugas TCP. Satu job (map_reduce) berjalan pada satu waktu; setiap
+    worker yang terhubung dilayani satu thread yang mengambil tugas berikutnya dari antrean,
+    sehingga worker cepat otomatis mengerjakan lebih banyak tugas.
+    """
+
+    # Tugas dikirim lewat jaringan, handle SharedArrays tidak berlaku di mesin lain
+    shares_memory = False
+
+    def __init__(self, address=('localhost', 0), authkey=None, task_timeout=None, join_timeout=60.0):
+        """
+        Args:
+            address (tuple): (host, port) untuk listen; port 0 = pilih port bebas
+                (lihat self.address). Gunakan ('0.0.0.0', port) untuk worker di mesin lain,
+                hanya di jaringan tepercaya.
+            authkey (bytes): Kunci HMAC bersama antara coordinator dan worker. None = MC_AUTHKEY
+                jika diset, selain itu kunci acak per Coordinator (lihat self.authkey).
+            task_timeout (float): Worker yang tidak membalas satu tugas dalam waktu ini
+                dianggap keluar dan tugasnya dijadwalkan ulang.
+            join_timeout (float): map_reduce gagal jika selama waktu ini tidak ada worker
+                yang terhubung sementara masih ada tugas.
+        """
+        if authkey is None:
+            authkey = _environment_authkey() or os.urandom(AUTHKEY_BYTES)
+        self.authkey = authkey
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self.task_timeout, self.join_timeout = task_timeout, join_timeout
+        self._cond = threading.Condition()
+        self._queue = collections.deque()
+        self._job, self._next_job_id = None, 0
+        self._workers = {}
+        self._closed = False
+        self.last_run = {}
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+
+    @property
+    def num_processes(self):
+        """Jumlah worker yang sedang terhubung."""
+        with self._cond:
+            return len(self._workers)
+
+    def wait_for_workers(self, count, timeout=None):
+        """Menunggu sampai paling sedikit `count` worker terhubung; mengembalikan jumlahnya."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._workers) < count:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return len(self._workers)
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        # Satu thread per worker: ambil tugas, kirim, tunggu hasil, ulangi
+        try:
+            hello = conn.recv()
+        except (EOFError, OSError):
+            conn.close()
+            return
+        worker_id = f"{hello.get('host')}:{hello.get('pid')}"
+        with self._cond:
+            self._workers[worker_id] = conn
+            self._cond.notify_all()
+        sent, sent_job = set(), None
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        break
+                    job, index = self._queue.popleft()
+                    job.assigned[worker_id] += 1
+                if sent_job != job.id:
+                    sent, sent_job = set(), job.id
+                task, arrays = _pack_task(job.tasks[index], job.id, sent)
+                try:
+                    conn.send(('task', job.id, index, job.func, task, arrays))
+                    if self.task_timeout is not None and not conn.poll(self.task_timeout):
+                        raise TimeoutError(f"Worker {worker_id} melewati task_timeout")
+                    status, index, payload = conn.recv()
+                except (EOFError, OSError, TimeoutError):
+                    # Worker keluar/mati/hang: kembalikan tugas ke depan antrean
+                    with self._cond:
+                        if job.error is None and index not in job.results:
+                            self._queue.appendleft((job, index))
+                            job.reassigned += 1
+                        self._cond.notify_all()
+                    break
+                with self._cond:
+                    if status == 'ok':
+                        job.results[index] = payload
+                    elif job.error is None:
+                        job.error = RuntimeError(f"Tugas {index} gagal di worker {worker_id}:\n{payload}")
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._workers.pop(worker_id, None)
+                self._cond.notify_all()
+            try:
+                conn.send(('stop',))
+            except (OSError, EOFError):
+                pass
+            conn.close()
+
+    def map_reduce(self, func, tasks, reducer=None, initial=None):
+        """
+        Sama seperti ParallelExecutor.map_reduce: hasil direduksi dalam urutan tugas
+        (acc = reducer(acc, hasil)), atau dikembalikan sebagai list tanpa reducer.
+        Ringkasan (tugas per worker, tugas yang dijadwalkan ulang) ada di self.last_run.
+        """
+        tasks = list(tasks)
+        if reducer is None:
+            reducer, initial = _append, []
+        func, reducer = instrumentation.wrap(func, reducer)
+        acc = initial
+        start = time.perf_counter()
+        with self._cond:
+            job = _Job(self._next_job_id, func, tasks)
+            self._next_job_id += 1
+            self._job = job
+            self._queue.extend((job, index) for index in range(len(tasks)))
+            self._cond.notify_all()
+
+        next_reduce, idle_since = 0, time.monotonic()
+        try:
+            with tqdm(total=len(tasks), desc=f"Running on {self.num_processes} remote workers",
+                      mininterval=0.5) as progress:
+                while next_reduce < len(tasks):
+                    with self._cond:
+                        while next_reduce not in job.results and job.error is None:
+                            if not self._workers and time.monotonic() - idle_since > self.join_timeout:
+                                raise RuntimeError(f"Tidak ada worker selama {self.join_timeout} s.")
+                            if self._workers:
+                                idle_since = time.monotonic()
+                            self._cond.wait(0.5)
+                        if job.error is not None:
+                            raise job.error
+                        ready = []
+                        while next_reduce in job.results:
+                            ready.append(job.results.pop(next_reduce))
+                            next_reduce += 1
+                    for result in ready:
+                        acc = reducer(acc, result)
+                    progress.update(len(ready))
+        finally:
+            with self._cond:
+                # Buang sisa tugas job ini (mis. setelah error)
+                self._queue = collections.deque(item for item in self._queue if item[0] is not job)
+                self._job = None
+        self.last_run = {'tasks': len(tasks), 'wall_time': time.perf_counter() - start,
+                         'tasks_per_worker': dict(job.assigned), 'reassigned': job.reassigned}
+        return acc
+
+    def close(self):
+        """Menghentikan worker yang terhubung dan menutup listener."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        # Bangunkan accept() sebelum listener ditutup: thread yang masih menunggu di fd lama
+        # dapat menerima koneksi ke listener baru yang memakai ulang nomor fd yang sama.
+        host, port = self.address
+        try:
+            socket.create_connection(('localhost' if host in ('', '0.0.0.0') else host, port), timeout=1).close()
+        except OSError:
+            pass
+        self._accept_thread.join(timeout=5)
+        self._listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==============================================================================
+# WORKER
+# ==============================================================================
+
+def run_worker(address, authkey=None, max_tasks=None):
+    """
+    Loop worker: terhubung ke coordinator, menjalankan tugas sampai diberi 'stop' atau
+    koneksi ditutup. `authkey` = coordinator.authkey (None = MC_AUTHKEY). `max_tasks` membuat
+    worker keluar setelah sejumlah tugas (uji leave). Mengembalikan jumlah tugas yang dikerjakan.
+    """
+    if authkey is None:
+        authkey = _environment_authkey()
+    if authkey is None:
+        raise ValueError(f"authkey diperlukan: berikan coordinator.authkey atau set {AUTHKEY_ENV}.")
+    conn = Client(tuple(address), authkey=authkey)
+    conn.send({'host': socket.gethostname(), 'pid': os.getpid()})
+    cache, cache_job, done = {}, None, 0
+    try:
+        while max_tasks is None or done < max_tasks:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == 'stop':
+                break
+            _, job_id, index, func, task, arrays = message
+            if job_id != cache_job:
+                cache, cache_job = {}, job_id
+            cache.update(arrays)
+            try:
+                conn.send(('ok', index, func(_unpack_task(task, cache))))
+            except Exception:
+                conn.send(('error', index, traceback.format_exc()))
+            done += 1
+    finally:
+        conn.close()
+    return done
+
+
+def spawn_local_workers(address, count, authkey=None, max_tasks=None):
+    """
+    Menjalankan `count` proses worker di mesin ini (untuk uji dan benchmark scaling);
+    `authkey` biasanya coordinator.authkey.
+    """
+    if authkey is None:
+        authkey = _environment_authkey()
+    if authkey is None:
+        raise ValueError(f"authkey diperlukan: berikan coordinator.authkey atau set {AUTHKEY_ENV}.")
+    processes = [multiprocessing.Process(target=run_worker, args=(address, authkey, max_tasks), daemon=True)
+                 for _ in range(count)]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def _parse_address(text):
+    host, port = text.rsplit(':', 1)
+    return host, int(port)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Worker Monte Carlo terdistribusi.")
+    parser.add_argument('mode', choices=['worker'])
+    parser.add_argument('address', help="HOST:PORT milik coordinator")
+    parser.add_argument('--processes', type=int, default=1, help="Jumlah proses worker di mesin ini")
+    parser.add_argument('--authkey', help=f"coordinator.authkey.hex(); default dari {AUTHKEY_ENV}")
+    args = parser.parse_args()
+    authkey = bytes.fromhex(args.authkey) if args.authkey else _environment_authkey()
+    if authkey is None:
+        parser.error(f"--authkey atau {AUTHKEY_ENV} diperlukan.")
+    workers = spawn_local_workers(_parse_address(args.address), args.processes, authkey)
+    for worker in workers:
+        worker.join()
@@ -0,0 +1,338 @@
+import cProfile
+import collections
+import contextlib
+import functools
+import pickle
+import pstats
+import sys
+import threading
+import time
+
+# ==============================================================================
+# INSTRUMENTASI FASE, PENCACAH DAN PROFILER (OPT-IN)
+# ==============================================================================
+# Pemakaian:
+#
+#     with instrument(profile='cprofile') as session:
+#         estimate = pricer.price_option(M, parallel=True, return_stats=True, seed=1)
+#     print(session.stats.report())       # seluruh sesi
+#     print(estimate.instrumentation.report())  # hanya panggilan price_option ini
+#
+# Titik instrumentasi memanggil probe().phase(nama) / probe().count(nama, nilai) di batas
+# fase (per tugas, per blok stream, per langkah lockstep), tidak pernah per walk di loop
+# Python atau di kernel numba. Tanpa sesi aktif probe() mengembalikan NULL_PROBE yang
+# tidak melakukan apa-apa, dan eksekutor tidak membungkus tugas sama sekali.
+# Di worker, setiap tugas dijalankan dengan probe sendiri; statistiknya dikirim balik
+# bersama hasil tugas lalu digabung di proses utama.
+
+PROFILERS = ('cprofile', 'sampling')
+# Interval sampling profiler (detik)
+SAMPLING_INTERVAL = 0.005
+
+
+class PhaseStats:
+    """
+    Statistik yang dapat digabung: waktu dan jumlah panggilan per fase, pencacah
+    (walks, steps, absorbed, ...) dan data profiler dari setiap worker. Fase dapat
+    bersarang; 'task' adalah total waktu tugas di worker.
+    """
+
+    def __init__(self):
+        self.seconds = collections.defaultdict(float)
+        self.calls = collections.Counter()
+        self.counters = collections.Counter()
+        self.cprofile = []                     # dict mentah cProfile per tugas/proses
+        self.samples = collections.Counter()   # 'file:baris (fungsi)' -> jumlah sampel
+
+    def add_time(self, name, seconds):
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def merge(self, other):
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        self.calls.update(other.calls)
+        self.counters.update(other.counters)
+        self.cprofile.extend(other.cprofile)
+        self.samples.update(other.samples)
+        return self
+
+    def copy(self):
+        return PhaseStats().merge(self)
+
+    def since(self, earlier):
+        """Statistik yang tercatat setelah `earlier` (salinan sebelumnya dari PhaseStats ini)."""
+        delta = PhaseStats()
+        for name, seconds in self.seconds.items():
+            if self.calls[name] > earlier.calls[name]:
+                delta.seconds[name] = seconds - earlier.seconds[name]
+        delta.calls = self.calls - earlier.calls
+        delta.counters = self.counters - earlier.counters
+        delta.cprofile = self.cprofile[len(earlier.cprofile):]
+        delta.samples = self.samples - earlier.samples
+        return delta
+
+    @property
+    def derived(self):
+        """Rasio turunan dari pencacah walk (hanya yang pencacahnya tersedia)."""
+        walks, result = self.counters.get('walks', 0), {}
+        if walks:
+            for name in ('steps', 'absorbed', 'terminated', 'truncated'):
+                if name in self.counters:
+                    key = 'steps_per_walk' if name == 'steps' else f"{name}_fraction"
+                    result[key] = self.counters[name] / walks
+        return result
+
+    def as_dict(self):
+        return {'phases': {name: {'seconds': self.seconds[name], 'calls': self.calls[name]} for name in self.seconds},
+                'counters': dict(self.counters), 'derived': self.derived}
+
+    def profile_stats(self):
+        """pstats.Stats gabungan dari semua worker (None tanpa profile='cprofile')."""
+        if not self.cprofile:
+            return None
+        combined = None
+        for raw in self.cprofile:
+            source = _RawProfile(raw)
+            if combined is None:
+                combined = pstats.Stats(source)
+            else:
+                combined.add(source)
+        return combined
+
+    def report(self, top=10):
+        """Ringkasan teks: fase (urut waktu), pencacah, dan fungsi terpanas."""
+        lines = [f"{'fase':<14} {'detik':>10} {'panggilan':>10}"]
+        for name in sorted(self.seconds, key=self.seconds.get, reverse=True):
+            lines.append(f"{name:<14} {self.seconds[name]:>10.4f} {self.calls[name]:>10}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<14} {value:>10}")
+        for name, value in self.derived.items():
+            lines.append(f"{name:<20} {value:>10.4f}")
+        if self.samples:
+            total = sum(self.samples.values())
+            lines.append(f"sampel profiler: {total}")
+            for location, count in self.samples.most_common(top):
+                lines.append(f"  {count / total:6.1%}  {location}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"PhaseStats({self.as_dict()})"
+
+
+class _RawProfile:
+    # Adaptor agar dict cProfile mentah dapat dibaca pstats.Stats
+    def __init__(self, raw):
+        self.stats = raw
+
+    def create_stats(self):
+        pass
+
+
+class _PhaseTimer:
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats, self.name = stats, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+
+
+class Probe:
+    """Probe aktif: mencatat ke satu PhaseStats."""
+    enabled = True
+
+    def __init__(self, stats=None):
+        self.stats = PhaseStats() if stats is None else stats
+
+    def phase(self, name):
+        return _PhaseTimer(self.stats, name)
+
+    def count(self, name, value=1):
+        self.stats.counters[name] += int(value)
+
+
+class _NullProbe:
+    enabled = False
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, value=1):
+        pass
+
+
+NULL_PROBE = _NullProbe()
+# Probe milik proses ini; diganti oleh sesi di proses utama atau oleh pembungkus tugas di worker
+_current = NULL_PROBE
+_session = None
+# Per thread: tumpukan (sesi, salinan statistik) di awal setiap panggilan publik (per_call)
+_calls = threading.local()
+
+
+def probe():
+    """Probe aktif di proses ini (NULL_PROBE jika instrumentasi mati)."""
+    return _current
+
+
+def snapshot():
+    """
+    Statistik panggilan publik terdalam yang sedang berjalan (selisih statistik sesi sejak
+    awal panggilan), untuk dilampirkan ke hasil; di luar panggilan per_call salinan seluruh
+    sesi. None tanpa sesi aktif.
+    """
+    if _session is None:
+        return None
+    marks = getattr(_calls, 'marks', None)
+    if marks and marks[-1][0] is _session:
+        return _session.stats.since(marks[-1][1])
+    return _session.stats.copy()
+
+
+def per_call(method):
+    """
+    Dekorator untuk metode publik yang mengembalikan MCEstimate: menandai awal panggilan
+    agar `instrumentation` pada hasil hanya berisi statistik panggilan itu.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _session is None:
+            return method(*args, **kwargs)
+        marks = _calls.__dict__.setdefault('marks', [])
+        marks.append((_session, _session.stats.copy()))
+        try:
+            return method(*args, **kwargs)
+        finally:
+            marks.pop()
+    return wrapper
+
+
+class SamplingProfiler:
+    """
+    Profiler sampling ringan: thread latar mencatat frame teratas thread yang diprofil
+    setiap `interval` detik. Overhead tidak bergantung pada jumlah panggilan fungsi.
+    """
+
+    def __init__(self, interval=SAMPLING_INTERVAL):
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        target = threading.get_ident()
+
+        def sample():
+            while not self._stop.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    code = frame.f_code
+                    self.samples[f"{code.co_filename}:{frame.f_lineno} ({code.co_name})"] += 1
+
+        self._thread = threading.Thread(target=sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+@contextlib.contextmanager
+def _profiled(profile, stats):
+    if profile is None:
+        yield
+        return
+    if profile == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.create_stats()
+            stats.cprofile.append(profiler.stats)
+        return
+    sampler = SamplingProfiler()
+    sampler.start()
+    try:
+        yield
+    finally:
+        stats.samples.update(sampler.stop())
+
+
+class instrument:
+    """
+    Sesi instrumentasi untuk blok `with`. Statistik semua panggilan di dalam blok
+    (proses utama dan worker pool/Coordinator) terkumpul di self.stats; setiap MCEstimate
+    yang dibuat di dalam blok membawa statistik panggilan yang membuatnya di `instrumentation`.
+    """
+
+    def __init__(self, profile=None):
+        """
+        Args:
+            profile (str): None, 'cprofile' (deterministik, overhead per panggilan fungsi)
+                atau 'sampling' (SamplingProfiler). Diterapkan per tugas di worker dan pada
+                proses utama selama blok berjalan.
+        """
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"Profiler tidak dikenal: {profile}. Pilihan: {PROFILERS}")
+        self.profile = profile
+        self.stats = PhaseStats()
+        self._previous = None
+
+    def __enter__(self):
+        global _current, _session
+        self._previous = (_current, _session)
+        _current, _session = Probe(self.stats), self
+        self._profiler = _profiled(self.profile, self.stats)
+        self._profiler.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        global _current, _session
+        self._profiler.__exit__(*exc)
+        _current, _session = self._previous
+
+
+def _instrumented_call(func, profile, task):
+    """Pembungkus tugas di worker: probe baru, profiler opsional; mengembalikan (hasil, statistik)."""
+    global _current
+    stats = PhaseStats()
+    previous, _current = _current, Probe(stats)
+    try:
+        with _profiled(profile, stats), _current.phase('task'):
+            result = func(task)
+        with _current.phase('pickle'):
+            _current.count('result_bytes', payload_size(result))
+    finally:
+        _current = previous
+    return result, stats
+
+
+def _merging_reducer(reducer, acc, item):
+    result, stats = item
+    _session.stats.merge(stats)
+    return reducer(acc, result)
+
+
+def wrap(func, reducer):
+    """
+    Dipakai eksekutor: tanpa sesi aktif mengembalikan (func, reducer) apa adanya; dengan
+    sesi, tugas dibungkus agar statistik worker ikut dikirim dan digabung saat reduksi.
+    """
+    if _session is None:
+        return func, reducer
+    return (functools.partial(_instrumented_call, func, _session.profile),
+            functools.partial(_merging_reducer, reducer))
+
+
+def payload_size(obj):
+    """Ukuran pickle `obj` (byte); hanya dipanggil saat instrumentasi aktif."""
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
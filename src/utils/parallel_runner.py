@@ -1,21 +1,265 @@
 import multiprocessing
+import queue
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
 from tqdm import tqdm
+from . import instrumentation
 
 
-def run_parallel(func, tasks, num_processes, initializer=None, initargs=None):
+def split_into_blocks(total, block_size):
     """
-    Fungsi generik untuk menjalankan tugas secara paralel.
-    Mendukung initializer dan chunksize untuk optimasi.
+    Membagi `total` sampel menjadi blok-blok berukuran tetap `block_size`.
+    Blok terakhir berisi sisa pembagian (jika ada).
+    """
+    if block_size < 1:
+        raise ValueError("block_size harus positif.")
+    num_full, remainder = divmod(int(total), int(block_size))
+    blocks = [int(block_size)] * num_full
+    if remainder:
+        blocks.append(remainder)
+    return blocks
+
+
+# ==============================================================================
+# ARRAY BERSAMA (SHARED MEMORY)
+# ==============================================================================
+
+def _release_segments(segments):
+    for shm in segments:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArrays:
+    """
+    Mempublikasikan sekumpulan array NumPy ke `multiprocessing.shared_memory` sekali saja.
+    `handle` berukuran kecil (nama segmen, shape, dtype) sehingga murah dikirim di setiap
+    tugas; worker memanggil `attach_shared(handle)` untuk membaca array tanpa salinan.
+    """
+
+    def __init__(self, **arrays):
+        self._segments = []
+        self.handle = {}
+        for name, array in arrays.items():
+            if array is None:
+                self.handle[name] = None
+                continue
+            array = np.ascontiguousarray(array)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+            self._segments.append(shm)
+            self.handle[name] = (shm.name, array.shape, array.dtype.str)
+        self._finalizer = weakref.finalize(self, _release_segments, self._segments)
+
+    def close(self):
+        """Melepas dan menghapus semua segmen shared memory."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Cache di sisi worker: nama segmen -> (SharedMemory, ndarray)
+_attached_segments = {}
+
+
+def attach_shared(handle):
+    """
+    Mengembalikan dict nama -> ndarray untuk sebuah handle dari SharedArrays.
+    Segmen dibuka sekali per proses lalu di-cache. Nilai yang sudah berupa ndarray
+    dikembalikan apa adanya, sehingga eksekusi sekuensial bisa memakai dict array biasa.
+    """
+    arrays = {}
+    for name, spec in handle.items():
+        if spec is None or isinstance(spec, np.ndarray):
+            arrays[name] = spec
+            continue
+        shm_name, shape, dtype = spec
+        if shm_name not in _attached_segments:
+            _evict_stale_segments(handle)
+            shm = shared_memory.SharedMemory(name=shm_name)
+            _attached_segments[shm_name] = (shm, np.ndarray(shape, dtype, buffer=shm.buf))
+        arrays[name] = _attached_segments[shm_name][1]
+    return arrays
+
+
+def _evict_stale_segments(handle):
+    # Lepaskan segmen lama yang tidak lagi dirujuk handle aktif (mis. setelah gamma berubah)
+    current = {spec[0] for spec in handle.values() if isinstance(spec, tuple)}
+    for shm_name in [key for key in _attached_segments if key not in current]:
+        shm, _ = _attached_segments.pop(shm_name)
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+# ==============================================================================
+# EKSEKUTOR PARALEL
+# ==============================================================================
+
+# Target durasi satu batch tugas; batch lebih kecil menambah overhead IPC, lebih besar
+# membuat straggler di akhir pekerjaan.
+TARGET_BATCH_SECONDS = 0.1
+
+
+def _append(acc, result):
+    acc.append(result)
+    return acc
+
+
+def _run_batch(args):
+    """Worker pembungkus: menjalankan satu batch (indeks, tugas) dan mengukur waktunya."""
+    func, batch = args
+    start = time.perf_counter()
+    results = [(index, func(task)) for index, task in batch]
+    return results, time.perf_counter() - start
+
+
+class ParallelExecutor:
+    """
+    Pool proses berumur panjang yang dapat dipakai ulang lintas pemanggilan.
+    Pool dibuat saat pertama kali dibutuhkan dan hidup sampai `close()`.
     """
-    if num_processes is None:
-        num_processes = multiprocessing.cpu_count()
 
-    chunksize = max(1, len(tasks) // (num_processes * 4))
+    # Worker berada di mesin yang sama sehingga handle SharedArrays dapat dipakai
+    shares_memory = True
+
+    def __init__(self, num_processes=None, initializer=None, initargs=(), target_batch_seconds=TARGET_BATCH_SECONDS,
+                 prefetch=2):
+        """
+        Args:
+            target_batch_seconds (float): Durasi target satu batch tugas; ukuran batch
+                dihitung dari throughput yang terukur selama pekerjaan berjalan.
+            prefetch (int): Batch dalam antrean per proses, sehingga worker tidak menunggu
+                proses utama menjadwalkan batch berikutnya atau mereduksi hasil.
+        """
+        if num_processes is None:
+            num_processes = multiprocessing.cpu_count()
+        self.num_processes = num_processes
+        self.target_batch_seconds, self.prefetch = target_batch_seconds, prefetch
+        self._initializer, self._initargs = initializer, initargs
+        self._pool = None
+        self.last_run = {}
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            # Worker harus berbagi resource tracker dengan proses utama. Jika pool dibuat
+            # sebelum SharedArrays pertama, setiap worker memulai tracker sendiri untuk
+            # segmen yang di-attach dan melaporkannya bocor saat keluar.
+            resource_tracker.ensure_running()
+            with instrumentation.probe().phase('pool_startup'):
+                self._pool = multiprocessing.Pool(processes=self.num_processes,
+                                                  initializer=self._initializer,
+                                                  initargs=self._initargs)
+        return self._pool
+
+    def _batch_size(self, seconds_per_task, remaining):
+        # Batch pertama satu tugas (probe throughput). Selanjutnya sebesar target durasi,
+        # dibatasi sisa / (2 * proses) agar batch mengecil menjelang akhir (guided scheduling).
+        if seconds_per_task is None:
+            return 1
+        target = int(self.target_batch_seconds / max(seconds_per_task, 1e-9))
+        tail = -(-remaining // (2 * self.num_processes))
+        return max(1, min(target, tail))
 
-    with multiprocessing.Pool(processes=num_processes,
-                              initializer=initializer,
-                              initargs=initargs) as pool:
-        results = list(tqdm(pool.imap(func, tasks, chunksize=chunksize),
-                            total=len(tasks),
-                            desc=f"Running on {num_processes} cores"))
-    return results
\ No newline at end of file
+    def map_reduce(self, func, tasks, reducer=None, initial=None):
+        """
+        Menjalankan `func` atas semua `tasks` sebagai satu aliran tugas.
+        Tanpa `reducer` hasil dikembalikan sebagai list; dengan `reducer` hasil dilipat
+        satu per satu (acc = reducer(acc, hasil), dimulai dari `initial`).
+        Batch dijadwalkan secara adaptif dan hasil diterima tanpa urutan, tetapi reduksi
+        selalu mengikuti urutan indeks tugas (buffer penyusun ulang), sehingga hasil identik
+        berapa pun jumlah proses dan ukuran batch. Ringkasan run tersedia di self.last_run.
+        """
+        tasks = list(tasks)
+        if reducer is None:
+            reducer, initial = _append, []
+        func, reducer = instrumentation.wrap(func, reducer)
+        probe = instrumentation.probe()
+        acc = initial
+        start = time.perf_counter()
+        done = queue.SimpleQueue()
+        state = {'next_task': 0, 'in_flight': 0, 'batches': 0, 'max_batch': 0}
+
+        def submit(seconds_per_task):
+            size = self._batch_size(seconds_per_task, len(tasks) - state['next_task'])
+            first = state['next_task']
+            batch = list(enumerate(tasks[first:first + size], start=first))
+            if probe.enabled:
+                with probe.phase('pickle'):
+                    probe.count('task_bytes', instrumentation.payload_size((func, batch)))
+            self.pool.apply_async(_run_batch, ((func, batch),), callback=done.put, error_callback=done.put)
+            state['next_task'] += len(batch)
+            state['in_flight'] += 1
+            state['batches'] += 1
+            state['max_batch'] = max(state['max_batch'], len(batch))
+
+        busy, finished, next_reduce, reduce_time = 0.0, 0, 0, 0.0
+        pending = {}
+        with tqdm(total=len(tasks), desc=f"Running on {self.num_processes} cores", mininterval=0.5) as progress:
+            while state['next_task'] < len(tasks) and state['in_flight'] < self.prefetch * self.num_processes:
+                submit(None)
+            while state['in_flight']:
+                with probe.phase('wait'):
+                    item = done.get()
+                state['in_flight'] -= 1
+                if isinstance(item, BaseException):
+                    raise item
+                results, elapsed = item
+                busy += elapsed
+                finished += len(results)
+                # Isi ulang antrean sebelum mereduksi agar worker tetap sibuk
+                while state['next_task'] < len(tasks) and state['in_flight'] < self.prefetch * self.num_processes:
+                    submit(busy / finished)
+                reduce_start = time.perf_counter()
+                pending.update(results)
+                while next_reduce in pending:
+                    acc = reducer(acc, pending.pop(next_reduce))
+                    next_reduce += 1
+                reduce_time += time.perf_counter() - reduce_start
+                progress.update(len(results))
+
+        wall = time.perf_counter() - start
+        self.last_run = {'tasks': len(tasks), 'batches': state['batches'], 'max_batch': state['max_batch'],
+                         'wall_time': wall, 'busy_time': busy, 'reduce_time': reduce_time,
+                         'utilization': busy / (wall * self.num_processes) if wall > 0 else 0.0}
+        return acc
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_parallel(func, tasks, num_processes, initializer=None, initargs=None, reducer=None, initial=None):
+    """
+    Fungsi generik untuk menjalankan tugas secara paralel.
+    Mendukung initializer dan chunksize untuk optimasi.
+    Jika `reducer` diberikan, hasil dilipat satu per satu saat tiba
+    (acc = reducer(acc, hasil), dimulai dari `initial`) alih-alih dikumpulkan ke list.
+    Pool dibuat khusus untuk panggilan ini; gunakan ParallelExecutor untuk pool yang dipakai ulang.
+    `num_processes` boleh berupa eksekutor (ParallelExecutor atau distributed.Coordinator);
+    tugas lalu dijalankan di eksekutor tersebut tanpa membuat pool baru.
+    """
+    if hasattr(num_processes, 'map_reduce'):
+        return num_processes.map_reduce(func, tasks, reducer, initial)
+    with ParallelExecutor(num_processes, initializer, initargs or ()) as executor:
+        return executor.map_reduce(func, tasks, reducer, initial)
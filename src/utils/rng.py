@@ -0,0 +1,55 @@
+import numpy as np
+from .parallel_runner import split_into_blocks
+
+# ==============================================================================
+# STREAM RNG YANG AMAN UNTUK PARALEL DAN REPRODUSIBEL
+# ==============================================================================
+# Setiap blok kerja logis (mis. blok jalur ke-k, atau blok walk (j, baris)) memiliki
+# stream independen SeedSequence(entropy, spawn_key=kunci_blok), identik dengan anak
+# hasil SeedSequence(entropy).spawn(...). Stream bergantung hanya pada seed dan indeks
+# blok, bukan pada proses/chunk yang mengeksekusinya, sehingga hasil identik bit demi
+# bit berapa pun jumlah proses atau ukuran chunk.
+
+# Unit terkecil yang memiliki stream sendiri pada pricer (jumlah sampel per blok).
+STREAM_BLOCK_SIZE = 2 ** 16
+
+
+def resolve_seed(seed):
+    """
+    Mengubah argumen `seed` menjadi entropi integer yang dapat dikirim ke worker.
+    seed=None mengambil entropi baru dari OS (run tidak reprodusibel, tetapi setiap
+    blok tetap mendapat stream berbeda, termasuk di worker hasil fork).
+    """
+    if seed is None:
+        return np.random.SeedSequence().entropy
+    if isinstance(seed, np.random.SeedSequence):
+        return seed.entropy
+    return int(seed)
+
+
+def block_seed_sequence(entropy, *key):
+    return np.random.SeedSequence(entropy, spawn_key=tuple(int(k) for k in key))
+
+
+def block_generator(entropy, *key):
+    """np.random.Generator untuk blok dengan kunci `key`."""
+    return np.random.Generator(np.random.PCG64(block_seed_sequence(entropy, *key)))
+
+
+def block_key64(entropy, *key):
+    """Kunci uint64 untuk RNG counter-based di kernel Numba (lihat utils/backends.py)."""
+    return block_seed_sequence(entropy, *key).generate_state(1, np.uint64)[0]
+
+
+def stream_blocks(total, block_size=STREAM_BLOCK_SIZE):
+    """Daftar (indeks_blok, ukuran) untuk `total` sampel."""
+    return list(enumerate(split_into_blocks(total, block_size)))
+
+
+def group_blocks(blocks, samples_per_task):
+    """
+    Mengelompokkan blok berurutan menjadi tugas berisi sekitar `samples_per_task` sampel
+    (minimal satu blok per tugas). Pengelompokan tidak memengaruhi stream blok.
+    """
+    blocks_per_task = max(1, int(samples_per_task) // max(1, blocks[0][1])) if blocks else 1
+    return [blocks[k:k + blocks_per_task] for k in range(0, len(blocks), blocks_per_task)]
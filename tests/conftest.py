@@ -0,0 +1,19 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Modul diimpor sebagai paket `src`, sama seperti skrip di scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('TQDM_DISABLE', '1')
+
+
+@pytest.fixture
+def diagonal_dominant_system():
+    """(A, b, x_true) kecil dengan A dominan diagonal, sehingga deret Neumann konvergen."""
+    rng = np.random.default_rng(0)
+    n = 12
+    A = rng.random((n, n)) + np.diag([n] * n)
+    x_true = np.ones(n)
+    return A, A @ x_true, x_true
@@ -0,0 +1,110 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.checkpoint import ChunkCheckpoint, FaultTolerantRunner, fingerprint
+from src.utils.parallel_runner import ParallelExecutor
+
+
+def interrupt(path, keep):
+    """Menyisakan header dan `keep` record pertama, ditambah record terakhir yang terpotong."""
+    with open(path, 'rb') as f:
+        header = pickle.load(f)
+        records = []
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except EOFError:
+                break
+    with open(path, 'wb') as f:
+        pickle.dump(header, f)
+        for record in records[:keep]:
+            pickle.dump(record, f)
+        f.write(pickle.dumps(records[keep])[:10])
+    return len(records)
+
+
+def test_price_option_resumes_unseeded_run(tmp_path):
+    path = str(tmp_path / 'price.ckpt')
+    pricer = MonteCarloBSMPricer(100, 100, 0.05, 0.2, 1.0)
+    first = pricer.price_option(400_000, batch_size=65_536, return_stats=True, checkpoint=path)
+    total = interrupt(path, keep=3)
+    resumed = pricer.price_option(400_000, batch_size=65_536, return_stats=True, checkpoint=path)
+    assert resumed.value == first.value
+    assert pricer.execution_report['resumed'] == 3
+    assert pricer.execution_report['executed'] == total - 3
+    # Seed eksplisit yang sama dengan run tanpa checkpoint memberi hasil identik
+    seeded = pricer.price_option(400_000, batch_size=65_536, seed=5, checkpoint=str(tmp_path / 'seeded.ckpt'))
+    assert seeded == pricer.price_option(400_000, batch_size=65_536, seed=5)
+
+
+def test_solve_slae_resumes_in_parallel(tmp_path, diagonal_dominant_system):
+    A, b, _ = diagonal_dominant_system
+    path = str(tmp_path / 'slae.ckpt')
+    with MonteCarloLinearSolver(A, b) as solver:
+        first = solver.solve_slae(0.5, 1e-4, 3000, backend='numpy', checkpoint=path)
+        interrupt(path, keep=1)
+        resumed = solver.solve_slae(0.5, 1e-4, 3000, parallel=True, num_processes=2, backend='process',
+                                    checkpoint=path)
+        assert solver.execution_report['resumed'] == 1
+    np.testing.assert_array_equal(resumed, first)
+
+
+def test_refined_solve_resumes_unseeded_run(tmp_path, diagonal_dominant_system):
+    A, b, _ = diagonal_dominant_system
+    path = str(tmp_path / 'refined.ckpt')
+    options = dict(backend='numpy', refine_tol=1e-8, max_refinements=4, checkpoint=path)
+    with MonteCarloLinearSolver(A, b) as solver:
+        first = solver.solve_slae(0.5, 1e-4, 200, **options)
+        # Tahap terakhir hilang (crash sebelum tahap itu selesai) lalu dilanjutkan tanpa seed
+        os.remove(f"{path}.3")
+        resumed = solver.solve_slae(0.5, 1e-4, 200, **options)
+        assert solver.execution_report['executed'] == 1
+        replay = solver.solve_slae(0.5, 1e-4, 200, **options)
+        assert solver.execution_report['executed'] == 0
+    np.testing.assert_array_equal(resumed, first)
+    np.testing.assert_array_equal(replay, first)
+
+
+def _flaky(task):
+    # Gagal sekali per chunk: penanda di disk membuat percobaan ulang berhasil
+    marker, value = task
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        raise RuntimeError("worker gagal")
+    return value
+
+
+def test_runner_uses_executor_and_retries(tmp_path):
+    store = ChunkCheckpoint(str(tmp_path / 'run.ckpt'), fingerprint('flaky'), seed=1)
+    tasks = [(str(tmp_path / f"chunk{k}"), k) for k in range(6)]
+    with ParallelExecutor(2) as executor:
+        runner = FaultTolerantRunner(True, executor, store, max_retries=10)
+        total = runner.run(_flaky, tasks, range(6), lambda acc, value: acc + [value], [])
+    assert total == list(range(6))
+    assert runner.report['executed'] == 6 and runner.report['failures'] >= 1
+    assert set(store.completed) == set(range(6))
+
+
+def test_checkpoint_with_executor_matches_plain_run(tmp_path, diagonal_dominant_system):
+    pricer = MonteCarloBSMPricer(100, 100, 0.05, 0.2, 1.0)
+    A, b, _ = diagonal_dominant_system
+    with ParallelExecutor(2) as executor:
+        price = pricer.price_option(400_000, parallel=True, num_processes=executor, batch_size=65_536, seed=4,
+                                    checkpoint=str(tmp_path / 'price.ckpt'))
+        with MonteCarloLinearSolver(A, b, executor=executor) as solver:
+            x = solver.solve_slae(0.5, 1e-4, 3000, parallel=True, backend='process', seed=4,
+                                  checkpoint=str(tmp_path / 'slae.ckpt'))
+            assert solver.execution_report['executed'] > 1
+    assert price == pricer.price_option(400_000, batch_size=65_536, seed=4)
+    with MonteCarloLinearSolver(A, b) as solver:
+        np.testing.assert_array_equal(x, solver.solve_slae(0.5, 1e-4, 3000, backend='numpy', seed=4))
+
+
+def test_task_timeout_with_executor_is_rejected():
+    with ParallelExecutor(2) as executor, pytest.raises(ValueError):
+        FaultTolerantRunner(True, executor, task_timeout=1.0)
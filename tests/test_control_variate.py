@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from src.finance.advanced_mc import AsianOptionPricer
+from src.finance.analytic import geometric_asian_analytic
+
+S, E, r, sigma, T, NUM_STEPS = 100, 100, 0.05, 0.2, 1.0, 12
+
+
+@pytest.mark.parametrize('control_variate', ['geometric', ['geometric', 'european']])
+def test_control_variate_matches_plain_estimate_with_smaller_stderr(control_variate):
+    pricer = AsianOptionPricer(S, E, r, sigma, T, NUM_STEPS)
+    plain = pricer.price(100_000, parallel=False, return_stats=True, seed=1)
+    controlled = pricer.price(100_000, parallel=False, return_stats=True, seed=2, control_variate=control_variate)
+    assert abs(controlled.value - plain.value) < 4 * np.hypot(controlled.stderr, plain.stderr)
+    assert controlled.stderr < 0.1 * plain.stderr
+    assert controlled.variance_reduction > 100
+
+
+@pytest.mark.parametrize('strike, num_steps', [(100, 12), (90, 4), (110, 50)])
+def test_geometric_asian_analytic_matches_monte_carlo(strike, num_steps):
+    rng = np.random.default_rng(0)
+    dt = T / num_steps
+    log_paths = np.cumsum((r - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt)
+                          * rng.standard_normal((400_000, num_steps)), axis=1)
+    geometric_average = S * np.exp(log_paths.mean(axis=1))
+    payoffs = np.exp(-r * T) * np.maximum(geometric_average - strike, 0)
+    stderr = payoffs.std(ddof=1) / np.sqrt(len(payoffs))
+    assert abs(payoffs.mean() - geometric_asian_analytic(S, strike, r, sigma, T, num_steps)) < 4 * stderr
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.finance.advanced_mc import AsianOptionPricer
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.distributed import Coordinator, run_worker, spawn_local_workers
+
+
+def _slow_square(k):
+    time.sleep(0.05)
+    return k * k
+
+
+def _append(acc, item):
+    acc.append(item)
+    return acc
+
+
+@pytest.fixture
+def coordinator():
+    with Coordinator(('localhost', 0), join_timeout=20) as coordinator:
+        yield coordinator
+
+
+def test_authkey_is_random_per_coordinator(monkeypatch):
+    monkeypatch.delenv('MC_AUTHKEY', raising=False)
+    with Coordinator() as first, Coordinator() as second:
+        assert len(first.authkey) >= 32
+        assert first.authkey != second.authkey
+    with pytest.raises(ValueError):
+        run_worker(('localhost', 1))
+
+
+def test_seeded_results_match_local_execution(coordinator, diagonal_dominant_system):
+    spawn_local_workers(coordinator.address, 3, coordinator.authkey)
+    assert coordinator.wait_for_workers(3, timeout=20) == 3
+
+    pricer = MonteCarloBSMPricer(100, 100, 0.05, 0.2, 1.0)
+    local = pricer.price_option(500_000, batch_size=65_536, return_stats=True, seed=9)
+    remote = pricer.price_option(500_000, batch_size=65_536, backend='distributed', num_processes=coordinator,
+                                 return_stats=True, seed=9)
+    assert remote.value == local.value and remote.stderr == local.stderr
+    assert len(coordinator.last_run['tasks_per_worker']) > 1
+
+    asian = AsianOptionPricer(100, 100, 0.05, 0.2, 1.0, 16)
+    assert (asian.price(30_000, backend='distributed', num_processes=coordinator, seed=9)
+            == asian.price(30_000, parallel=False, seed=9))
+
+    A, b, _ = diagonal_dominant_system
+    with MonteCarloLinearSolver(A, b) as solver:
+        x_local = solver.solve_slae(0.5, 1e-4, 2000, backend='numpy', seed=9)
+        x_remote = solver.solve_slae(0.5, 1e-4, 2000, parallel=True, backend='distributed',
+                                     num_processes=coordinator, seed=9)
+    np.testing.assert_array_equal(x_remote, x_local)
+
+
+def test_tasks_of_departed_worker_are_reassigned(coordinator):
+    # Worker pertama keluar setelah dua tugas, di tengah job
+    spawn_local_workers(coordinator.address, 1, coordinator.authkey, max_tasks=2)
+    spawn_local_workers(coordinator.address, 1, coordinator.authkey)
+    coordinator.wait_for_workers(2, timeout=20)
+    squares = coordinator.map_reduce(_slow_square, range(20), reducer=_append, initial=[])
+    assert squares == [k * k for k in range(20)]
+    assert coordinator.last_run['reassigned'] >= 1
+    assert coordinator.num_processes == 1
+
+
+def test_late_joining_worker_receives_tasks(coordinator):
+    spawn_local_workers(coordinator.address, 1, coordinator.authkey)
+    coordinator.wait_for_workers(1, timeout=20)
+    late = threading.Timer(0.3, spawn_local_workers, (coordinator.address, 1, coordinator.authkey))
+    late.start()
+    squares = coordinator.map_reduce(_slow_square, range(40))
+    late.join()
+    assert squares == [k * k for k in range(40)]
+    assert len(coordinator.last_run['tasks_per_worker']) == 2
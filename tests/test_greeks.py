@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from src.finance.advanced_mc import AsianOptionPricer
+from src.finance.bms_pricer import MonteCarloBSMPricer
+
+S, E, r, sigma, T = 100, 100, 0.05, 0.2, 1.0
+
+
+def bsm_greeks():
+    d1 = (np.log(S / E) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    return {'delta': norm.cdf(d1), 'gamma': norm.pdf(d1) / (S * sigma * np.sqrt(T)),
+            'vega': S * norm.pdf(d1) * np.sqrt(T)}
+
+
+@pytest.mark.parametrize('gamma_method', ['mixed', 'lr'])
+def test_bsm_greeks_match_closed_form(gamma_method):
+    pricer = MonteCarloBSMPricer(S, E, r, sigma, T)
+    greeks = pricer.price_with_greeks(400_000, gamma_method=gamma_method, seed=1)
+    for name, exact in bsm_greeks().items():
+        assert abs(greeks[name].value - exact) < 4 * greeks[name].stderr, name
+    assert greeks['price'].value == pytest.approx(pricer.price_option(400_000, seed=1))
+
+
+def test_bsm_mixed_gamma_has_smaller_stderr_than_lr():
+    pricer = MonteCarloBSMPricer(S, E, r, sigma, T)
+    mixed = pricer.price_with_greeks(100_000, gamma_method='mixed', seed=2)['gamma']
+    lr = pricer.price_with_greeks(100_000, gamma_method='lr', seed=2)['gamma']
+    assert mixed.stderr < lr.stderr
+
+
+def test_asian_greeks_match_seeded_bump_and_reprice():
+    num_steps, M, seed = 12, 200_000, 3
+    greeks = AsianOptionPricer(S, E, r, sigma, T, num_steps).price_with_greeks(M, parallel=False, seed=seed)
+
+    def price(spot=S, vol=sigma):
+        return AsianOptionPricer(spot, E, r, vol, T, num_steps).price(M, parallel=False, seed=seed)
+
+    # Bump dengan stream yang sama (common random numbers)
+    bumps = {'delta': (price(S + 1.0) - price(S - 1.0)) / 2.0,
+             'gamma': price(S + 1.0) - 2 * price() + price(S - 1.0),
+             'vega': (price(vol=sigma + 0.01) - price(vol=sigma - 0.01)) / 0.02}
+    for name, bumped in bumps.items():
+        assert abs(greeks[name].value - bumped) < 4 * greeks[name].stderr, name
+    assert greeks['price'].value == pytest.approx(price())
@@ -0,0 +1,28 @@
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.instrumentation import instrument
+
+
+def test_estimate_instrumentation_covers_only_its_own_call():
+    pricer = MonteCarloBSMPricer(100, 100, 0.05, 0.2, 1.0)
+    with instrument() as session:
+        first = pricer.price_option(50_000, return_stats=True, seed=1)
+        second = pricer.price_option(50_000, return_stats=True, seed=2)
+    assert first.instrumentation.counters['paths'] == 50_000
+    assert second.instrumentation.counters['paths'] == 50_000
+    assert session.stats.counters['paths'] == 100_000
+    for name, total in session.stats.calls.items():
+        assert first.instrumentation.calls[name] + second.instrumentation.calls[name] == total
+
+
+def test_solver_reports_once_per_public_call(diagonal_dominant_system, capsys):
+    A, b, _ = diagonal_dominant_system
+    MonteCarloLinearSolver(A, b).solve_slae(0.5, 1e-3, 200, seed=1, target_stderr=1e-9, max_seconds=0.5)
+    assert capsys.readouterr().out == ''
+
+    solver = MonteCarloLinearSolver(A, b, verbose=True)
+    with instrument():
+        estimate = solver.solve_slae(0.5, 1e-3, 200, seed=1, refine_tol=1e-6, max_refinements=3,
+                                     return_stats=True)
+    assert capsys.readouterr().out.count("Selesai untuk") == 1
+    assert estimate.instrumentation.counters['walks'] > 0
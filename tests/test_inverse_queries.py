@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+
+
+def contraction_matrix(n, density, seed=0):
+    # A = I - B dengan jumlah baris mutlak B = 0.5, sehingga deret Neumann konvergen
+    rng = np.random.default_rng(seed)
+    B = sparse.random(n, n, density=density, random_state=rng, format='csr')
+    B.setdiag(0)
+    B.eliminate_zeros()
+    row_sums = np.asarray(abs(B).sum(axis=1)).ravel()
+    row_sums[row_sums == 0] = 1
+    return (sparse.identity(n, format='csr') - sparse.diags(0.5 / row_sums) @ B).tocsr()
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_invert_matrix_matches_exact_inverse(backend):
+    A = contraction_matrix(30, 0.2)
+    exact = np.linalg.inv(A.toarray())
+    with MonteCarloLinearSolver(A) as solver:
+        inverse = solver.invert_matrix(1000, 30, backend=backend, seed=5)
+    assert np.linalg.norm(inverse - exact) / np.linalg.norm(exact) < 0.05
+
+
+def test_inverse_rows_on_large_sparse_matrix():
+    # Hanya baris yang diminta yang dihitung; keluaran tetap (len(rows), n) tanpa inverse dense
+    A = contraction_matrix(5000, 4 / 5000)
+    rows = [0, 17, 4999]
+    with MonteCarloLinearSolver(A) as solver:
+        estimate = solver.inverse_rows(rows, 4000, 30, backend='numpy', seed=2)
+    assert estimate.shape == (3, 5000)
+    # Nilai harapan estimator: baris sum_{k<=m} L^k dengan L = I - A, lewat matvec sparse
+    L_T = (sparse.identity(5000, format='csr') - A).T.tocsr()
+    term = np.eye(5000)[rows].T
+    expected = term.copy()
+    for _ in range(30):
+        term = L_T @ term
+        expected += term
+    assert np.abs(estimate - expected.T).max() < 0.05
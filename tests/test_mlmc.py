@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from src.finance.advanced_mc import AsianOptionPricer
+from src.finance.mlmc import MultilevelAsianPricer
+from src.utils.parallel_runner import ParallelExecutor
+
+
+def test_mlmc_matches_standard_mc_within_tolerance():
+    pricer = AsianOptionPricer(100, 100, 0.05, 0.2, 1.0, 16)
+    mlmc = MultilevelAsianPricer(pricer)
+    estimate = mlmc.price(0.05, pilot_samples=2000, seed=1)
+    reference = pricer.price(400_000, parallel=False, return_stats=True, seed=2)
+    assert abs(estimate.value - reference.value) < 4 * np.hypot(estimate.stderr, reference.stderr)
+    assert estimate.stderr <= 0.05 * 1.1
+    assert len(mlmc.levels) == 5
+    assert all(row['cost_per_sample'] > 0 for row in mlmc.levels)
+    assert mlmc.weak_error is not None
+
+
+def test_mlmc_runs_all_levels_on_one_executor():
+    pricer = AsianOptionPricer(100, 100, 0.05, 0.2, 1.0, 8)
+    with ParallelExecutor(2) as executor:
+        estimate = MultilevelAsianPricer(pricer).price(0.1, pilot_samples=20_000, parallel=True,
+                                                       num_processes=executor, seed=3)
+        pool = executor.pool
+        MultilevelAsianPricer(pricer).price(0.1, pilot_samples=20_000, parallel=True, num_processes=executor,
+                                            seed=3)
+        assert executor.pool is pool
+    assert np.isfinite(estimate.value)
+
+
+@pytest.mark.parametrize('kwargs', [{'pilot_samples': 1}, {'pilot_samples': 0}, {'target_rmse': 0.0},
+                                    {'target_rmse': -0.1}, {'max_iterations': -1}])
+def test_mlmc_rejects_invalid_parameters(kwargs):
+    mlmc = MultilevelAsianPricer(AsianOptionPricer(100, 100, 0.05, 0.2, 1.0, 8))
+    arguments = {'target_rmse': 0.05, 'pilot_samples': 100, **kwargs}
+    with pytest.raises(ValueError):
+        mlmc.price(arguments.pop('target_rmse'), seed=1, **arguments)
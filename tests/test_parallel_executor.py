@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.finance.bms_pricer import MonteCarloBSMPricer
+from src.utils.parallel_runner import ParallelExecutor, run_parallel
+
+
+def _uneven_task(k):
+    # Durasi tugas sangat bervariasi sehingga hasil tiba tanpa urutan
+    time.sleep(0.02 if k % 7 == 0 else 0.0)
+    return k
+
+
+def _fail_on_three(k):
+    if k == 3:
+        raise ValueError("gagal")
+    return k
+
+
+def _append(acc, item):
+    acc.append(item)
+    return acc
+
+
+@pytest.mark.parametrize('target_batch_seconds', [1e-4, 0.1])
+def test_reduction_follows_task_order(target_batch_seconds):
+    with ParallelExecutor(3, target_batch_seconds=target_batch_seconds) as executor:
+        order = executor.map_reduce(_uneven_task, range(60), reducer=_append, initial=[])
+        assert order == list(range(60))
+        assert executor.last_run['tasks'] == 60
+        assert executor.last_run['batches'] <= 60
+        # Tanpa reducer hasil dikembalikan sebagai list dalam urutan tugas
+        assert executor.map_reduce(_uneven_task, range(10)) == list(range(10))
+
+
+def test_worker_error_is_raised():
+    with ParallelExecutor(2) as executor:
+        with pytest.raises(ValueError):
+            executor.map_reduce(_fail_on_three, range(8))
+        # Pool tetap dapat dipakai setelah error
+        assert executor.map_reduce(_uneven_task, range(4)) == [0, 1, 2, 3]
+
+
+def test_seeded_price_independent_of_processes_and_batching():
+    pricer = MonteCarloBSMPricer(100, 100, 0.05, 0.2, 1.0)
+    reference = pricer.price_option(600_000, return_stats=True, seed=11)
+    for num_processes, batch_size in [(2, 65_536), (3, 200_000)]:
+        estimate = pricer.price_option(600_000, parallel=True, num_processes=num_processes, batch_size=batch_size,
+                                       return_stats=True, seed=11)
+        assert estimate.value == reference.value
+        assert estimate.stderr == reference.stderr
+    with ParallelExecutor(2, target_batch_seconds=1e-4) as executor:
+        assert pricer.price_option(600_000, parallel=True, num_processes=executor, seed=11) == reference.value
+
+
+def test_run_parallel_accepts_executor():
+    with ParallelExecutor(2) as executor:
+        assert run_parallel(_uneven_task, range(5), executor) == [0, 1, 2, 3, 4]
+    assert np.array_equal(run_parallel(_uneven_task, range(5), 2), np.arange(5))
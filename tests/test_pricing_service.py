@@ -0,0 +1,23 @@
+import asyncio
+
+import numpy as np
+
+from src.finance.advanced_mc import QMCEuropeanPricer
+from src.finance.pricing_service import PricingService
+
+PARAMS = (100, 100, 0.05, 0.2, 1.0)
+
+
+def test_qmc_requests_carry_scramble_stderr_and_match_adaptive_price():
+    async def run():
+        async with PricingService(parallel=False) as service:
+            return await asyncio.gather(service.price('qmc', *PARAMS, 8192, seed=3),
+                                        service.price('qmc', *PARAMS, 2048, seed=3))
+
+    large, small = asyncio.run(run())
+    for estimate in (large, small):
+        assert np.isfinite(estimate.stderr) and estimate.stderr > 0
+    # Request yang digabung memakai prefiks scrambling yang sama dengan mode adaptif price
+    reference = QMCEuropeanPricer(*PARAMS).price(8192, seed=3, target_stderr=1e-12)
+    assert large.value == reference.value and large.stderr == reference.stderr
+    assert small.num_samples == 2048
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.finance.advanced_mc import AsianOptionPricer, QMCEuropeanPricer
+from src.finance.qmc import BrownianBridge, SobolPathGenerator
+from src.utils.rng import resolve_seed
+
+BSM_PARAMS = (100, 100, 0.05, 0.2, 1.0)
+
+
+@pytest.mark.parametrize('M', [16, 100, 1000, 5000])
+def test_adaptive_qmc_stays_within_budget(M):
+    estimate = QMCEuropeanPricer(*BSM_PARAMS).price(M, seed=1, target_stderr=1e-9)
+    assert estimate.num_samples <= M
+    assert np.isfinite(estimate.stderr)
+
+
+def test_adaptive_qmc_rejects_budget_below_scrambles():
+    with pytest.raises(ValueError):
+        QMCEuropeanPricer(*BSM_PARAMS).price(4, seed=1, num_scrambles=8, target_stderr=1e-9)
+
+
+@pytest.mark.parametrize('num_steps', [1, 2, 5, 8, 12])
+def test_brownian_bridge_reproduces_brownian_covariance(num_steps):
+    T = 1.5
+    times = T * np.arange(1, num_steps + 1) / num_steps
+    # Bridge linear dalam Z, jadi dengan Z = identitas baris ke-k adalah kolom ke-k dari W = B Z
+    B = BrownianBridge(num_steps, T).build(np.eye(num_steps))
+    np.testing.assert_allclose(B.T @ B, np.minimum.outer(times, times), atol=1e-12)
+
+
+@pytest.mark.parametrize('brownian_bridge', [True, False])
+def test_sobol_paths_have_brownian_covariance(brownian_bridge):
+    num_steps, T = 8, 1.0
+    times = T * np.arange(1, num_steps + 1) / num_steps
+    generator = SobolPathGenerator(num_steps, T, brownian_bridge)
+    W = np.concatenate(list(generator.brownian_paths(2 ** 14, resolve_seed(5))))
+    assert W.shape == (2 ** 14, num_steps)
+    np.testing.assert_allclose(W.mean(axis=0), 0, atol=0.01)
+    np.testing.assert_allclose(W.T @ W / len(W), np.minimum.outer(times, times), atol=0.02)
+
+
+def test_rqmc_stderr_below_plain_mc_for_same_points():
+    pricer = AsianOptionPricer(100, 100, 0.05, 0.2, 1.0, 16)
+    M = 2 ** 15
+    rqmc = pricer.price_qmc(M, num_scrambles=8, return_stats=True, seed=1)
+    plain = pricer.price(M, parallel=False, return_stats=True, seed=1)
+    assert rqmc.num_samples == M
+    assert rqmc.stderr < 0.1 * plain.stderr
+    assert abs(rqmc.value - plain.value) < 4 * np.hypot(rqmc.stderr, plain.stderr)
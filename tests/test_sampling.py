@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.linear_algebra import sampling
+from src.linear_algebra.sampling import (build_transition_table, sample_position, sample_positions,
+                                         sample_position_numba)
+
+SAMPLES_PER_ROW = 200_000
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(6, 6)) * (rng.random((6, 6)) < 0.7)
+    M[1] = 0.0                                # baris nol: absorbing
+    M[2] = 0.0
+    M[2, 4] = -0.3                            # satu transisi saja
+    M[3] = [1e-6, 5.0, 0.0, -2.0, 0.5, 0.0]   # bobot sangat tidak seimbang
+    M[5] = [0.1, -0.1, 0.1, -0.1, 0.1, -0.1]  # bobot sama
+    return M
+
+
+def expected_probabilities(M):
+    row_sums = np.abs(M).sum(axis=1, keepdims=True)
+    return np.divide(np.abs(M), row_sums, out=np.zeros_like(M), where=row_sums > 0)
+
+
+def test_table_encodes_row_weights(matrix):
+    table = build_transition_table(matrix)
+    np.testing.assert_array_equal(table['absorbing'], ~np.any(matrix != 0, axis=1))
+    probs = expected_probabilities(matrix)
+    indptr, indices = table['indptr'], table['indices']
+    for i in np.nonzero(~table['absorbing'])[0]:
+        start, end = indptr[i], indptr[i + 1]
+        row_probs = probs[i, indices[start:end]]
+        np.testing.assert_allclose(np.diff(np.concatenate(([0.0], table['cdf'][start:end]))), row_probs)
+        # Probabilitas tersirat tabel alias: bagian sendiri + sisa dari entri yang beralias ke j
+        k = end - start
+        own, alias = table['alias_prob'][start:end], table['alias_idx'][start:end]
+        implied = (own + np.bincount(alias, weights=1 - own, minlength=k)) / k
+        np.testing.assert_allclose(implied, row_probs, atol=1e-12)
+        np.testing.assert_allclose(table['weights'][start:end] * row_probs, matrix[i, indices[start:end]])
+
+
+def test_python_alias_builder_matches_numba(matrix, monkeypatch):
+    table = build_transition_table(matrix)
+    monkeypatch.setattr(sampling, 'NUMBA_AVAILABLE', False)
+    fallback = build_transition_table(matrix)
+    np.testing.assert_array_equal(fallback['alias_idx'], table['alias_idx'])
+    np.testing.assert_allclose(fallback['alias_prob'], table['alias_prob'])
+
+
+@pytest.mark.parametrize('method', ['alias', 'cdf'])
+def test_sampling_frequencies_match_row_weights(matrix, method):
+    # Entri nol yang tersimpan eksplisit di CSR (termasuk di baris absorbing) tidak boleh terpilih
+    rows, cols = np.nonzero(matrix)
+    stored = sparse.csr_matrix((np.r_[matrix[rows, cols], 0.0, 0.0], (np.r_[rows, 1, 3], np.r_[cols, 0, 2])),
+                               shape=matrix.shape)
+    assert stored.nnz == len(rows) + 2
+    table = build_transition_table(stored)
+    probs = expected_probabilities(matrix)
+    rng = np.random.default_rng(1)
+    for i in np.nonzero(~table['absorbing'])[0]:
+        u = rng.random((SAMPLES_PER_ROW, 2))
+        pos = sample_positions(table, np.full(SAMPLES_PER_ROW, i), u, method)
+        assert np.all((table['indptr'][i] <= pos) & (pos < table['indptr'][i + 1]))
+        frequencies = np.bincount(table['indices'][pos], minlength=matrix.shape[1]) / SAMPLES_PER_ROW
+        tolerance = 5 * np.sqrt(probs[i] * (1 - probs[i]) / SAMPLES_PER_ROW) + 1e-12
+        assert np.all(np.abs(frequencies - probs[i]) <= tolerance), (i, frequencies, probs[i])
+
+        # Versi skalar dan kernel Numba memilih posisi yang sama untuk uniform yang sama
+        for u0, u1 in u[:200]:
+            expected = sample_positions(table, np.array([i]), np.array([[u0, u1]]), method)[0]
+            assert sample_position(table, i, (u0, u1), method) == expected
+            assert sample_position_numba(table['indptr'], table['alias_prob'], table['alias_idx'], table['cdf'],
+                                         i, u0, u1, method == 'alias') == expected
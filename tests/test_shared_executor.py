@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.parallel_runner import ParallelExecutor, SharedArrays, attach_shared
+
+
+def test_shared_arrays_roundtrip_and_release():
+    source = np.arange(12.0).reshape(3, 4)
+    shared = SharedArrays(table=source, empty=None)
+    arrays = attach_shared(shared.handle)
+    np.testing.assert_array_equal(arrays['table'], source)
+    assert arrays['empty'] is None
+    shared.close()
+    shared.close()   # idempoten
+
+
+def test_pool_results_match_sequential(diagonal_dominant_system):
+    A, b, _ = diagonal_dominant_system
+    with MonteCarloLinearSolver(A, b) as solver:
+        sequential = solver.solve_slae(0.5, 1e-4, 300, backend='numpy', seed=7)
+        with ParallelExecutor(2) as executor:
+            solver.executor = executor
+            parallel = solver.solve_slae(0.5, 1e-4, 300, parallel=True, backend='process', seed=7)
+            inverse_parallel = solver.invert_matrix(200, 10, parallel=True, backend='process', seed=3)
+        solver.executor = None
+        inverse_sequential = solver.invert_matrix(200, 10, backend='numpy', seed=3)
+    np.testing.assert_array_equal(parallel, sequential)
+    np.testing.assert_array_equal(inverse_parallel, inverse_sequential)
+
+
+def test_solver_pool_is_reused_across_calls(diagonal_dominant_system):
+    A, b, _ = diagonal_dominant_system
+    with MonteCarloLinearSolver(A, b) as solver:
+        solver.solve_slae(0.5, 1e-4, 100, parallel=True, num_processes=2, backend='process', seed=1)
+        pool = solver._own_executor.pool
+        # gamma lain dan inversi memakai pool yang sama; hanya tabel baru yang dipublikasikan
+        solver.solve_slae(0.7, 1e-4, 100, parallel=True, num_processes=2, backend='process', seed=1)
+        solver.invert_matrix(100, 5, parallel=True, num_processes=2, backend='process', seed=1)
+        assert solver._own_executor.pool is pool
+    assert solver._own_executor is None
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from src.linear_algebra.mc_solvers import MonteCarloLinearSolver
+from src.utils.accumulators import MCEstimate
+
+
+@pytest.mark.parametrize('refine_tol', [None, 1e-8])
+def test_adaptive_mode_always_returns_estimate(diagonal_dominant_system, refine_tol):
+    A, b, _ = diagonal_dominant_system
+    solver = MonteCarloLinearSolver(A, b)
+    options = dict(seed=1, refine_tol=refine_tol, max_refinements=2)
+
+    plain = solver.solve_slae(0.5, 1e-3, 200, **options)
+    assert isinstance(plain, np.ndarray) and plain.shape == (len(b),)
+
+    adaptive = solver.solve_slae(0.5, 1e-3, 400, target_stderr=1e-3, **options)
+    assert isinstance(adaptive, MCEstimate)
+    assert adaptive.value.shape == adaptive.stderr.shape == (len(b),)
+    assert adaptive.num_samples > 0 and adaptive.converged is not None